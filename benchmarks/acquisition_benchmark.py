@@ -0,0 +1,404 @@
+"""End-to-end acquisition benchmark.
+
+Drives simulated oscilloscopes (see uniswag.simulation) through the complete data path of UniSWAG:
+the device's data retrieval thread (reading the raw data, FFT calculation and data point update),
+the chart update (retrieving the latest frame and replacing the series' points), the retrieval of a
+math channel combining two of the device's channels and the CSV export of the latest frame.
+
+For every combination of record length and channel count, the achieved frames and samples per second,
+the latency percentiles of each stage and the peak memory consumption (as traced by "tracemalloc") are reported.
+The results can be stored as a JSON file and later be passed as a baseline, in which case the script fails
+if any case has become slower (or consumes more memory) than the baseline by more than the tolerance.
+
+Usage::
+
+    python benchmarks/acquisition_benchmark.py --output baseline.json
+    python benchmarks/acquisition_benchmark.py --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from uniswag.data_export import write_csv
+from uniswag.device_manager import DeviceManager
+from uniswag.simulation.drivers import simulated_driver_registry
+from uniswag.simulation.instrument import SimulatedInstrument, add_instrument, remove_instrument
+
+# the chart update stage is only measured if the Qt chart module is available
+try:
+    from PySide6.QtCharts import QLineSeries
+except ImportError:
+    QLineSeries = None
+
+# the simulated device model used per vendor
+MODELS = {'Tiepie': 'HS5', 'Keysight': 'DSOX1102G', 'Tektronix': 'TBS2104', 'Hantek': '6022BE'}
+
+# the stages whose latencies are reported, in the order of the data path
+STAGES = ['read', 'fft', 'update_points', 'frame_interval', 'chart_update', 'math_retrieve', 'csv_export']
+
+# the percentiles reported per stage
+PERCENTILES = (50, 90, 99)
+
+# latency differences below this value (in milliseconds) are not considered a regression,
+# since they are dominated by timer resolution and scheduling noise
+LATENCY_NOISE_FLOOR = 0.1
+
+
+class StageTimer:
+    def __init__(self):
+        """
+        Collects the durations of the benchmarked stages.
+
+        Returns:
+            StageTimer:
+                A StageTimer object.
+        """
+        # the measured durations in seconds, mapped to the stage names
+        self._durations = {}
+
+    def add(self, stage, duration):
+        """
+        Records a single duration of a stage.
+
+        Args:
+            stage (str):
+                The name of the stage.
+            duration (float):
+                The duration in seconds.
+        """
+        self._durations.setdefault(stage, []).append(duration)
+
+    def wrap(self, stage, func):
+        """
+        Wraps a function so that the duration of each of its calls is recorded.
+
+        Args:
+            stage (str):
+                The name of the stage.
+            func (function):
+                The function to wrap.
+
+        Returns:
+            function:
+                The wrapped function.
+        """
+        def timed(*args, **kwargs):
+            begin = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - begin)
+
+        return timed
+
+    def summary(self):
+        """
+        The latency percentiles of all stages that have been recorded at least once.
+
+        Returns:
+            dict[str, dict[str, float]]:
+                A dictionary with the keys 'count', 'p50', 'p90', 'p99' and 'max' per stage
+                (the latencies in milliseconds).
+        """
+        result = {}
+        for stage in STAGES:
+            durations = np.array(self._durations.get(stage, ())) * 1000
+            if len(durations):
+                result[stage] = {'count': len(durations)}
+                for percentile in PERCENTILES:
+                    result[stage]['p' + str(percentile)] = float(np.percentile(durations, percentile))
+                result[stage]['max'] = float(durations.max())
+
+        return result
+
+
+def find_operand(math_ch, osc, ch_no):
+    """
+    Looks up the identifier by which a math channel refers to a channel of an oscilloscope.
+
+    Args:
+        math_ch (uniswag.devices.oscilloscopes.math_osc.MathOscChannel):
+            The math channel.
+        osc (uniswag.devices.oscilloscope.Oscilloscope):
+            The oscilloscope.
+        ch_no (int):
+            The number of the oscilloscope's channel.
+
+    Returns:
+        str:
+            The operand identifier.
+    """
+    return next(operand for operand, (dev, ch) in math_ch.operands_avail.items()
+                if dev is osc and ch.id['No'] == ch_no)
+
+
+def run_case(manager, vendor, record_length, ch_cnt, args, tmp_dir):
+    """
+    Benchmarks a simulated oscilloscope with the given record length and channel count.
+
+    Args:
+        manager (uniswag.device_manager.DeviceManager):
+            The device manager, using the simulated drivers.
+        vendor (str):
+            The vendor of the simulated oscilloscope.
+        record_length (int):
+            The number of samples per channel and frame.
+        ch_cnt (int):
+            The number of channels (all of which are enabled).
+        args (argparse.Namespace):
+            The command line arguments.
+        tmp_dir (str):
+            The directory to export CSV files to.
+
+    Returns:
+        dict[str, Any]:
+            The results of the case.
+    """
+    model = MODELS[vendor]
+    # (TiePie serial numbers are numeric)
+    ser_no = str(record_length * 100 + ch_cnt)
+    add_instrument(vendor, SimulatedInstrument(model, ser_no, ch_cnt=ch_cnt, record_length=record_length,
+                                               record_length_max=max(record_length, 10000000),
+                                               realtime=args.realtime, seed=0))
+    manager.add_device({'Name': model, 'SerNo': ser_no, 'Type': 'OSC'}, vendor)
+    osc = manager.get_device({'Vendor': vendor, 'Name': model, 'SerNo': ser_no, 'DevType': 'Osc'})
+    if osc is None:
+        remove_instrument(vendor, ser_no)
+        raise RuntimeError('The simulated oscilloscope could not be created.')
+
+    timer = StageTimer()
+    tracemalloc.start()
+
+    try:
+        # time the stages of the device's data retrieval thread
+        # (the wrappers take precedence over the methods since they are set on the object itself)
+        osc._update_points = timer.wrap('update_points', osc._update_points)
+        osc.calculate_fft_points = timer.wrap('fft', osc.calculate_fft_points)
+        if hasattr(osc, '_retrieve_raw_data'):
+            osc._retrieve_raw_data = timer.wrap('read', osc._retrieve_raw_data)
+
+        # measure continuously (by default, TiePie oscilloscopes only measure a single block)
+        if 'repeat' in getattr(osc, 'measure_modes_avail', ()):
+            osc.measure_mode = 'repeat'
+        for ch in osc.ch:
+            ch.is_enabled = True
+
+        # the math channel combines the first two channels (or the first channel with itself)
+        math_osc = next(dev for dev in manager.device_list if dev.id['Vendor'] == 'MS-SWAG')
+        math_ch = math_osc.ch[0]
+        math_ch.operand1 = find_operand(math_ch, osc, 1)
+        math_ch.operand2 = find_operand(math_ch, osc, min(2, ch_cnt))
+        math_retrieve = timer.wrap('math_retrieve', math_ch.retrieve)
+
+        # one series per channel and chart, as created for every visible channel by the GUI
+        series = {}
+        if QLineSeries is not None:
+            series = {ch.id['No']: (QLineSeries(), QLineSeries()) for ch in osc.ch}
+
+        osc.start()
+        frame_id = osc.retrieve()['Frame']
+        first_frame_id = None
+        begin = last_frame_time = time.perf_counter()
+        while True:
+            retrieved_vals = osc.wait_for_frame(frame_id, args.timeout)
+            if retrieved_vals is None:
+                raise RuntimeError('No frame was measured within {} s.'.format(args.timeout))
+            now = time.perf_counter()
+
+            # the measurement starts with the first frame, so that the start-up is not included
+            if first_frame_id is None:
+                first_frame_id = retrieved_vals['Frame']
+                begin = now
+            else:
+                timer.add('frame_interval', now - last_frame_time)
+            last_frame_time = now
+            frame_id = retrieved_vals['Frame']
+
+            # the chart update path: retrieve the latest frame and pass its vectors to the series
+            if series:
+                chart_begin = time.perf_counter()
+                retrieved_vals = osc.retrieve(True)
+                for ch_no, (data_points_norm, data_points_fft) in retrieved_vals['Points'].items():
+                    series[ch_no][0].replaceNp(*data_points_norm)
+                    series[ch_no][1].replaceNp(*data_points_fft)
+                timer.add('chart_update', time.perf_counter() - chart_begin)
+
+            math_retrieve()
+
+            frame_cnt = frame_id - first_frame_id
+            if frame_cnt >= args.min_frames and now - begin >= args.duration:
+                break
+
+        elapsed = time.perf_counter() - begin
+        osc.stop()
+
+        # export the latest frame of every channel, as done by the GUI's CSV export
+        if not args.no_csv:
+            export = timer.wrap('csv_export', write_csv)
+            for ch_no, (data_points_norm, _) in osc.retrieve()['Points'].items():
+                file_name = os.path.join(tmp_dir, 'channel_' + str(ch_no) + '.csv')
+                export(file_name, [['X', 'Y']], list(data_points_norm))
+                os.remove(file_name)
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+
+    finally:
+        tracemalloc.stop()
+        osc.stop()
+        manager.remove_device({'Name': model, 'SerNo': ser_no}, vendor)
+        remove_instrument(vendor, ser_no)
+
+    return {
+        'vendor': vendor,
+        'record_length': record_length,
+        'channel_count': ch_cnt,
+        'frames': frame_cnt,
+        'frames_per_s': frame_cnt / elapsed,
+        'samples_per_s': frame_cnt * record_length * ch_cnt / elapsed,
+        'peak_memory_mb': peak_memory / 2 ** 20,
+        'stages': timer.summary()
+    }
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compares the results to a baseline.
+
+    A case is considered to have regressed if its frame rate has dropped, the median latency of
+    any of its stages has risen or its peak memory consumption has grown by more than the tolerance.
+    Cases missing in either the results or the baseline are skipped.
+
+    Args:
+        results (dict[str, Any]):
+            The results of the current run.
+        baseline (dict[str, Any]):
+            The results of a previous run.
+        tolerance (float):
+            The relative deviation that is tolerated (e.g. 0.25 for 25 %).
+
+    Returns:
+        list[str]:
+            A description per regression (empty if there are none).
+    """
+    regressions = []
+
+    for key, case in results['cases'].items():
+        reference = baseline['cases'].get(key)
+        if reference is None:
+            continue
+
+        if case['frames_per_s'] < reference['frames_per_s'] * (1 - tolerance):
+            regressions.append('{}: {:.1f} frames/s instead of {:.1f} frames/s'.format(
+                key, case['frames_per_s'], reference['frames_per_s']))
+
+        for stage, latencies in case['stages'].items():
+            if stage not in reference['stages']:
+                continue
+            current = latencies['p50']
+            previous = reference['stages'][stage]['p50']
+            if current > previous * (1 + tolerance) and current - previous > LATENCY_NOISE_FLOOR:
+                regressions.append('{}: {} takes {:.3f} ms instead of {:.3f} ms (median)'.format(
+                    key, stage, current, previous))
+
+        if case['peak_memory_mb'] > reference['peak_memory_mb'] * (1 + tolerance):
+            regressions.append('{}: {:.1f} MB instead of {:.1f} MB peak memory'.format(
+                key, case['peak_memory_mb'], reference['peak_memory_mb']))
+
+    return regressions
+
+
+def print_case(key, case):
+    """
+    Prints the results of a case as a short report.
+
+    Args:
+        key (str):
+            The identifier of the case.
+        case (dict[str, Any]):
+            The results of the case.
+    """
+    print('{}: {} frames, {:.1f} frames/s, {:.3g} samples/s, {:.1f} MB peak memory'.format(
+        key, case['frames'], case['frames_per_s'], case['samples_per_s'], case['peak_memory_mb']))
+    for stage, latencies in case['stages'].items():
+        percentiles = '  '.join('p{} {:9.3f} ms'.format(percentile, latencies['p' + str(percentile)])
+                                for percentile in PERCENTILES)
+        print('  {:<15}{}  max {:9.3f} ms  (n={})'.format(stage, percentiles, latencies['max'], latencies['count']))
+
+
+def parse_list(text):
+    return [int(float(value)) for value in text.split(',') if value]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the acquisition data path using simulated devices.')
+    parser.add_argument('--vendor', choices=sorted(MODELS), default='Tiepie',
+                        help='the vendor whose simulated oscilloscope is used')
+    parser.add_argument('--record-lengths', type=parse_list, default=[1000, 10000, 100000, 1000000, 10000000],
+                        help='comma-separated record lengths (default: 1e3,1e4,1e5,1e6,1e7)')
+    parser.add_argument('--channel-counts', type=parse_list, default=[1, 2, 4],
+                        help='comma-separated channel counts (default: 1,2,4)')
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='the minimum measurement time per case in seconds')
+    parser.add_argument('--min-frames', type=int, default=5,
+                        help='the minimum number of frames per case')
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help='the maximum time to wait for a single frame in seconds')
+    parser.add_argument('--realtime', action='store_true',
+                        help='let the simulated devices take as long as a real capture of the record')
+    parser.add_argument('--no-csv', action='store_true',
+                        help='skip the CSV export stage')
+    parser.add_argument('--output', help='the JSON file to store the results in (e.g. as a new baseline)')
+    parser.add_argument('--baseline', help='the JSON file of a previous run to compare the results with')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='the tolerated relative deviation from the baseline (default: 0.25)')
+    args = parser.parse_args(argv)
+
+    manager = DeviceManager(lambda event, devices: None, lambda device_id: None,
+                            drivers=simulated_driver_registry(), monitor_usb=False)
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count()
+        },
+        'cases': {}
+    }
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for record_length in args.record_lengths:
+            for ch_cnt in args.channel_counts:
+                key = '{}/{}x{}'.format(args.vendor, record_length, ch_cnt)
+                case = run_case(manager, args.vendor, record_length, ch_cnt, args, tmp_dir)
+                results['cases'][key] = case
+                print_case(key, case)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('Regression: ' + regression)
+        if regressions:
+            return 1
+        print('No regressions compared to ' + args.baseline + '.')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
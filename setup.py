@@ -44,6 +44,12 @@ setup(
         'wmi; sys_platform=="win32"',
     ],
 
+    # Optional dependencies for additional export formats
+    extras_require={
+        'hdf5': ['h5py'],
+        'parquet': ['pyarrow'],
+    },
+
     # Python version requirement
     python_requires='>=3',
 
@@ -65,6 +71,15 @@ setup(
     include_package_data=True,
 
     entry_points={
-        'console_scripts': ['uniswag=uniswag.main:main'],
+        'console_scripts': [
+            'uniswag=uniswag.main:main',
+            'uniswag-headless=uniswag.headless:main',
+        ],
+        'uniswag.drivers': [
+            'Tiepie=uniswag.driver_registry:TIEPIE_DRIVER',
+            'Keysight=uniswag.driver_registry:KEYSIGHT_DRIVER',
+            'Tektronix=uniswag.driver_registry:TEKTRONIX_DRIVER',
+            'Hantek=uniswag.driver_registry:HANTEK_DRIVER',
+        ],
     },
 )
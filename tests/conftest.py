@@ -0,0 +1,34 @@
+"""Shared fixtures for the `uniswag` tests."""
+import pytest
+
+from uniswag.device_manager import DeviceManager
+from uniswag.simulation.drivers import simulated_driver_registry
+from uniswag.simulation.instrument import SimulatedInstrument, add_instrument, remove_instrument
+
+# the IDs of the simulated devices provided by the "simulated_devices" fixture
+SIM_OSC_ID = {'Vendor': 'Tiepie', 'Name': 'HS5', 'SerNo': '90001', 'DevType': 'Osc'}
+SIM_GEN_ID = {'Vendor': 'Tektronix', 'Name': 'AFG1022', 'SerNo': '90002', 'DevType': 'Gen'}
+
+
+@pytest.fixture(scope='module')
+def simulated_devices():
+    """
+    A device manager with a simulated TiePie oscilloscope and a simulated Tektronix generator.
+
+    Provides a dictionary with the keys 'Manager' (the device manager), 'Osc' and 'Gen' (the devices' IDs).
+    """
+    add_instrument('Tiepie', SimulatedInstrument(SIM_OSC_ID['Name'], SIM_OSC_ID['SerNo'], record_length=1000,
+                                                 seed=0))
+    add_instrument('Tektronix', SimulatedInstrument(SIM_GEN_ID['Name'], SIM_GEN_ID['SerNo']))
+
+    manager = DeviceManager(lambda event, devices: None, lambda device_id: None,
+                            drivers=simulated_driver_registry(), monitor_usb=False)
+    manager.add_device({'Name': SIM_OSC_ID['Name'], 'SerNo': SIM_OSC_ID['SerNo'], 'Type': 'OSC'}, 'Tiepie')
+    manager.add_device({'Name': SIM_GEN_ID['Name'], 'SerNo': SIM_GEN_ID['SerNo'], 'Type': 'GEN'}, 'Tektronix')
+
+    yield {'Manager': manager, 'Osc': SIM_OSC_ID, 'Gen': SIM_GEN_ID}
+
+    manager.remove_device({'Name': SIM_OSC_ID['Name'], 'SerNo': SIM_OSC_ID['SerNo']}, 'Tiepie')
+    manager.remove_device({'Name': SIM_GEN_ID['Name'], 'SerNo': SIM_GEN_ID['SerNo']}, 'Tektronix')
+    remove_instrument('Tiepie', SIM_OSC_ID['SerNo'])
+    remove_instrument('Tektronix', SIM_GEN_ID['SerNo'])
@@ -0,0 +1,128 @@
+"""Tests for `uniswag.data_export` module."""
+import numpy as np
+import pytest
+
+from uniswag.data_export import collect_metadata, format_csv_rows, write_csv
+
+
+def parse_rows(formatted):
+    return [[float(value) for value in line.split(',')] for line in formatted.decode().splitlines()]
+
+
+def test_format_csv_rows_layout():
+    formatted = format_csv_rows([np.array([0.0, 1.5, -2e-7]), np.array([1, 2, 3.25])])
+
+    assert formatted == b'0e+00,1e+00\n1.5e+00,2e+00\n-2e-07,3.25e+00\n'
+
+
+def test_format_csv_rows_round_trip():
+    rng = np.random.default_rng(0)
+    # arbitrary bit patterns cover all exponents, including subnormal values
+    values = rng.integers(0, 2 ** 63 - 1, 100000, dtype=np.int64).view(np.float64)
+    values = values[np.isfinite(values)] * rng.choice([-1.0, 1.0], len(values[np.isfinite(values)]))
+
+    parsed = np.array(parse_rows(format_csv_rows([values])))[:, 0]
+
+    np.testing.assert_array_equal(parsed, values)
+
+
+@pytest.mark.parametrize('value, formatted', [
+    (0.1, b'1e-01'),
+    (1 / 3, b'3.333333333333333e-01'),
+    (2.0 ** -1022, b'2.2250738585072014e-308'),
+    (5e-324, b'4.94065645841247e-324'),
+    (1.7976931348623157e308, b'1.7976931348623157e+308'),
+    (9007199254740993.0, b'9.007199254740992e+15')
+])
+def test_format_csv_rows_extremes(value, formatted):
+    assert format_csv_rows([np.array([value])]) == formatted + b'\n'
+
+
+@pytest.mark.parametrize('precision', [1, 3, 10, 15, 17])
+def test_format_csv_rows_precision(precision):
+    rng = np.random.default_rng(0)
+    values = rng.standard_normal(1000) * 10.0 ** rng.integers(-300, 300, 1000)
+
+    formatted = format_csv_rows([values], precision).decode().splitlines()
+
+    assert [float(value) for value in formatted] == [float('{:.{}e}'.format(value, precision - 1)) for value in values]
+
+
+def test_format_csv_rows_precision_does_not_overflow():
+    formatted = format_csv_rows([np.array([1.7976931348623157e308, -1.7976931348623157e308])], precision=10)
+
+    assert formatted == b'1.797693134e+308\n-1.797693134e+308\n'
+
+
+def test_format_csv_rows_rounding_carries_into_the_exponent():
+    assert format_csv_rows([np.array([9.9999])], precision=3) == b'1e+01\n'
+
+
+def test_format_csv_rows_special_values():
+    formatted = format_csv_rows([np.array([np.nan, np.inf, -np.inf, 0.0, -0.0])])
+
+    assert formatted == b'nan\ninf\n-inf\n0e+00\n-0e+00\n'
+    assert format_csv_rows([np.zeros(0)]) == b''
+
+
+def test_write_csv_in_chunks(tmp_path):
+    file_name = str(tmp_path / 'data.csv')
+    columns = [np.arange(10, dtype=float), np.arange(10, dtype=float) * 0.5]
+
+    write_csv(file_name, [['Time', 'Voltage']], columns, chunk_size=3)
+
+    with open(file_name, 'rb') as opened_file:
+        lines = opened_file.read().splitlines()
+    assert lines[0] == b'Time,Voltage'
+    assert parse_rows(b'\n'.join(lines[1:])) == [[i, i * 0.5] for i in range(10)]
+
+
+
+def test_collect_metadata_omits_unsupported_settings():
+    class Channel:
+        id = {'Name': 'CH1', 'No': 1}
+        is_enabled = True
+        coupling = 'DC'
+
+    class Device:
+        id = {'Vendor': 'Tiepie', 'Name': 'HS5', 'SerNo': '1', 'DevType': 'Osc'}
+        ch = [Channel()]
+        sample_freq = 1e6
+
+        @property
+        def rec_len(self):
+            raise NotImplementedError
+
+    metadata = collect_metadata(Device(), 123.0)
+
+    assert metadata['Device ID'] == Device.id
+    assert metadata['Timestamp'] == 123.0
+    assert metadata['Settings'] == {'sample_freq': 1e6}
+    assert metadata['Channels'] == {1: {'Name': 'CH1', 'is_enabled': True, 'coupling': 'DC'}}
+
+
+def test_collect_metadata_skips_unreadable_settings():
+    class Channel:
+        id = {'Name': 'CH1', 'No': 1}
+        coupling = 'DC'
+
+        @property
+        def is_enabled(self):
+            raise OSError('timeout')
+
+        @property
+        def range(self):
+            raise OSError('timeout')
+
+    class Device:
+        id = {'Vendor': 'Tiepie', 'Name': 'HS5', 'SerNo': '1', 'DevType': 'Osc'}
+        ch = [Channel()]
+
+        @property
+        def sample_freq(self):
+            raise OSError('timeout')
+
+    metadata = collect_metadata(Device(), 123.0)
+
+    assert metadata['Settings'] == {}
+    assert metadata['Channels'] == {1: {'Name': 'CH1', 'coupling': 'DC'}}
@@ -0,0 +1,87 @@
+"""Tests for `uniswag.device_registry` module."""
+import threading
+
+from uniswag.device_registry import DeviceRegistry
+
+
+def test_add_and_lookup():
+    registry = DeviceRegistry()
+
+    assert registry.add('Tiepie', 'HS5', '1', 'first', path='/usb/1')
+    assert registry.add('Tiepie', 'HS3', '2', 'second')
+    assert registry.add('Keysight', 'DSOX1102G', '3', 'third')
+
+    assert len(registry) == 3
+    assert registry.get('Tiepie', 'HS5', '1') == 'first'
+    assert registry.get('Tiepie', 'HS5', '9') is None
+    assert registry.get('Tiepie', 'HS5', '9', ()) == ()
+    assert registry.get_by_path('/usb/1') == (('Tiepie', 'HS5', '1'), 'first')
+    assert registry.has_path('/usb/1')
+    assert not registry.has_path('/usb/2')
+    assert registry.by_vendor('Tiepie') == ['first', 'second']
+    assert registry.by_vendor('Hantek') == []
+    assert sorted(registry.values()) == ['first', 'second', 'third']
+
+
+def test_add_refuses_duplicates():
+    registry = DeviceRegistry()
+
+    assert registry.add('Tiepie', 'HS5', '1', 'first', path='/usb/1')
+    # same identity
+    assert not registry.add('Tiepie', 'HS5', '1', 'other')
+    # same USB path
+    assert not registry.add('Tiepie', 'HS5', '2', 'other', path='/usb/1')
+
+    assert len(registry) == 1
+    assert registry.get('Tiepie', 'HS5', '1') == 'first'
+
+
+def test_remove():
+    registry = DeviceRegistry()
+    registry.add('Tiepie', 'HS5', '1', 'first', path='/usb/1')
+    registry.add('Tiepie', 'HS5', '2', 'second', path='/usb/2')
+
+    assert registry.remove('Tiepie', 'HS5', '1') == 'first'
+    assert registry.remove('Tiepie', 'HS5', '1') is None
+    assert not registry.has_path('/usb/1')
+
+    assert registry.remove_by_path('/usb/2') == (('Tiepie', 'HS5', '2'), 'second')
+    assert registry.remove_by_path('/usb/2') is None
+
+    assert len(registry) == 0
+    assert registry.by_vendor('Tiepie') == []
+
+    # the path can be reused once its entry has been removed
+    assert registry.add('Tiepie', 'HS5', '3', 'third', path='/usb/1')
+
+
+def test_listeners():
+    registry = DeviceRegistry()
+    events = []
+    registry.add_listener(lambda event, key, value: events.append((event, key, value)))
+
+    registry.add('Tiepie', 'HS5', '1', 'first', path='/usb/1')
+    registry.add('Tiepie', 'HS5', '1', 'duplicate')
+    registry.remove_by_path('/usb/1')
+    registry.remove('Tiepie', 'HS5', '1')
+
+    assert events == [('add', ('Tiepie', 'HS5', '1'), 'first'), ('remove', ('Tiepie', 'HS5', '1'), 'first')]
+
+
+def test_concurrent_add_registers_once():
+    registry = DeviceRegistry()
+    results = []
+    barrier = threading.Barrier(8)
+
+    def add():
+        barrier.wait()
+        results.append(registry.add('Tiepie', 'HS5', '1', threading.get_ident()))
+
+    threads = [threading.Thread(target=add) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 1
+    assert len(registry) == 1
@@ -0,0 +1,47 @@
+"""Tests for `uniswag.driver_registry` module."""
+import sys
+import threading
+import types
+
+from uniswag.driver_registry import Driver, DriverRegistry
+
+
+def test_drivers_are_imported_concurrently(tmp_path, monkeypatch):
+    # the driver module of vendor A can only finish importing once the one of vendor B was imported
+    sync = types.ModuleType('registry_sync')
+    sync.a_importing = threading.Event()
+    sync.b_imported = threading.Event()
+    monkeypatch.setitem(sys.modules, 'registry_sync', sync)
+    (tmp_path / 'registry_driver_a.py').write_text(
+        'import registry_sync\n'
+        'registry_sync.a_importing.set()\n'
+        'is_concurrent = registry_sync.b_imported.wait(5)\n'
+        'def list_devices():\n'
+        '    return is_concurrent\n')
+    (tmp_path / 'registry_driver_b.py').write_text(
+        'import registry_sync\n'
+        'registry_sync.b_imported.set()\n'
+        'def list_devices():\n'
+        '    return True\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for module_name in ('registry_driver_a', 'registry_driver_b'):
+        monkeypatch.delitem(sys.modules, module_name, raising=False)
+
+    registry = DriverRegistry([Driver('A', ['a'], device_lists=['registry_driver_a:list_devices'], device_classes={}),
+                               Driver('B', ['b'], device_lists=['registry_driver_b:list_devices'], device_classes={})])
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(A=registry.list_devices('A')[0]()))
+    thread.start()
+    assert sync.a_importing.wait(5)
+    results['B'] = registry.list_devices('B')[0]()
+    thread.join()
+
+    assert results == {'A': True, 'B': True}
+    assert set(registry.import_times) == {'registry_driver_a', 'registry_driver_b'}
+
+
+def test_references_are_resolved_once():
+    registry = DriverRegistry([])
+
+    assert registry.resolve('os.path:join') is registry.resolve('os.path:join')
+    assert registry.resolve('os.path') is sys.modules['os.path']
@@ -0,0 +1,38 @@
+"""Tests for `uniswag.frequency_response` module."""
+import numpy as np
+import pytest
+
+from uniswag.frequency_response import goertzel
+
+
+@pytest.mark.parametrize('freq', [1e3, 1234.5, 7777.0])
+def test_goertzel_amplitude_and_phase(freq):
+    sample_period = 1e-6
+    t = np.arange(10000) * sample_period
+
+    result = goertzel(1.5 * np.cos(2 * np.pi * freq * t + 0.3), sample_period, freq)
+
+    assert abs(result) == pytest.approx(1.5, rel=1e-3)
+    assert np.angle(result) == pytest.approx(0.3, abs=1e-3)
+
+
+def test_goertzel_ignores_other_frequencies():
+    sample_period = 1e-6
+    t = np.arange(20000) * sample_period
+    samples = np.sin(2 * np.pi * 1e3 * t) + 0.5 * np.sin(2 * np.pi * 10e3 * t)
+
+    assert abs(goertzel(samples, sample_period, 1e3)) == pytest.approx(1.0, rel=1e-3)
+    assert abs(goertzel(samples, sample_period, 10e3)) == pytest.approx(0.5, rel=1e-3)
+
+
+def test_goertzel_rows_yield_gain_and_phase():
+    sample_period = 1e-6
+    freq = 2.5e3
+    t = np.arange(8000) * sample_period
+    ref = np.sin(2 * np.pi * freq * t)
+    resp = 0.25 * np.sin(2 * np.pi * freq * t - np.pi / 4)
+
+    ref_amp, resp_amp = goertzel(np.vstack((ref, resp)), sample_period, freq)
+
+    assert abs(resp_amp) / abs(ref_amp) == pytest.approx(0.25, rel=1e-3)
+    assert np.degrees(np.angle(resp_amp * np.conj(ref_amp))) == pytest.approx(-45.0, abs=0.1)
@@ -0,0 +1,29 @@
+"""Tests for `uniswag.devices.gen_sequence` module."""
+import numpy as np
+
+from uniswag.devices.gen_sequence import GenSequence
+
+
+def test_arbitrary_data_is_fitted_once_ahead_of_time(simulated_devices, monkeypatch):
+    channel = simulated_devices['Manager'].get_device(simulated_devices['Gen']).ch[0]
+    # more distinct waveforms than the channel's cache of fitted arbitrary data holds
+    steps = [{'arb_data': np.sin(np.linspace(0, (i + 1) * np.pi, 1000))} for i in range(8)]
+
+    sequence = GenSequence(channel, steps)
+    fitted = [changes[0][1] for _, changes in sequence._plan]
+
+    def fail(*args, **kwargs):
+        raise AssertionError('arbitrary data was fitted while running the sequence')
+
+    uploaded = []
+    upload = channel.arb_data
+    monkeypatch.setattr(channel, '_fit_arb_data', fail)
+    monkeypatch.setattr(channel, 'arb_data', lambda value, *args, **kwargs: uploaded.append(value) or
+                        upload(value, *args, **kwargs))
+
+    sequence.start()
+    sequence._thread.join(10)
+
+    assert sequence.step_index == len(steps) - 1
+    assert len(uploaded) == len(steps)
+    assert all(buffer is expected for buffer, expected in zip(uploaded, fitted))
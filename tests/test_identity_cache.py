@@ -0,0 +1,86 @@
+"""Tests for `uniswag.identity_cache` module."""
+import json
+import time
+
+from uniswag.identity_cache import IdentityCache
+
+IDENTITY = {'Vendor': 'Tiepie', 'Name': 'HS5', 'SerNo': '12345'}
+
+
+def test_identity_is_persisted(tmp_path):
+    file_name = str(tmp_path / 'cache.json')
+
+    cache = IdentityCache(file_name)
+    assert cache.get('/usb/1', 'fp') is None
+    cache.put('/usb/1', IDENTITY, 'fp')
+    assert cache.get('/usb/1', 'fp') == IDENTITY
+
+    # another instance (e.g. the next run) reads the same identity from the file
+    assert IdentityCache(file_name).get('/usb/1', 'fp') == IDENTITY
+
+
+def test_changed_fingerprint_is_stale(tmp_path):
+    file_name = str(tmp_path / 'cache.json')
+
+    cache = IdentityCache(file_name)
+    cache.put('/usb/1', IDENTITY, 'fp')
+
+    # another device has been plugged into the same port
+    assert cache.get('/usb/1', 'other fp') is None
+
+    # the stale entry is discarded, even for the original fingerprint
+    assert cache.get('/usb/1', 'fp') is None
+    assert IdentityCache(file_name).get('/usb/1', 'fp') is None
+
+
+def test_unconfirmed_identity_expires(tmp_path):
+    file_name = str(tmp_path / 'cache.json')
+
+    IdentityCache(file_name).put('/usb/1', IDENTITY, 'fp')
+
+    # pretend the identity was confirmed a while ago
+    with open(file_name, 'r') as opened_file:
+        entries = json.load(opened_file)
+    entries['/usb/1']['Time'] = time.time() - 120
+    with open(file_name, 'w') as opened_file:
+        json.dump(entries, opened_file)
+
+    assert IdentityCache(file_name, max_age=3600).get('/usb/1', 'fp') == IDENTITY
+    assert IdentityCache(file_name, max_age=60).get('/usb/1', 'fp') is None
+
+
+def test_invalidate(tmp_path):
+    cache = IdentityCache(str(tmp_path / 'cache.json'))
+    cache.put('/usb/1', IDENTITY)
+
+    cache.invalidate('/usb/1')
+
+    assert cache.get('/usb/1') is None
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    file_name = tmp_path / 'cache.json'
+    file_name.write_text('{not json')
+
+    cache = IdentityCache(str(file_name))
+    assert cache.get('/usb/1') is None
+
+    cache.put('/usb/1', IDENTITY)
+    assert IdentityCache(str(file_name)).get('/usb/1') == IDENTITY
+
+
+def test_deferred_saving(tmp_path):
+    file_name = tmp_path / 'cache.json'
+    cache = IdentityCache(str(file_name))
+
+    cache.put('/usb/1', IDENTITY, save=False)
+    cache.put('/usb/2', IDENTITY, save=False)
+    assert not file_name.exists()
+
+    cache.flush()
+    assert IdentityCache(str(file_name)).get('/usb/2') == IDENTITY
+
+    # nothing has changed since, so the file is not written again
+    file_name.unlink()
+    cache.flush()
+    assert not file_name.exists()
@@ -0,0 +1,159 @@
+"""Tests for `uniswag.remote_control` module."""
+import asyncio
+import json
+
+import pytest
+
+from uniswag import remote_control
+from uniswag.remote_control import RemoteControl, RemoteControlClient, RemoteControlError, RemoteControlServer
+
+
+class EmptyDeviceManager:
+    device_list = []
+
+    @staticmethod
+    def get_device(device_id):
+        return None
+
+
+def handle(message, device_manager=None):
+    remote = RemoteControl(device_manager or EmptyDeviceManager())
+    response = asyncio.run(remote.handle(message))
+    return json.loads(response) if response is not None else None
+
+
+def request(method, params=None, request_id=1):
+    message = {'jsonrpc': '2.0', 'method': method, 'id': request_id}
+    if params is not None:
+        message['params'] = params
+    return message
+
+
+def test_parse_error():
+    response = handle('{not json')
+
+    assert response['error']['code'] == remote_control.PARSE_ERROR
+    assert response['id'] is None
+
+
+@pytest.mark.parametrize('message', [[], 42, {'method': 'get'}, {'jsonrpc': '2.0', 'method': 1}])
+def test_invalid_request(message):
+    response = handle(json.dumps(message))
+
+    assert response['error']['code'] == remote_control.INVALID_REQUEST
+
+
+def test_method_not_found():
+    response = handle(json.dumps(request('unknown')))
+
+    assert response == {'jsonrpc': '2.0', 'error': {'code': remote_control.METHOD_NOT_FOUND,
+                                                    'message': 'Method not found: unknown'}, 'id': 1}
+
+
+@pytest.mark.parametrize('params', [[1, 2], {'unknown': 1}, {'device': {'Vendor': 'Tiepie'}, 'names': ['rec_len']}])
+def test_invalid_params(params):
+    response = handle(json.dumps(request('get', params)))
+
+    assert response['error']['code'] == remote_control.INVALID_PARAMS
+
+
+def test_device_not_connected():
+    device_id = {'Vendor': 'Tiepie', 'Name': 'HS5', 'SerNo': '1', 'DevType': 'Osc'}
+
+    response = handle(json.dumps(request('get', {'device': device_id, 'names': ['rec_len']})))
+
+    assert response['error']['code'] == remote_control.DEVICE_ERROR
+
+
+def test_notifications_are_not_answered():
+    message = request('list_devices')
+    del message['id']
+
+    assert handle(json.dumps(message)) is None
+    assert handle(json.dumps([message, message])) is None
+
+
+def test_batch():
+    response = handle(json.dumps([request('list_devices', request_id=1), request('unknown', request_id=2)]))
+
+    assert [item['id'] for item in response] == [1, 2]
+    assert response[0]['result'] == []
+    assert response[1]['error']['code'] == remote_control.METHOD_NOT_FOUND
+
+
+def test_list_properties():
+    result = handle(json.dumps(request('list_properties')))['result']
+
+    assert set(result) == {'Osc', 'OscChannel', 'Gen', 'GenChannel'}
+    assert result['Osc']['rec_len'] is True
+    assert result['Osc']['is_running'] is False
+
+
+@pytest.fixture(scope='module')
+def client(simulated_devices):
+    server = RemoteControlServer(simulated_devices['Manager'])
+    remote_client = RemoteControlClient(*server.address, timeout=10)
+
+    yield remote_client
+
+    remote_client.close()
+    server.close()
+
+
+def test_get_and_set(client, simulated_devices):
+    osc_id = simulated_devices['Osc']
+
+    assert client.set(osc_id, {'measure_mode': 'repeat', 'rec_len': '2e3'}) == {'measure_mode': 'repeat',
+                                                                                  'rec_len': 2000}
+    assert client.get(osc_id, ['rec_len']) == {'rec_len': 2000}
+    assert client.set(osc_id, {'is_enabled': 'true'}, channel=2) == {'is_enabled': True}
+
+
+def test_set_errors(client, simulated_devices):
+    osc_id = simulated_devices['Osc']
+
+    with pytest.raises(RemoteControlError) as error:
+        client.set(osc_id, {'is_running': True})
+    assert error.value.code == remote_control.INVALID_PARAMS
+
+    with pytest.raises(RemoteControlError) as error:
+        client.set(osc_id, {'rec_len': 'many'})
+    assert error.value.code == remote_control.INVALID_PARAMS
+
+    with pytest.raises(RemoteControlError) as error:
+        client.get(osc_id, ['range'], channel=9)
+    assert error.value.code == remote_control.DEVICE_ERROR
+
+
+def test_bulk(client, simulated_devices):
+    osc_id = simulated_devices['Osc']
+    gen_id = simulated_devices['Gen']
+
+    results = client.bulk([
+        {'device': gen_id, 'channel': 1, 'set': {'freq': 1000}},
+        {'device': osc_id, 'set': {'rec_len': 3000}},
+        {'device': gen_id, 'channel': 1, 'set': {'freq': 2000}},
+        {'device': gen_id, 'channel': 1, 'get': ['freq']},
+        {'device': osc_id, 'get': ['unknown']},
+        {'device': osc_id, 'call': 'unknown'}
+    ])
+
+    assert results[0] == {'result': {'freq': 1000.0}}
+    assert results[1] == {'result': {'rec_len': 3000}}
+    # the requests of the same device are executed in order
+    assert results[3] == {'result': {'freq': 2000.0}}
+    assert results[4]['error']['code'] == remote_control.INVALID_PARAMS
+    assert results[5]['error']['code'] == remote_control.INVALID_PARAMS
+
+
+def test_pipelined_requests_are_executed_in_order(client, simulated_devices):
+    gen_id = simulated_devices['Gen']
+    requests = [request('set', {'device': gen_id, 'channel': 1, 'values': {'freq': freq}}, request_id=freq)
+                for freq in range(1000, 1020)]
+
+    # send all requests at once, before reading any response
+    client._connection.sendall(b''.join((json.dumps(message) + '\n').encode() for message in requests))
+    responses = [json.loads(client._file.readline()) for _ in requests]
+
+    assert [response['id'] for response in responses] == list(range(1000, 1020))
+    assert client.get(gen_id, ['freq'], channel=1) == {'freq': 1019.0}
@@ -0,0 +1,104 @@
+"""Tests for `uniswag.devices.software_trigger` module."""
+import numpy as np
+
+from uniswag.devices.software_trigger import SoftwareTrigger
+
+
+def make_trigger(kind, **settings):
+    trigger = SoftwareTrigger()
+    trigger.kind = kind
+    for name, value in settings.items():
+        setattr(trigger, name, value)
+    return trigger
+
+
+def test_rising_edge():
+    samples = np.array([0, 0, 1, 1, 0, 0, 1, 1], dtype=float)
+    trigger = make_trigger('Rising edge', lvl=0.5)
+
+    assert trigger.find_triggers(samples, 1.0).tolist() == [2, 6]
+
+
+def test_falling_edge():
+    samples = np.array([1, 1, 0, 0, 1, 0], dtype=float)
+    trigger = make_trigger('Falling edge', lvl=0.5)
+
+    assert trigger.find_triggers(samples, 1.0).tolist() == [2, 5]
+
+
+def test_hysteresis_rearms_only_below_the_hysteresis():
+    # the dip to 0.4 does not re-arm the trigger, the dip to 0.0 does
+    samples = np.array([0.0, 1.0, 0.4, 1.0, 0.0, 1.0], dtype=float)
+    trigger = make_trigger('Rising edge', lvl=0.5, hyst=0.3)
+
+    assert trigger.find_triggers(samples, 1.0).tolist() == [1, 5]
+
+
+def test_trigger_is_not_armed_before_the_level_is_crossed():
+    # the signal starts above the level, so its first rising edge is the one at index 4
+    samples = np.array([1.0, 1.0, 0.4, 1.0, 0.0, 1.0], dtype=float)
+    trigger = make_trigger('Rising edge', lvl=0.5, hyst=0.3)
+
+    assert trigger.find_triggers(samples, 1.0).tolist() == [5]
+
+
+def test_window_enter_and_exit():
+    samples = np.array([-1, 0.5, 0.5, 2, 2, 0.5, -1], dtype=float)
+
+    enter = make_trigger('Window enter', lvl=0.0, lvl_high=1.0)
+    assert enter.find_triggers(samples, 1.0).tolist() == [1, 5]
+
+    leave = make_trigger('Window exit', lvl=0.0, lvl_high=1.0)
+    assert leave.find_triggers(samples, 1.0).tolist() == [3, 6]
+
+
+def test_pulse_width():
+    # pulses of 2, 4 and 6 samples
+    samples = np.zeros(30)
+    samples[2:4] = 1
+    samples[8:12] = 1
+    samples[16:22] = 1
+    trigger = make_trigger('Pulse width', lvl=0.5, width_min=3.0, width_max=5.0)
+
+    assert trigger.find_triggers(samples, 1.0).tolist() == [8]
+
+
+def test_off_finds_nothing():
+    trigger = make_trigger('Off')
+
+    assert not trigger.is_enabled
+    assert len(trigger.find_triggers(np.array([0, 1, 0, 1], dtype=float), 1.0)) == 0
+
+
+def test_scan_aligns_segments_of_all_channels():
+    src = np.zeros(100)
+    src[30:] = 1.0
+    other = np.arange(100, dtype=float)
+    trigger = make_trigger('Rising edge', lvl=0.5, seg_len=10, pre_ratio=0.5)
+
+    segment_time, segments, trigger_times = trigger.scan(1e-3, {1: src, 2: other})
+
+    assert segment_time.tolist() == (np.arange(-5, 5) * 1e-3).tolist()
+    assert segments[1].shape == (1, 10)
+    assert segments[2][0].tolist() == list(range(25, 35))
+    assert trigger_times.tolist() == [(30 - 100) * 1e-3]
+
+
+def test_continuous_scan_finds_events_spanning_two_blocks():
+    trigger = make_trigger('Rising edge', lvl=0.5, seg_len=10, pre_ratio=0.5)
+    first = np.zeros(50)
+    first[48:] = 1.0
+    second = np.ones(50)
+
+    # the event at the end of the first block lacks the samples after it
+    _, segments, _ = trigger.scan(1.0, {1: first}, continuous=True)
+    assert len(segments[1]) == 0
+
+    # it is found once the next block follows
+    _, segments, _ = trigger.scan(1.0, {1: second}, continuous=True)
+    assert len(segments[1]) == 1
+    assert segments[1][0].tolist() == [0.0] * 5 + [1.0] * 5
+
+    # and only once
+    _, segments, _ = trigger.scan(1.0, {1: second}, continuous=True)
+    assert len(segments[1]) == 0
@@ -0,0 +1,114 @@
+"""Tests for `uniswag.streaming` module."""
+import time
+
+import numpy as np
+import pytest
+
+from uniswag.headless import device_key
+from uniswag.streaming import HEADER, StreamClient, StreamingServer, decode_frame, encode_frame
+
+
+def make_frame(frame_id=7, sample_cnt=1000, ch_numbers=(1, 2)):
+    time_vector = np.arange(sample_cnt) * 1e-6 - 1e-4
+    points = {no: ((time_vector, np.sin(time_vector * 1e4 + no)), (np.zeros(1), np.zeros(1))) for no in ch_numbers}
+    return {'Frame': frame_id, 'Points': points}
+
+
+def round_trip(message):
+    return decode_frame(message[:HEADER.size], message[HEADER.size:])
+
+
+@pytest.mark.parametrize('decimation', [1, 3, 10])
+@pytest.mark.parametrize('compress', [False, True])
+def test_encode_decode_round_trip(decimation, compress):
+    retrieved_vals = make_frame()
+
+    frame = round_trip(encode_frame('Tiepie_HS5_1', retrieved_vals, 123.5, decimation, compress))
+
+    assert frame['Device'] == 'Tiepie_HS5_1'
+    assert frame['Frame'] == 7
+    assert frame['Timestamp'] == 123.5
+    assert frame['Decimation'] == decimation
+    time_vector = retrieved_vals['Points'][1][0][0][::decimation]
+    np.testing.assert_allclose(frame['Time'], time_vector, atol=1e-12)
+    assert sorted(frame['Data']) == [1, 2]
+    for no, data in frame['Data'].items():
+        np.testing.assert_array_equal(data, retrieved_vals['Points'][no][0][1][::decimation].astype(np.float32))
+
+
+def test_compression_shrinks_redundant_payloads():
+    retrieved_vals = make_frame()
+    for no in retrieved_vals['Points']:
+        retrieved_vals['Points'][no] = ((retrieved_vals['Points'][no][0][0], np.zeros(1000)), None)
+
+    assert len(encode_frame('key', retrieved_vals, 0.0, compress=True)) < \
+        len(encode_frame('key', retrieved_vals, 0.0)) // 10
+
+
+def test_channels_of_different_lengths_are_truncated():
+    retrieved_vals = make_frame()
+    time_vector, voltage = retrieved_vals['Points'][2][0]
+    retrieved_vals['Points'][2] = ((time_vector[:600], voltage[:600]), None)
+
+    frame = round_trip(encode_frame('key', retrieved_vals, 0.0))
+
+    assert len(frame['Time']) == 600
+    assert all(len(data) == 600 for data in frame['Data'].values())
+
+
+def test_decode_rejects_other_messages():
+    message = bytearray(encode_frame('key', make_frame(), 0.0))
+    message[:4] = b'XXXX'
+
+    with pytest.raises(ValueError):
+        round_trip(bytes(message))
+
+
+def test_invalid_subscription_is_rejected():
+    server = StreamingServer()
+    try:
+        with pytest.raises(ConnectionError):
+            StreamClient(*server.address, decimation=0, timeout=5)
+        with pytest.raises(ConnectionError):
+            StreamClient(*server.address, policy='unknown', timeout=5)
+    finally:
+        server.close()
+
+
+def test_loopback_streaming(simulated_devices):
+    osc = simulated_devices['Manager'].get_device(simulated_devices['Osc'])
+    osc.measure_mode = 'repeat'
+    for ch in osc.ch:
+        ch.is_enabled = True
+
+    server = StreamingServer()
+    try:
+        with StreamClient(*server.address, decimation=4, compress=True, timeout=10) as client, \
+                StreamClient(*server.address, devices=['no such device'], timeout=10) as other_client:
+
+            osc.start()
+            published = []
+            frame_id = osc.retrieve()['Frame']
+            for _ in range(3):
+                retrieved_vals = osc.wait_for_frame(frame_id, 10)
+                assert retrieved_vals is not None
+                frame_id = retrieved_vals['Frame']
+                server(osc, retrieved_vals)
+                published.append(retrieved_vals)
+            osc.stop()
+
+            for retrieved_vals in published:
+                frame = client.receive()
+                assert frame['Device'] == device_key(osc)
+                assert frame['Frame'] == retrieved_vals['Frame']
+                assert sorted(frame['Data']) == sorted(retrieved_vals['Points'])
+                np.testing.assert_array_equal(frame['Data'][1],
+                                              retrieved_vals['Points'][1][0][1][::4].astype(np.float32))
+
+            # the subscriber of another device has not received any frame
+            deadline = time.time() + 5
+            while len(server.stats) < 2 and time.time() < deadline:
+                time.sleep(0.01)
+            assert sorted(stats['Sent'] for stats in server.stats) == [0, 3]
+    finally:
+        server.close()
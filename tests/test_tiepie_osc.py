@@ -0,0 +1,60 @@
+"""Tests for `uniswag.devices.oscilloscopes.tiepie_osc` module."""
+import pytest
+
+
+def acquire_frame(osc):
+    osc.start()
+    try:
+        return osc.wait_for_frame(osc.retrieve()['Frame'], 10)
+    finally:
+        osc.stop()
+
+
+@pytest.fixture
+def osc(simulated_devices):
+    osc = simulated_devices['Manager'].get_device(simulated_devices['Osc'])
+    osc.measure_mode = 'repeat'
+    for ch in osc.ch:
+        ch.is_enabled = True
+
+    yield osc
+
+    osc.seg_cnt = 1
+
+
+def test_segments_without_timestamps(osc):
+    osc.seg_cnt = 3
+
+    retrieved_vals = acquire_frame(osc)
+
+    segments = retrieved_vals['Segments']
+    assert sorted(segments['Data']) == [1, 2]
+    assert segments['Data'][1].shape == (3, len(segments['Time']))
+    # the library does not provide the segments' trigger timestamps
+    assert segments['Timestamps'] is None
+
+
+def test_retrieval_without_private_library_members(osc, monkeypatch, capsys):
+    monkeypatch.delattr(osc._osc, '_dev_handle')
+
+    for _ in range(2):
+        retrieved_vals = acquire_frame(osc)
+        assert retrieved_vals is not None
+        (time_vector, voltage), _ = retrieved_vals['Points'][1]
+        assert len(time_vector) == len(voltage) == osc.rec_len
+
+    # the fallback is only reported once
+    assert capsys.readouterr().out.count('falling back') == 1
+
+
+def test_capabilities_are_read_once(osc, monkeypatch):
+    osc.load_capabilities()
+    expected = (osc.measure_modes_avail, osc.res_avail, osc.auto_res_avail, osc.clock_src_avail, osc.clock_outs_avail)
+
+    # the capabilities are not read from the library again
+    for name in ['measure_modes_available', 'resolutions_available', 'auto_resolutions_available',
+                 'clock_sources_available', 'clock_outputs_available']:
+        monkeypatch.delattr(osc._osc, name)
+
+    assert (osc.measure_modes_avail, osc.res_avail, osc.auto_res_avail, osc.clock_src_avail,
+            osc.clock_outs_avail) == expected
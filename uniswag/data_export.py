@@ -0,0 +1,496 @@
+import fractions
+import json
+
+import numpy as np
+
+# optional dependencies, only required for the respective export formats
+try:
+    import h5py
+except ImportError:
+    h5py = None
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# the names of the oscilloscope settings which are stored as metadata (if available for the respective device)
+OSC_SETTINGS = ['measure_mode', 'sample_freq', 'rec_len', 'pre_sample_ratio', 'seg_cnt', 'res', 'time_base']
+
+# the names of the oscilloscope channel settings which are stored as metadata (if available for the respective channel)
+OSC_CH_SETTINGS = ['range', 'is_auto_range', 'coupling', 'probe_gain', 'probe_offset']
+
+
+# the maximum number of significant digits of formatted CSV values (sufficient for any float to be read back exactly)
+CSV_DIGITS = 17
+
+# the range of the decimal scaling exponents which occur when formatting floats
+_SCALE_EXPONENT_MIN = -310
+_SCALE_EXPONENT_MAX = 345
+
+# splits floats into two halves of 26 significant bits each (Dekker's algorithm)
+_SPLITTER = 134217729.0  # 2 ** 27 + 1
+
+
+def _decimal_scale_table():
+    """
+    Tabulates the powers of ten that scale floats to integer mantissas.
+
+    Each power 10^s is split into a factor between 0.5 and 2 and a power of two 2^t.
+    The factor is stored as the sum of two floats (a so-called double-double),
+    so that scaling a value by it is accurate to about 100 bits and neither overflows nor underflows.
+    The leading float is split into two halves in addition, as required for multiplying it exactly.
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray):
+            A tuple of the leading floats, their upper and lower halves, the trailing floats and the exponents t,
+            each one indexed by s minus the minimum scaling exponent.
+    """
+    exponents = range(_SCALE_EXPONENT_MIN, _SCALE_EXPONENT_MAX + 1)
+    factors_hi = np.empty(len(exponents))
+    factors_lo = np.empty(len(exponents))
+    binary_exponents = np.empty(len(exponents), dtype=np.int64)
+
+    for i, exponent in enumerate(exponents):
+        power = fractions.Fraction(10) ** exponent
+        binary_exponent = power.numerator.bit_length() - power.denominator.bit_length()
+        factor = power / fractions.Fraction(2) ** binary_exponent
+        factors_hi[i] = float(factor)
+        factors_lo[i] = float(factor - fractions.Fraction(factors_hi[i]))
+        binary_exponents[i] = binary_exponent
+
+    upper = _SPLITTER * factors_hi - (_SPLITTER * factors_hi - factors_hi)
+
+    return factors_hi, upper, factors_hi - upper, factors_lo, binary_exponents
+
+
+_SCALE_FACTORS_HI, _SCALE_FACTORS_HI_UPPER, _SCALE_FACTORS_HI_LOWER, _SCALE_FACTORS_LO, _SCALE_BINARY_EXPONENTS = \
+    _decimal_scale_table()
+
+# the characters of all groups of four decimal digits (packed into 32 bit words),
+# once complete and once with trailing zeros being replaced by null characters
+_DIGIT_GROUPS = np.frombuffer(''.join('{:04d}'.format(i) for i in range(10000)).encode(), dtype='<u4')
+_DIGIT_GROUPS_STRIPPED = np.frombuffer(
+    b''.join('{:04d}'.format(i).rstrip('0').encode().ljust(4, b'\0') for i in range(10000)), dtype='<u4')
+
+
+def _scale_to_mantissa(fraction, binary_exponent, decimal_exponent):
+    """
+    Scales positive floats to numbers of 17 digits before the decimal point.
+
+    Args:
+        fraction (np.ndarray):
+            The binary fractions of the values (between 0.5 and 1), as returned by np.frexp.
+        binary_exponent (np.ndarray):
+            The binary exponents of the values, as returned by np.frexp.
+        decimal_exponent (np.ndarray):
+            The decimal exponents of the values' first significant digits.
+
+    Returns:
+        (np.ndarray, np.ndarray):
+            A tuple of the whole and the fractional parts of the scaled values (int64 and float between 0 and 1).
+    """
+    index = CSV_DIGITS - 1 - decimal_exponent - _SCALE_EXPONENT_MIN
+    factor_hi = _SCALE_FACTORS_HI[index]
+    factor_upper = _SCALE_FACTORS_HI_UPPER[index]
+    factor_lower = _SCALE_FACTORS_HI_LOWER[index]
+
+    # multiply the fractions with the double-double factors, the rounding error of the leading product being exact
+    fraction_upper = _SPLITTER * fraction
+    fraction_upper -= fraction_upper - fraction
+    fraction_lower = fraction - fraction_upper
+    hi = fraction * factor_hi
+    lo = ((fraction_upper * factor_upper - hi) + fraction_upper * factor_lower + fraction_lower * factor_upper) + \
+        fraction_lower * factor_lower + fraction * _SCALE_FACTORS_LO[index]
+
+    # (the scaled values are around 10^16, so the power of two neither overflows nor underflows)
+    scale = np.ldexp(1.0, binary_exponent + _SCALE_BINARY_EXPONENTS[index])
+    hi *= scale
+    lo *= scale
+
+    whole = np.floor(hi)
+    fractional = (hi - whole) + lo
+    carry = np.floor(fractional)
+
+    return whole.astype(np.int64) + carry.astype(np.int64), fractional - carry
+
+
+def _decimal_mantissas(magnitude, precision):
+    """
+    Decomposes positive finite floats into integer mantissas of 17 digits and decimal exponents.
+
+    The mantissas are rounded to the requested number of significant digits (with trailing zeros up to 17 digits),
+    except for values close to the largest float, which are truncated so that they are not read back as infinity.
+    Without a precision, each value is rounded to the fewest digits (15, 16 or 17)
+    that are read back as exactly the same float.
+
+    Args:
+        magnitude (np.ndarray):
+            The (positive and finite) values.
+        precision (int or None):
+            The number of significant digits (1 to 17), or None for the shortest exact representation.
+
+    Returns:
+        (np.ndarray, np.ndarray):
+            A tuple of the mantissas (between 10^16 and 10^17 - 1) and the decimal exponents.
+    """
+    fraction, binary_exponent = np.frexp(magnitude)
+
+    # the estimated decimal exponents might be off by one, which is corrected afterwards
+    decimal_exponent = np.floor(np.log10(magnitude)).astype(np.int64)
+    whole, fractional = _scale_to_mantissa(fraction, binary_exponent, decimal_exponent)
+    while True:
+        wrong = (whole < 10 ** (CSV_DIGITS - 1)) | (whole >= 10 ** CSV_DIGITS)
+        if not wrong.any():
+            break
+        decimal_exponent[wrong] += np.where(whole[wrong] < 10 ** (CSV_DIGITS - 1), -1, 1)
+        whole[wrong], fractional[wrong] = _scale_to_mantissa(
+            fraction[wrong], binary_exponent[wrong], decimal_exponent[wrong])
+
+    if precision is None:
+        # the last two digits (including the fractional part), rounded to 17, 16 and 15 significant digits
+        remainder = whole % 100
+        low = remainder + fractional
+        rounded = [np.floor(low + 0.5), np.floor(low * 0.1 + 0.5) * 10, np.floor(low * 0.01 + 0.5) * 100]
+
+        # half the distance to the neighboring floats, in units of the 17th digit
+        # (halved again for powers of two, whose distance to the next smaller float is only half as large)
+        half_ulp = whole / fraction * 2.0 ** -54
+        half_ulp[fraction == 0.5] *= 0.5
+        subnormal = binary_exponent < -1021
+        if subnormal.any():
+            half_ulp[subnormal] = np.ldexp(half_ulp[subnormal], -1021 - binary_exponent[subnormal])
+        # (with a safety margin for the residual error of the scaled values)
+        half_ulp *= 1 - 2.0 ** -20
+
+        # shorter representations replace longer ones if they are read back exactly
+        # (the one with 17 digits always is)
+        result = rounded[0]
+        for shorter in rounded[1:]:
+            result = np.where(np.abs(shorter - low) < half_ulp, shorter, result)
+
+        mantissa = (whole - remainder) + result.astype(np.int64)
+    else:
+        # round half to even
+        unit = 10 ** (CSV_DIGITS - min(max(precision, 1), CSV_DIGITS))
+        quotient, remainder = np.divmod(whole, unit)
+        share = (remainder + fractional) / unit
+        mantissa = (quotient + ((share > 0.5) | ((share == 0.5) & (quotient % 2 == 1)))) * unit
+
+        # values close to the largest float are rounded towards zero, so that they are not read back as infinity
+        # (the largest float is 1.7976931348623157e+308)
+        overflow = (decimal_exponent == 308) & (mantissa > 17976931348623157)
+        mantissa[overflow] = quotient[overflow] * unit
+
+    # rounding may carry over into an additional digit (e.g. 9.99...9 -> 10.00...0)
+    carry = mantissa >= 10 ** CSV_DIGITS
+    mantissa[carry] //= 10
+    decimal_exponent[carry] += 1
+
+    return mantissa, decimal_exponent
+
+
+def format_csv_rows(columns, precision=None):
+    """
+    Formats the passed columns as CSV rows (comma-separated values, one row per line).
+
+    All values are formatted in scientific notation, with trailing zeros of the mantissa being omitted.
+    By default, each value is written with as few significant digits (but at most 17) as are needed
+    to read back exactly the same float.
+    Instead of formatting each value individually, the characters of all values are assembled at once
+    within a single byte array, which is considerably faster than any per-value formatting in Python.
+
+    Args:
+        columns (list[np.ndarray]):
+            The columns to format (all of which need to be of equal length).
+        precision (int or None):
+            The number of significant digits (up to 17), or None for the shortest exact representation.
+            Note that values rounded to fewer digits are generally not read back exactly.
+
+    Returns:
+        bytes:
+            The formatted rows, each one terminated by a line break.
+    """
+    values = np.column_stack([np.asarray(column, dtype=float) for column in columns])
+    row_cnt, col_cnt = values.shape
+    if not values.size:
+        return b''
+
+    # each value is represented by a field of the fixed width "-d.dddddddddddddddde-ddd,",
+    # unused characters are set to zero and removed in the end
+    fields = np.zeros((row_cnt, col_cnt, CSV_DIGITS + 8), dtype=np.uint8)
+
+    # decompose each value into an integer mantissa of 17 digits and a decimal exponent
+    # (zeros and non-finite values are decomposed as ones and replaced afterwards)
+    magnitude = np.abs(values)
+    finite = np.isfinite(values)
+    special = ~finite | (magnitude == 0)
+    has_special = special.any()
+    if has_special:
+        magnitude[special] = 1.0
+    mantissa, exponent = _decimal_mantissas(magnitude, precision)
+    if has_special:
+        mantissa[special] = 0
+        exponent[special] = 0
+
+    # sign (including the one of negative zero)
+    fields[:, :, 0] = np.signbit(values) * ord('-')
+
+    # mantissa digits, written in groups of four, with trailing zeros being omitted
+    # (as well as the decimal point if no digits follow it)
+    first, remainder = np.divmod(mantissa, 10 ** (CSV_DIGITS - 1))
+    upper, lower = np.divmod(remainder, 10 ** 8)
+    groups = np.divmod(upper.astype(np.int32), 10000) + np.divmod(lower.astype(np.int32), 10000)
+    words = np.empty(values.shape + (len(groups),), dtype='<u4')
+    trailing = np.ones(values.shape, dtype=bool)
+    for i in range(len(groups) - 1, -1, -1):
+        # the last group that is not zero is stripped, the groups after it are zero and thus stripped completely
+        words[:, :, i] = np.where(trailing, _DIGIT_GROUPS_STRIPPED[groups[i]], _DIGIT_GROUPS[groups[i]])
+        trailing &= groups[i] == 0
+    fields[:, :, 3:CSV_DIGITS + 2] = words.view(np.uint8)
+    fields[:, :, 2] = ~trailing * ord('.')
+    fields[:, :, 1] = first + ord('0')
+
+    # exponent (at least two digits)
+    fields[:, :, CSV_DIGITS + 2] = ord('e')
+    fields[:, :, CSV_DIGITS + 3] = np.where(exponent < 0, ord('-'), ord('+'))
+    exponent = np.abs(exponent)
+    fields[:, :, CSV_DIGITS + 4] = np.where(exponent >= 100, exponent // 100 + ord('0'), 0)
+    fields[:, :, CSV_DIGITS + 5] = (exponent // 10) % 10 + ord('0')
+    fields[:, :, CSV_DIGITS + 6] = exponent % 10 + ord('0')
+
+    # replace the fields of non-finite values
+    if not finite.all():
+        for value in (np.nan, np.inf, -np.inf):
+            mask = np.isnan(values) if value != value else values == value
+            fields[mask] = 0
+            fields[mask, :len(repr(value))] = np.frombuffer(repr(value).encode(), dtype=np.uint8)
+
+    # separators
+    fields[:, :, -1] = ord(',')
+    fields[:, -1, -1] = ord('\n')
+
+    return fields[fields != 0].tobytes()
+
+
+def write_csv(file_name, header, columns, chunk_size=65536):
+    """
+    Writes the passed columns to a CSV file.
+
+    The rows are formatted and written in chunks, limiting the memory consumption of large files.
+
+    Args:
+        file_name (str):
+            The absolute path of the file to write (including the file extension).
+        header (list[list[str]]):
+            The header rows to write before the data.
+        columns (list[np.ndarray]):
+            The columns to write (all of which need to be of equal length).
+        chunk_size (int):
+            The number of rows formatted at once.
+    """
+    row_cnt = min((len(column) for column in columns), default=0)
+
+    with open(file_name, 'wb') as opened_file:
+        for row in header:
+            opened_file.write((','.join(row) + '\n').encode())
+
+        for start in range(0, row_cnt, chunk_size):
+            stop = min(start + chunk_size, row_cnt)
+            opened_file.write(format_csv_rows([column[start:stop] for column in columns]))
+
+
+def collect_metadata(device, timestamp):
+    """
+    Reads the settings of an oscilloscope and its channels which are stored alongside exported measurement data.
+
+    Settings that are not supported by the device (or cannot be read, e.g. due to a communication error)
+    are omitted.
+
+    Args:
+        device (Oscilloscope):
+            The oscilloscope whose settings are read.
+        timestamp (float):
+            The UNIX time at which the measurement data was retrieved.
+
+    Returns:
+        dict[str, Any]:
+            A dictionary with the keys 'Device ID', 'Timestamp', 'Settings' and 'Channels',
+            the latter containing the channel settings per channel number.
+    """
+    settings = {}
+    for name in OSC_SETTINGS:
+        try:
+            settings[name] = getattr(device, name)
+        except Exception:
+            pass
+
+    channels = {}
+    for channel in device.ch:
+        ch_settings = {'Name': channel.id['Name']}
+        for name in ['is_enabled'] + OSC_CH_SETTINGS:
+            try:
+                ch_settings[name] = getattr(channel, name)
+            except Exception:
+                pass
+        channels[channel.id['No']] = ch_settings
+
+    return {'Device ID': dict(device.id), 'Timestamp': timestamp, 'Settings': settings, 'Channels': channels}
+
+
+def _metadata_to_json(metadata):
+    """
+    Serializes the passed metadata, converting all values that are not natively supported to strings.
+
+    Args:
+        metadata (dict[str, Any]):
+            The metadata as provided by the collecting method.
+
+    Returns:
+        str:
+            The metadata in JSON format.
+    """
+    return json.dumps(metadata, default=str)
+
+
+def write_npz(file_name, retrieved_vals, metadata):
+    """
+    Writes the measurement data of an oscilloscope to a compressed NPZ file.
+
+    For each channel, the arrays 'chN_time', 'chN_voltage', 'chN_frequency' and 'chN_share' are stored
+    (with N being the channel number).
+    In case of a segmented measurement, 'chN_segments' (segments × samples) as well as
+    'segment_time' and 'segment_timestamps' (if the segments' timestamps are available) are stored additionally.
+    The metadata is stored as JSON string in the array 'metadata'.
+
+    Args:
+        file_name (str):
+            The absolute path of the file to write (including the file extension).
+        retrieved_vals (dict[str, Any]):
+            The measurement data as provided by the oscilloscope's retrieving method.
+        metadata (dict[str, Any]):
+            The metadata as provided by the collecting method.
+    """
+    arrays = {'metadata': np.array(_metadata_to_json(metadata))}
+    for ch_no, ((time, voltage), (frequency, share)) in retrieved_vals['Points'].items():
+        arrays['ch' + str(ch_no) + '_time'] = time
+        arrays['ch' + str(ch_no) + '_voltage'] = voltage
+        arrays['ch' + str(ch_no) + '_frequency'] = frequency
+        arrays['ch' + str(ch_no) + '_share'] = share
+
+    segments = retrieved_vals['Segments']
+    if segments is not None:
+        arrays['segment_time'] = segments['Time']
+        if segments['Timestamps'] is not None:
+            arrays['segment_timestamps'] = segments['Timestamps']
+        for ch_no, data in segments['Data'].items():
+            arrays['ch' + str(ch_no) + '_segments'] = data
+
+    np.savez_compressed(file_name, **arrays)
+
+
+def write_hdf5(file_name, retrieved_vals, metadata):
+    """
+    Writes the measurement data of an oscilloscope to an HDF5 file.
+
+    For each channel, a group 'chN' (with N being the channel number) is created,
+    containing the datasets 'time', 'voltage', 'frequency' and 'share'
+    and the channel's settings as attributes.
+    In case of a segmented measurement, each group additionally contains the dataset 'segments'
+    (segments × samples), while the datasets 'segment_time' and 'segment_timestamps'
+    (if the segments' timestamps are available) are stored at the root.
+    The complete metadata is stored as JSON string in the root attribute 'metadata'.
+
+    Requires the optional dependency "h5py".
+
+    Args:
+        file_name (str):
+            The absolute path of the file to write (including the file extension).
+        retrieved_vals (dict[str, Any]):
+            The measurement data as provided by the oscilloscope's retrieving method.
+        metadata (dict[str, Any]):
+            The metadata as provided by the collecting method.
+
+    Raises:
+        ImportError:
+            If "h5py" is not installed.
+    """
+    if h5py is None:
+        raise ImportError('The HDF5 export requires the "h5py" package.')
+
+    with h5py.File(file_name, 'w') as opened_file:
+        opened_file.attrs['metadata'] = _metadata_to_json(metadata)
+        opened_file.attrs['device_id'] = '_'.join(metadata['Device ID'].values())
+        opened_file.attrs['timestamp'] = metadata['Timestamp']
+
+        for ch_no, ((time, voltage), (frequency, share)) in retrieved_vals['Points'].items():
+            group = opened_file.create_group('ch' + str(ch_no))
+            group.create_dataset('time', data=time)
+            group.create_dataset('voltage', data=voltage)
+            group.create_dataset('frequency', data=frequency)
+            group.create_dataset('share', data=share)
+
+            # HDF5 attributes only support scalar values and arrays
+            for name, value in metadata['Channels'].get(ch_no, {}).items():
+                group.attrs[name] = value if isinstance(value, (bool, int, float, str)) else str(value)
+
+        segments = retrieved_vals['Segments']
+        if segments is not None:
+            opened_file.create_dataset('segment_time', data=segments['Time'])
+            if segments['Timestamps'] is not None:
+                opened_file.create_dataset('segment_timestamps', data=segments['Timestamps'])
+            for ch_no, data in segments['Data'].items():
+                opened_file.require_group('ch' + str(ch_no)).create_dataset('segments', data=data)
+
+
+def write_parquet(file_name, retrieved_vals, metadata):
+    """
+    Writes the measurement data of an oscilloscope to a Parquet file.
+
+    All graphs are stored in a single table in long format with the columns 'Channel', 'Graph' ('Norm', 'FFT'
+    or 'Segments'), 'Segment' (the segment number starting from 1, 0 for all other graphs), 'X' and 'Y'.
+    The metadata is stored as JSON string within the table's schema metadata (key 'uniswag').
+    In case of a segmented measurement, the segments' timestamps (if available) are part of the metadata.
+
+    Requires the optional dependency "pyarrow".
+
+    Args:
+        file_name (str):
+            The absolute path of the file to write (including the file extension).
+        retrieved_vals (dict[str, Any]):
+            The measurement data as provided by the oscilloscope's retrieving method.
+        metadata (dict[str, Any]):
+            The metadata as provided by the collecting method.
+
+    Raises:
+        ImportError:
+            If "pyarrow" is not installed.
+    """
+    if pyarrow is None:
+        raise ImportError('The Parquet export requires the "pyarrow" package.')
+
+    # the graphs as tuples of channel number, graph type, segment number and the X & Y vectors
+    graphs = []
+    for ch_no, (norm, fft) in retrieved_vals['Points'].items():
+        graphs.append((ch_no, 'Norm', 0) + tuple(norm))
+        graphs.append((ch_no, 'FFT', 0) + tuple(fft))
+
+    segments = retrieved_vals['Segments']
+    if segments is not None:
+        if segments['Timestamps'] is not None:
+            metadata = dict(metadata, **{'Segment timestamps': segments['Timestamps'].tolist()})
+        for ch_no, data in segments['Data'].items():
+            for i, segment in enumerate(data):
+                graphs.append((ch_no, 'Segments', i + 1, segments['Time'], segment))
+
+    lengths = [len(graph[3]) for graph in graphs]
+    table = pyarrow.table({
+        'Channel': np.repeat([graph[0] for graph in graphs], lengths).astype(np.int16),
+        'Graph': pyarrow.array(np.repeat([graph[1] for graph in graphs], lengths)).dictionary_encode(),
+        'Segment': np.repeat([graph[2] for graph in graphs], lengths).astype(np.int32),
+        'X': np.concatenate([np.asarray(graph[3], dtype=float) for graph in graphs] or [np.empty(0)]),
+        'Y': np.concatenate([np.asarray(graph[4], dtype=float) for graph in graphs] or [np.empty(0)])
+    })
+    table = table.replace_schema_metadata({'uniswag': _metadata_to_json(metadata)})
+
+    pyarrow.parquet.write_table(table, file_name)
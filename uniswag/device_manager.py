@@ -1,17 +1,15 @@
+import concurrent.futures
 import threading
 
-from uniswag.devices.generators.tektronix_gen import TektronixGen
-from uniswag.devices.generators.tiepie_gen import TiepieGen
-from uniswag.devices.oscilloscopes.keysight_osc import KeysightOsc
+from uniswag.device_registry import DeviceRegistry
+from uniswag.devices.oscilloscope import Oscilloscope
 from uniswag.devices.oscilloscopes.math_osc import MathOsc
-from uniswag.devices.oscilloscopes.tektronix_osc import TektronixOsc
-from uniswag.devices.oscilloscopes.tiepie_osc import TiepieOsc
-from uniswag.devices.oscilloscopes.hantek_osc import HantekOsc
+from uniswag.driver_registry import DriverRegistry
 from uniswag.usb_device_daemon import USBDeviceDaemon
 
 
 class DeviceManager:
-    def __init__(self, list_event_callback, device_stopped_callback):
+    def __init__(self, list_event_callback, device_stopped_callback, drivers=None, monitor_usb=True):
         """
         Provides an up-to-date list of currently accessible oscilloscopes and generators.
 
@@ -22,27 +20,49 @@ class DeviceManager:
         The "device stopped" callback function is simply forwarded to the device constructors and can be used to
         react to a device being stopped.
 
+        Instead of monitoring USB, devices can also be added and removed by code (see add_device),
+        e.g. to run simulated devices (see uniswag.simulation.drivers) without any hardware.
+
         Args:
             list_event_callback (function):
                 The function to call when the device list has changed.
             device_stopped_callback (function):
                 The function that is invoked by a device when it stops.
+            drivers (uniswag.driver_registry.DriverRegistry or None):
+                The drivers of the supported vendors (the built-in and installed drivers by default).
+            monitor_usb (bool):
+                Whether devices are added and removed automatically when they are plugged in or out via USB.
 
         Returns:
             DeviceManager:
                 A DeviceManager object.
         """
-        # a list containing all currently connected oscilloscope and generator devices
-        self._device_list = []
+        # a registry containing all currently connected oscilloscope and generator devices
+        # (one list of "Device" objects per vendor, name and serial number)
+        self._registry = DeviceRegistry()
 
         # a callback function that is invoked every time an entry is
         # added to or removed from the list of currently connected devices
         self._list_event = list_event_callback
+        self._registry.add_listener(self._on_registry_change)
 
         # a callback function that is passed to oscilloscopes;
         # it is invoked by the devices when they are stopped (manually or autonomously)
         self._device_stopped = device_stopped_callback
 
+        # the drivers of the supported vendors, shared with the USB device daemon
+        # (their modules and vendor libraries are imported when the first device of a vendor is plugged in)
+        self._drivers = drivers if drivers is not None else DriverRegistry()
+
+        # a thread pool which loads the remaining capabilities of newly connected devices in the background
+        self._construction_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+        # threading locks which ensure that the objects of a vendor's devices are created one at a time
+        # (the vendor libraries are not designed to open devices concurrently), mapped to the vendors' names
+        self._construction_locks = {}
+        # a threading lock which ensures thread-safe access to the construction locks
+        self._mutex_construction_locks = threading.Lock()
+
         # add the MathOsc to the device list
         add_math_osc = threading.Thread(target=
                                         lambda: self._on_add_device({'Name': 'MathOsc', 'SerNo': '123'}, 'MS-SWAG'),
@@ -51,7 +71,9 @@ class DeviceManager:
 
         # the USB device daemon monitors all USB ports and signals when
         # oscilloscopes or generators are inserted/removed
-        self._usb_daemon = USBDeviceDaemon(self._on_add_device, self._on_remove_device)
+        self._usb_daemon = None
+        if monitor_usb:
+            self._usb_daemon = USBDeviceDaemon(self._on_add_device, self._on_remove_device, self._drivers)
 
     @property
     def device_list(self):
@@ -64,7 +86,60 @@ class DeviceManager:
             list[uniswag.devices.device.Device]:
                 An unsorted list containing the "Oscilloscope" and "Generator" objects.
         """
-        return self._device_list
+        return [dev for devices in self._registry.values() for dev in devices]
+
+    @property
+    def driver_import_times(self):
+        """
+        The time each deferred import of a driver module (including the vendor library) took so far.
+
+        Returns:
+            dict[str, float]:
+                A dictionary with the module names as keys and the import durations in seconds as values.
+        """
+        return self._drivers.import_times
+
+    def get_device(self, device_id):
+        """
+        Looks up a currently connected oscilloscope or generator by its ID.
+
+        Args:
+            device_id (dict[str, str]):
+                The ID of the device.
+
+        Returns:
+            uniswag.devices.device.Device or None:
+                The "Oscilloscope" or "Generator" object, or None if no such device is connected.
+        """
+        for dev in self._registry.get(device_id['Vendor'], device_id['Name'], device_id['SerNo'], ()):
+            if dev.id == device_id:
+                return dev
+
+        return None
+
+    def add_device(self, device_id, device_vendor):
+        """
+        Adds the "Oscilloscope" and/or "Generator" objects of a device that is not detected via USB.
+
+        Args:
+            device_id (dict[str, str]):
+                The device's name, serial number and type ('OSC' or 'GEN').
+            device_vendor (str):
+                The name of the device's vendor (as used by its driver).
+        """
+        self._on_add_device(device_id, device_vendor)
+
+    def remove_device(self, device_id, device_vendor):
+        """
+        Removes the "Oscilloscope" and/or "Generator" objects of a device that is not detected via USB.
+
+        Args:
+            device_id (dict[str, str]):
+                The device's name and serial number.
+            device_vendor (str):
+                The name of the device's vendor.
+        """
+        self._on_remove_device(device_id, device_vendor)
 
     def _on_add_device(self, device_id, device_vendor):
         """
@@ -78,29 +153,96 @@ class DeviceManager:
             device_vendor (str):
                 The name of the new device's vendor.
         """
+        # the same device cannot be added twice
+        if self._registry.get(device_vendor, device_id['Name'], device_id['SerNo']) is not None:
+            return
+
         # create new devices depending on the vendor
+        # (the classes are provided by the vendor's driver, which imports them on first use)
         added_devices = []
         if device_vendor == 'MS-SWAG':
             added_devices.append(MathOsc(device_id['Name'], device_id['SerNo'], self._device_stopped, self))
-        elif device_vendor == 'Tiepie':
-            added_devices.append(TiepieOsc(device_id['Name'], device_id['SerNo'], self._device_stopped))
-            added_devices.append(TiepieGen(device_id['Name'], device_id['SerNo']))
-        elif device_vendor == 'Keysight':
-            added_devices.append(KeysightOsc(device_id['Name'], device_id['SerNo'], self._device_stopped))
-        elif device_vendor == 'Tektronix':
-            if device_id['Type'] == 'GEN':
-                added_devices.append(TektronixGen(device_id['Name'], device_id['SerNo']))
-            else:
-                added_devices.append(TektronixOsc(device_id['Name'], device_id['SerNo'], self._device_stopped))
-        elif device_vendor == 'Hantek':
-            added_devices.append(HantekOsc(device_id['Name'], device_id['SerNo'], self._device_stopped))
+        elif self._drivers.get(device_vendor) is not None:
+            device_classes = self._drivers.device_classes(device_vendor, device_id.get('Type', 'OSC'))
+            added_devices = self._create_devices(device_classes, device_id, device_vendor)
 
         # add the new devices to the device list
-        for dev in added_devices:
-            self._device_list.append(dev)
+        # (which invokes the callback function to inform about the added devices)
+        if added_devices:
+
+            # the same device might have been added by another thread in the meantime
+            if not self._registry.add(device_vendor, device_id['Name'], device_id['SerNo'], added_devices):
+                for dev in added_devices:
+                    dev.init_deletion()
+                return
 
-        # invoke callback function to inform about the added devices
-        self._list_event('add', added_devices)
+            # the devices are already usable, their remaining capabilities are loaded afterwards
+            for dev in added_devices:
+                self._construction_pool.submit(self._load_capabilities, dev)
+
+    def _create_devices(self, device_classes, device_id, device_vendor):
+        """
+        Creates one object of each given "Oscilloscope" or "Generator" subclass for the same connected device.
+
+        The objects of a vendor's devices are created one after another, since each constructor opens the device
+        via the vendor library, which is not designed to be accessed concurrently.
+        If any of the objects cannot be created, the others are disconnected again.
+
+        Args:
+            device_classes (list[type]):
+                The "Oscilloscope" and/or "Generator" subclasses to instantiate.
+            device_id (dict[str, str]):
+                The device's name and serial number.
+            device_vendor (str):
+                The name of the device's vendor.
+
+        Returns:
+            list[uniswag.devices.device.Device]:
+                The created objects in the order of the given classes (empty if any of them could not be created).
+        """
+        self._mutex_construction_locks.acquire()
+        construction_lock = self._construction_locks.setdefault(device_vendor, threading.Lock())
+        self._mutex_construction_locks.release()
+
+        created_devices = []
+        failed = False
+
+        construction_lock.acquire()
+        for device_class in device_classes:
+            if issubclass(device_class, Oscilloscope):
+                args = (device_id['Name'], device_id['SerNo'], self._device_stopped)
+            else:
+                args = (device_id['Name'], device_id['SerNo'])
+
+            try:
+                created_devices.append(device_class(*args))
+            except Exception as e:
+                print('Could not connect to ' + device_id['Name'] + ' (' + device_id['SerNo'] + '): ' + str(e))
+                failed = True
+                break
+        construction_lock.release()
+
+        if failed:
+            for dev in created_devices:
+                dev.init_deletion()
+            return []
+
+        return created_devices
+
+    @staticmethod
+    def _load_capabilities(device):
+        """
+        Loads the remaining capabilities of a device that has already been added to the device list.
+
+        Args:
+            device (uniswag.devices.device.Device):
+                The "Oscilloscope" or "Generator" object.
+        """
+        try:
+            device.load_capabilities()
+        except Exception as e:
+            # the device might have been removed in the meantime
+            print(e)
 
     def _on_remove_device(self, device_id, device_vendor):
         """
@@ -116,19 +258,28 @@ class DeviceManager:
                 The vendor's name of the device to remove.
         """
         # find the oscilloscope and/or generator in the device list which is to be removed
-        removed_devices = []
-        for dev in self._device_list:
-            if dev.id['Name'] == device_id['Name'] \
-                    and dev.id['SerNo'] == device_id['SerNo'] \
-                    and dev.id['Vendor'] == device_vendor:
+        removed_devices = self._registry.get(device_vendor, device_id['Name'], device_id['SerNo'])
+        if removed_devices is None:
+            return
 
-                # disconnect device
-                dev.init_deletion()
-                removed_devices.append(dev)
+        # disconnect device(s)
+        for dev in removed_devices:
+            dev.init_deletion()
 
         # remove the device(s)
-        for dev in removed_devices:
-            self._device_list.remove(dev)
+        # (which invokes the callback function to inform about the removed devices)
+        self._registry.remove(device_vendor, device_id['Name'], device_id['SerNo'])
 
-        # invoke callback function to inform about the removed devices
-        self._list_event('remove', removed_devices)
+    def _on_registry_change(self, event, key, devices):
+        """
+        Invokes the callback function to inform about an update of the device list.
+
+        Args:
+            event (str):
+                The kind of update ('add' or 'remove').
+            key ((str, str, str)):
+                The vendor, name and serial number of the added or removed device(s).
+            devices (list[uniswag.devices.device.Device]):
+                The added or removed "Oscilloscope" and/or "Generator" objects.
+        """
+        self._list_event(event, devices)
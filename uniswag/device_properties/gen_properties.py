@@ -1,8 +1,11 @@
-import csv
 import os
+import re
 
 from PySide6 import QtCore
 
+from uniswag.devices.gen_sequence import GenSequence
+from uniswag.waveform_loader import load_waveform
+
 
 # noinspection PyCallingNonCallable
 class GenProperties(QtCore.QObject):
@@ -45,6 +48,8 @@ class GenProperties(QtCore.QObject):
     burstSampleCnt = QtCore.Signal('QVariantMap', int, int)
     burstSegCnt = QtCore.Signal('QVariantMap', int, int)
     burstDelay = QtCore.Signal('QVariantMap', int, float)
+    arbDataProgress = QtCore.Signal('QVariantMap', int, float)
+    sequenceStep = QtCore.Signal('QVariantMap', int, int)
 
     def __init__(self, front_to_back_connector):
         """
@@ -69,6 +74,9 @@ class GenProperties(QtCore.QObject):
         # provides information about the currently selected signal generator (and signal generator channel)
         self.front_to_back_connector = front_to_back_connector
 
+        # a regular expression used to split an input string that is formatted as a list into an actual Python list
+        self._re_list_filter = '[][\'\", ]'
+
     # GENERATOR FUNCTIONS ##############################################################################################
 
     @QtCore.Slot()
@@ -191,49 +199,15 @@ class GenProperties(QtCore.QObject):
         else:
             file = raw_path[1]
 
-        # open the file pointed to by the os-path if it exists and is of type CSV
-        if os.path.exists(file) and file[-4:] == '.csv':
-            opened_file = open(file, 'r')
-            csv_r = csv.reader(opened_file)
-
-            # initially assume the data to be stored in a single row (rather than column)
-            row_major = True
-
-            # convert the CVS file contents into a Python list
-            input_data = []
-            for row in csv_r:
-                if row_major:
-
-                    # check if the data is actually stored in a single row
-                    if len(row) > 1:
-
-                        for entry in row:
-                            try:
-                                data = float(entry)
-                            except ValueError:
-                                data = 0.0
-                            input_data.append(data)
-
-                        # stop after one row
-                        break
+        # load the samples from the file pointed to by the os-path if it exists and is of a supported type
+        input_data = load_waveform(file)
+        if input_data is not None:
 
-                    else:
-                        row_major = False
+            # report the upload progress (from 0 to 1) to frontend
+            def progress_callback(progress):
+                self.arbDataProgress.emit(device.id, channel.id['No'], progress)
 
-                # only if the data is stored in a column:
-                try:
-                    data = float(row[0])
-                except (ValueError, IndexError):
-                    data = 0.0
-                input_data.append(data)
-
-            opened_file.close()
-
-            # remove CSV header if the data was read as column
-            if not row_major:
-                input_data.pop(0)
-
-            graph_update = channel.arb_data(input_data)
+            graph_update = channel.arb_data(input_data, progress_callback)
 
         # update signal preview graph if a new value was assigned to property
         if graph_update:
@@ -394,6 +368,61 @@ class GenProperties(QtCore.QObject):
         if graph_update:
             self.front_to_back_connector.update_signal_preview(device.id, channel)
 
+    @QtCore.Slot(str)
+    def _freq_sweep(self, value):
+        self.front_to_back_connector.access_gen_ch_property(self._freq_sweep_thread, value)
+
+    def _freq_sweep_thread(self, device, channel, value):
+        if value is not None:
+
+            # split input by using the regular expression list filter
+            val_list = re.split(self._re_list_filter, value)
+
+            # remove empty list elements
+            val_list = list(filter(None, val_list))
+
+            valid = False
+
+            # check whether the list contains exactly four elements (start & stop frequency, step count & dwell time)
+            if len(val_list) == 4:
+                valid = True
+
+                # try to convert each list element into Float, abort if not possible
+                for i in range(len(val_list)):
+                    try:
+                        val_list[i] = float(val_list[i])
+                    except ValueError:
+                        valid = False
+                        break
+
+            # the frequencies are spaced logarithmically, so they need to be positive
+            if valid and min(val_list[0], val_list[1]) <= 0:
+                valid = False
+
+            if valid:
+                start, stop, step_cnt, dwell = val_list
+                steps = GenSequence.sweep('freq', start, stop, step_cnt, dwell, log=True)
+
+                # report every applied step to frontend (without querying the device, which would delay the sweep)
+                # and update the signal preview graph once the last step has been applied
+                def step_callback(index, step):
+                    self.sequenceStep.emit(device.id, channel.id['No'], index)
+                    self.freq.emit(device.id, channel.id['No'], step['freq'])
+                    if index == len(steps) - 1:
+                        self.front_to_back_connector.update_signal_preview(device.id, channel)
+
+                channel.start_sequence(steps, step_callback=step_callback)
+
+    @QtCore.Slot()
+    def _stop_sequence(self):
+        self.front_to_back_connector.access_gen_ch_property(self._stop_sequence_thread)
+
+    def _stop_sequence_thread(self, device, channel):
+        channel.stop_sequence()
+
+        # the sweep may have been stopped before updating the signal preview graph
+        self.front_to_back_connector.update_signal_preview(device.id, channel)
+
     @QtCore.Slot()
     def _freq_modes_avail(self):
         self.front_to_back_connector.access_gen_ch_property(self._freq_modes_avail_thread)
@@ -36,6 +36,16 @@ class OscProperties(QtCore.QObject):
     trigSourcesAvail = QtCore.Signal('QVariantMap', list)
     trigSource = QtCore.Signal('QVariantMap', str)
     timeBase = QtCore.Signal('QVariantMap', float)
+    softTrigKindsAvail = QtCore.Signal('QVariantMap', list)
+    softTrigKind = QtCore.Signal('QVariantMap', str)
+    softTrigSrcsAvail = QtCore.Signal('QVariantMap', list)
+    softTrigSrc = QtCore.Signal('QVariantMap', str)
+    softTrigLvl = QtCore.Signal('QVariantMap', float)
+    softTrigLvlHigh = QtCore.Signal('QVariantMap', float)
+    softTrigHyst = QtCore.Signal('QVariantMap', float)
+    softTrigWidth = QtCore.Signal('QVariantMap', list)
+    softTrigSegLen = QtCore.Signal('QVariantMap', int)
+    softTrigPreRatio = QtCore.Signal('QVariantMap', float)
 
     # signals that indicate a channel property access has been completed,
     # contain device id, channel number and current/new property value
@@ -473,6 +483,164 @@ class OscProperties(QtCore.QObject):
         result = device.time_base
         self.timeBase.emit(device.id, result)
 
+    @QtCore.Slot()
+    def _soft_trig_kinds_avail(self):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_kinds_avail_thread)
+
+    def _soft_trig_kinds_avail_thread(self, device):
+        result = device.soft_trig_kinds_avail
+        self.softTrigKindsAvail.emit(device.id, result)
+        self._soft_trig_kind_thread(device, None)
+
+    @QtCore.Slot(str)
+    def _soft_trig_kind(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_kind_thread, value)
+
+    def _soft_trig_kind_thread(self, device, value):
+        if value is not None:
+            device.soft_trig_kind = value
+        result = device.soft_trig_kind
+        self.softTrigKind.emit(device.id, result)
+
+    @QtCore.Slot()
+    def _soft_trig_srcs_avail(self):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_srcs_avail_thread)
+
+    def _soft_trig_srcs_avail_thread(self, device):
+        result = [str(ch_no) for ch_no in device.soft_trig_srcs_avail]
+        self.softTrigSrcsAvail.emit(device.id, result)
+        self._soft_trig_src_thread(device, None)
+
+    @QtCore.Slot(str)
+    def _soft_trig_src(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_src_thread, value)
+
+    def _soft_trig_src_thread(self, device, value):
+        # filter out empty or non-Int-like input
+        try:
+            value = int(float(value))
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_src = value
+        result = str(device.soft_trig_src)
+        self.softTrigSrc.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_lvl(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_lvl_thread, value)
+
+    def _soft_trig_lvl_thread(self, device, value):
+        # filter out empty or non-Float-like input
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_lvl = value
+        result = device.soft_trig_lvl
+        self.softTrigLvl.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_lvl_high(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_lvl_high_thread, value)
+
+    def _soft_trig_lvl_high_thread(self, device, value):
+        # filter out empty or non-Float-like input
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_lvl_high = value
+        result = device.soft_trig_lvl_high
+        self.softTrigLvlHigh.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_hyst(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_hyst_thread, value)
+
+    def _soft_trig_hyst_thread(self, device, value):
+        # filter out empty or non-Float-like input
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_hyst = value
+        result = device.soft_trig_hyst
+        self.softTrigHyst.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_width(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_width_thread, value)
+
+    def _soft_trig_width_thread(self, device, value):
+        if value is not None:
+
+            # split input by using the regular expression list filter
+            val_list = re.split(self._re_list_filter, value)
+
+            # remove empty list elements
+            val_list = list(filter(None, val_list))
+
+            valid = False
+
+            # check whether the list contains exactly two elements (minimum & maximum width)
+            if len(val_list) == 2:
+                valid = True
+
+                # try to convert each list element into Float, abort if not possible
+                for i in range(len(val_list)):
+                    try:
+                        val_list[i] = float(val_list[i])
+                    except ValueError:
+                        valid = False
+                        break
+
+            # set the oscilloscope's pulse width limits (if both list elements are valid Float values)
+            if valid:
+                device.soft_trig_width = val_list
+
+        result = device.soft_trig_width
+        self.softTrigWidth.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_seg_len(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_seg_len_thread, value)
+
+    def _soft_trig_seg_len_thread(self, device, value):
+        # filter out empty or non-Int-like input
+        try:
+            value = int(float(value))
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_seg_len = value
+        result = device.soft_trig_seg_len
+        self.softTrigSegLen.emit(device.id, result)
+
+    @QtCore.Slot(str)
+    def _soft_trig_pre_ratio(self, value):
+        self.front_to_back_connector.access_osc_property(self._soft_trig_pre_ratio_thread, value)
+
+    def _soft_trig_pre_ratio_thread(self, device, value):
+        # filter out empty or non-Float-like input
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            value = None
+
+        if value is not None:
+            device.soft_trig_pre_ratio = value
+        result = device.soft_trig_pre_ratio
+        self.softTrigPreRatio.emit(device.id, result)
+
     # OSCILLOSCOPE CHANNEL FUNCTIONS ###################################################################################
 
     @QtCore.Slot()
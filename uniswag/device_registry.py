@@ -0,0 +1,273 @@
+import threading
+
+
+class DeviceRegistry:
+    def __init__(self):
+        """
+        A thread-safe registry of devices, indexed by their identity and (optionally) by their USB path.
+
+        Every entry is identified by the device's vendor, name and serial number and can hold an arbitrary value
+        (e.g. the device objects or the device's shortened ID).
+        Looking up an entry by its identity or USB path as well as listing all entries of a vendor
+        does not require searching through all entries.
+        Listeners are notified about every added or removed entry.
+
+        Returns:
+            DeviceRegistry:
+                A DeviceRegistry object.
+        """
+        # the values of all entries, mapped to a tuple of the vendor, name and serial number
+        self._entries = {}
+
+        # the identities of all entries with a known USB path, mapped to the path
+        self._paths = {}
+        # the USB paths of all entries which have one, mapped to the identities
+        self._paths_by_key = {}
+
+        # the identities of all entries (as keys of an insertion-ordered dictionary), mapped to the vendor
+        self._vendors = {}
+
+        # the functions that are invoked whenever an entry is added or removed
+        self._listeners = []
+
+        # a threading lock which ensures thread-safe access to the entries and indices
+        self._mutex_registry = threading.Lock()
+
+    def __len__(self):
+        self._mutex_registry.acquire()
+        result = len(self._entries)
+        self._mutex_registry.release()
+
+        return result
+
+    def add_listener(self, callback):
+        """
+        Registers a function that is invoked whenever an entry is added or removed.
+
+        The function receives the event ('add' or 'remove'), the entry's identity (a tuple of vendor,
+        name and serial number) and its value as parameters.
+        It is invoked by the thread that changed the registry, after the change has been made.
+
+        Args:
+            callback (function):
+                The function to invoke.
+        """
+        self._mutex_registry.acquire()
+        self._listeners.append(callback)
+        self._mutex_registry.release()
+
+    def add(self, vendor, name, ser_no, value, path=None):
+        """
+        Adds an entry, unless an entry with the same identity or USB path already exists.
+
+        Args:
+            vendor (str):
+                The name of the device's vendor.
+            name (str):
+                The moniker of the device.
+            ser_no (str):
+                The serial number of the device.
+            value (Any):
+                The value to store (must not be None).
+            path (str or None):
+                The USB path of the device (None if unknown).
+
+        Returns:
+            bool:
+                True if the entry was added, False if it already existed.
+        """
+        key = (vendor, name, ser_no)
+
+        self._mutex_registry.acquire()
+
+        added = key not in self._entries and (path is None or path not in self._paths)
+        if added:
+            self._entries[key] = value
+            self._vendors.setdefault(vendor, {})[key] = None
+            if path is not None:
+                self._paths[path] = key
+                self._paths_by_key[key] = path
+            listeners = list(self._listeners)
+
+        self._mutex_registry.release()
+
+        if added:
+            for callback in listeners:
+                callback('add', key, value)
+
+        return added
+
+    def remove(self, vendor, name, ser_no):
+        """
+        Removes the entry with the given identity.
+
+        Args:
+            vendor (str):
+                The name of the device's vendor.
+            name (str):
+                The moniker of the device.
+            ser_no (str):
+                The serial number of the device.
+
+        Returns:
+            Any:
+                The value of the removed entry, or None if no such entry exists.
+        """
+        key = (vendor, name, ser_no)
+
+        self._mutex_registry.acquire()
+        value = self._remove_entry(key)
+        listeners = list(self._listeners)
+        self._mutex_registry.release()
+
+        if value is not None:
+            for callback in listeners:
+                callback('remove', key, value)
+
+        return value
+
+    def remove_by_path(self, path):
+        """
+        Removes the entry with the given USB path.
+
+        Args:
+            path (str):
+                The USB path of the device.
+
+        Returns:
+            ((str, str, str), Any) or None:
+                A tuple of the removed entry's identity and value, or None if no such entry exists.
+        """
+        self._mutex_registry.acquire()
+        key = self._paths.get(path)
+        value = self._remove_entry(key) if key is not None else None
+        listeners = list(self._listeners)
+        self._mutex_registry.release()
+
+        if value is None:
+            return None
+
+        for callback in listeners:
+            callback('remove', key, value)
+
+        return key, value
+
+    def _remove_entry(self, key):
+        """
+        Removes an entry and its index entries (the registry's lock needs to be acquired beforehand).
+
+        Args:
+            key ((str, str, str)):
+                The identity of the entry.
+
+        Returns:
+            Any:
+                The value of the removed entry, or None if no such entry exists.
+        """
+        value = self._entries.pop(key, None)
+        if value is None:
+            return None
+
+        vendor_entries = self._vendors[key[0]]
+        del vendor_entries[key]
+        if not vendor_entries:
+            del self._vendors[key[0]]
+
+        path = self._paths_by_key.pop(key, None)
+        if path is not None:
+            del self._paths[path]
+
+        return value
+
+    def get(self, vendor, name, ser_no, default=None):
+        """
+        The value of the entry with the given identity.
+
+        Args:
+            vendor (str):
+                The name of the device's vendor.
+            name (str):
+                The moniker of the device.
+            ser_no (str):
+                The serial number of the device.
+            default (Any):
+                The value to return if no such entry exists.
+
+        Returns:
+            Any:
+                The entry's value.
+        """
+        self._mutex_registry.acquire()
+        result = self._entries.get((vendor, name, ser_no), default)
+        self._mutex_registry.release()
+
+        return result
+
+    def get_by_path(self, path):
+        """
+        The entry with the given USB path.
+
+        Args:
+            path (str):
+                The USB path of the device.
+
+        Returns:
+            ((str, str, str), Any) or None:
+                A tuple of the entry's identity and value, or None if no such entry exists.
+        """
+        self._mutex_registry.acquire()
+        key = self._paths.get(path)
+        result = (key, self._entries[key]) if key is not None else None
+        self._mutex_registry.release()
+
+        return result
+
+    def has_path(self, path):
+        """
+        Indicates, whether an entry with the given USB path exists.
+
+        Args:
+            path (str):
+                The USB path of the device.
+
+        Returns:
+            bool:
+                True if such an entry exists, False otherwise.
+        """
+        self._mutex_registry.acquire()
+        result = path in self._paths
+        self._mutex_registry.release()
+
+        return result
+
+    def by_vendor(self, vendor):
+        """
+        The values of all entries of the given vendor.
+
+        Args:
+            vendor (str):
+                The name of the vendor.
+
+        Returns:
+            list[Any]:
+                The values in the order in which the entries were added.
+        """
+        self._mutex_registry.acquire()
+        result = [self._entries[key] for key in self._vendors.get(vendor, ())]
+        self._mutex_registry.release()
+
+        return result
+
+    def values(self):
+        """
+        The values of all entries.
+
+        Returns:
+            list[Any]:
+                The values in the order in which the entries were added.
+        """
+        self._mutex_registry.acquire()
+        result = list(self._entries.values())
+        self._mutex_registry.release()
+
+        return result
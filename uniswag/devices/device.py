@@ -73,6 +73,16 @@ class Device:
         """
         return self._ch
 
+    def load_capabilities(self):
+        """
+        Reads the capabilities of the device that are not needed right after its creation.
+
+        The device manager invokes this method in the background once the device has been added to the device list,
+        so that the device is usable as early as possible. Capabilities that are requested before they are loaded
+        are read upon that request instead.
+        """
+        pass
+
     # ABSTRACT METHODS #################################################################################################
 
     def init_deletion(self):
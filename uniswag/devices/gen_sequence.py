@@ -0,0 +1,254 @@
+import threading
+import time
+
+import numpy as np
+
+
+class GenSequence:
+    # the order in which the settings of a step are applied
+    # (settings that influence the availability or meaning of others come first)
+    setting_order = ['sig_type', 'mode', 'freq_mode', 'arb_data', 'amp', 'offset', 'freq', 'period', 'phase',
+                     'symmetry', 'duty_cycle', 'pulse_width']
+
+    def __init__(self, channel, steps, repetitions=1, step_callback=None):
+        """
+        Applies a sequence of settings to a generator channel, one step after another.
+
+        Each step is a dictionary which maps the names of the channel's settings (e.g. 'freq' or 'amp')
+        to their values, the key 'arb_data' to a vector of arbitrary signal samples and
+        the key 'dwell' to the time in seconds for which the step's settings are kept (0 by default).
+        Before the sequence is started, every step is precomputed:
+        only the settings that differ from the previous step are applied, in a fixed order,
+        and all arbitrary data is fitted into the generator's waveform buffer ahead of time
+        (the fitted buffers are kept in the precomputed steps),
+        so that applying a step only requires the actual device writes.
+        The steps are scheduled relative to the start of the sequence, so that delays do not accumulate.
+
+        Args:
+            channel (uniswag.devices.generator.GenChannel):
+                The generator channel to apply the settings to.
+            steps (list[dict[str, Any]]):
+                The steps of the sequence.
+            repetitions (int):
+                How often the sequence is run (0 means indefinitely until it is stopped).
+            step_callback (function):
+                A function which is invoked after each step with the step's index and dictionary as arguments.
+
+        Raises:
+            ValueError:
+                If a step contains a setting that the channel does not provide.
+
+        Returns:
+            GenSequence:
+                A GenSequence object.
+        """
+        self._channel = channel
+        self._steps = list(steps)
+        self._repetitions = repetitions
+        self._step_callback = step_callback
+
+        # the precomputed steps, each one being a tuple of the dwell time and a list of (setting, value) tuples
+        # (with the arbitrary data already fitted into the waveform buffer),
+        # as well as the settings to apply when the sequence restarts with its first step
+        self._plan, self._restart_changes = self._prepare()
+
+        # the index of the most recently applied step
+        self._step_index = -1
+
+        # the thread running the sequence and the event that stops it
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def sweep(setting, start, stop, step_cnt, dwell, log=False, **fixed):
+        """
+        Creates the steps of a sweep of a single setting.
+
+        Args:
+            setting (str):
+                The name of the setting to sweep (e.g. 'freq' or 'amp').
+            start (float):
+                The value of the first step.
+            stop (float):
+                The value of the last step.
+            step_cnt (int):
+                The number of steps (at least 2).
+            dwell (float):
+                The time in seconds for which each step's value is kept.
+            log (bool):
+                Whether the values are spaced logarithmically rather than linearly.
+            **fixed:
+                Additional settings which are applied with the first step.
+
+        Returns:
+            list[dict[str, Any]]:
+                The steps of the sweep.
+        """
+        step_cnt = max(int(step_cnt), 2)
+        if log:
+            values = np.geomspace(start, stop, step_cnt)
+        else:
+            values = np.linspace(start, stop, step_cnt)
+
+        steps = [{setting: float(value), 'dwell': dwell} for value in values]
+        steps[0].update(fixed)
+
+        return steps
+
+    @property
+    def is_running(self):
+        """
+        Indicates, whether the sequence is currently being run.
+
+        Returns:
+            bool:
+                True if the sequence is running, False otherwise.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def step_index(self):
+        """
+        The index of the most recently applied step.
+
+        Returns:
+            int:
+                The step index (-1 if no step has been applied yet).
+        """
+        return self._step_index
+
+    def start(self):
+        """
+        Starts running the sequence in a separate thread.
+
+        Has no effect if the sequence is already running.
+        """
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops running the sequence after the current step.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _prepare(self):
+        """
+        Precomputes the settings that each step needs to apply.
+
+        Returns:
+            (list[(float, list[(str, Any)])], list[(str, Any)]):
+                A tuple of the plan and the restart changes.
+                The plan is a list containing a tuple per step, consisting of its dwell time and
+                the settings (name and value) that differ from the previous step, in the order of application.
+                Arbitrary data is contained as the fitted waveform buffer.
+                The restart changes are the settings that differ between the end and the first step of the sequence.
+        """
+        order = {name: i for i, name in enumerate(self.setting_order)}
+
+        plan = []
+        current = {}
+        first = {}
+        channel_type = type(self._channel)
+        for step in self._steps:
+            changes = []
+            for name, value in step.items():
+                if name == 'dwell':
+                    continue
+
+                # only settings that are provided by the channel can be applied
+                if name == 'arb_data':
+                    if not hasattr(self._channel, 'arb_data'):
+                        raise ValueError('The channel does not support arbitrary data.')
+                    value = self._fit_arb_data(value)
+                else:
+                    prop = getattr(channel_type, name, None)
+                    if not isinstance(prop, property) or prop.fset is None:
+                        raise ValueError('The channel does not provide the setting "' + name + '".')
+
+                if name not in current or not self._equals(current[name], value):
+                    changes.append((name, value))
+                    current[name] = value
+
+            changes.sort(key=lambda change: order.get(change[0], len(order)))
+            plan.append((max(float(step.get('dwell', 0)), 0.0), changes))
+
+            if len(plan) == 1:
+                first = dict(current)
+
+        restart_changes = [(name, value) for name, value in first.items() if not self._equals(current[name], value)]
+        restart_changes.sort(key=lambda change: order.get(change[0], len(order)))
+
+        return plan, restart_changes
+
+    def _fit_arb_data(self, value):
+        """
+        Fits arbitrary data into the channel's waveform buffer ahead of use.
+
+        The fitted buffer is uploaded as is later on, so only the transfer to the device remains.
+
+        Args:
+            value (Any):
+                The vector of the arbitrary signal samples.
+
+        Returns:
+            np.ndarray:
+                The fitted waveform buffer (as returned by the channel's _fit_arb_data method).
+        """
+        # the same arguments the channel uses upon uploading unfitted data
+        return self._channel._fit_arb_data(value, *self._channel.arb_data_limits)
+
+    @staticmethod
+    def _equals(a, b):
+        """
+        Compares two setting values, including vectors of arbitrary signal samples.
+
+        Args:
+            a (Any):
+                The first value.
+            b (Any):
+                The second value.
+
+        Returns:
+            bool:
+                True if both values are equal, False otherwise.
+        """
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            return np.array_equal(a, b)
+        return a == b
+
+    def _run(self):
+        """
+        Applies the precomputed steps at their scheduled times until the sequence is finished or stopped.
+        """
+        repetition = 0
+        while not self._stop_event.is_set() and (self._repetitions == 0 or repetition < self._repetitions):
+            deadline = time.perf_counter()
+            for i, (dwell, changes) in enumerate(self._plan):
+
+                # every repetition restores the settings of the first step
+                if i == 0 and repetition > 0:
+                    changes = self._restart_changes
+
+                for name, value in changes:
+                    if name == 'arb_data':
+                        self._channel.arb_data(value, is_fitted=True)
+                    else:
+                        setattr(self._channel, name, value)
+
+                self._step_index = i
+                if self._step_callback is not None:
+                    self._step_callback(i, self._steps[i])
+
+                # wait until the next step is due
+                deadline += dwell
+                if self._stop_event.wait(max(deadline - time.perf_counter(), 0)):
+                    return
+
+            repetition += 1
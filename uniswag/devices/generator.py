@@ -1,9 +1,12 @@
+import hashlib
+import math
 import threading
 
 import numpy as np
 import scipy.signal
 
 from uniswag.devices.device import Device, Channel
+from uniswag.devices.gen_sequence import GenSequence
 
 
 class Generator(Device):
@@ -84,66 +87,301 @@ class GenChannel(Channel):
         self._phase = 1
         self._symmetry = 1
         self._duty_cycle = 1
-        self._arbitrary_data = [[0], [0]]
+        self._arbitrary_data = [np.array([0.0]), np.array([0.0])]
+
+        # the cached device settings that influence the signal preview graph,
+        # read at once and afterwards updated by the setters that change them
+        self._state = {}
+
+        # the memoized signal preview, a tuple of the variables it is based on and the resulting time & voltage vector
+        self._preview = None
+
+        # the cached waveform shapes of the signal preview,
+        # mapped to a tuple of the signal type, phase, symmetry and duty cycle
+        self._preview_templates = {}
+        self._preview_templates_size = 16
 
         # prevents the variables that influence the shape of the signal preview graph
         # from being accessed by multiple threads concurrently
         self._mutex_preview_variables = threading.Lock()
 
+        # the results of fitting arbitrary data into the waveform buffer,
+        # mapped to a tuple of the input data's hash & length, the target length and the DAC resolution
+        self._arb_data_cache = {}
+        self._arb_data_cache_size = 4
+
+        # the maximum up-/downsampling factor for which polyphase filtering is used (rather than FFT resampling)
+        self._resample_poly_factor_max = 64
+
+        # a threading lock which ensures thread-safe access to the cached arbitrary data
+        self._mutex_arb_data_cache = threading.Lock()
+
+        # the currently (or most recently) run sweep or sequence of settings
+        self._sequence = None
+
+    @property
+    def is_sequence_running(self):
+        """
+        Indicates, whether a sweep or sequence of settings is currently being applied to the channel.
+
+        Returns:
+            bool:
+                True if a sequence is running, False otherwise.
+        """
+        return self._sequence is not None and self._sequence.is_running
+
+    def start_sequence(self, steps, repetitions=1, step_callback=None):
+        """
+        Applies a sequence of settings to the channel in the background, replacing any running sequence.
+
+        All steps are precomputed before the first one is applied (see GenSequence).
+
+        Args:
+            steps (list[dict[str, Any]]):
+                The steps of the sequence, e.g. as created by GenSequence.sweep.
+            repetitions (int):
+                How often the sequence is run (0 means indefinitely until it is stopped).
+            step_callback (function):
+                A function which is invoked after each step with the step's index and dictionary as arguments.
+
+        Raises:
+            ValueError:
+                If a step contains a setting that the channel does not provide.
+        """
+        self.stop_sequence()
+        self._sequence = GenSequence(self, steps, repetitions, step_callback)
+        self._sequence.start()
+
+    def stop_sequence(self):
+        """
+        Stops the currently running sweep or sequence of settings (if any).
+        """
+        if self._sequence is not None:
+            self._sequence.stop()
+
     def get_signal_preview(self):
         """
         The data that depicts the waveform of the channel's currently generated signal.
 
         It is split into the resulting X and Y vector.
+        The result is memoized as long as the variables that influence the signal preview graph remain unchanged.
+        Furthermore, the waveform shapes (with an amplitude of 1 and a period of 1) are cached,
+        so that changing the amplitude, offset or period only requires scaling them.
 
         Returns:
             (np.ndarray, np.ndarray):
                 A tuple containing the vector of the time values and the voltage values, respectively.
+                Both vectors are read-only.
         """
         self._mutex_preview_variables.acquire()
 
+        if self._signal_type == 'arbitrary':
+            time_vector = np.asarray(self._arbitrary_data[0], dtype=float)
+            voltage_vector = np.asarray(self._arbitrary_data[1], dtype=float)
+
+        elif self._signal_type in ('sine', 'square', 'ramp', 'pulse'):
+            key = (self._signal_type, self._amplitude, self._offset, self._period,
+                   self._phase, self._symmetry, self._duty_cycle)
+            if self._preview is None or self._preview[0] != key:
+                unit_time, shape = self._get_preview_template()
+                time_vector = unit_time * self._period
+                voltage_vector = shape * self._amplitude + self._offset
+                time_vector.flags.writeable = False
+                voltage_vector.flags.writeable = False
+                self._preview = (key, time_vector, voltage_vector)
+            time_vector, voltage_vector = self._preview[1:]
+
+        else:
+            time_vector = np.array([0.0])
+            voltage_vector = np.array([0.0])
+
+        self._mutex_preview_variables.release()
+
+        return time_vector, voltage_vector
+
+    def _get_preview_template(self):
+        """
+        The shape of the channel's currently generated (non-arbitrary) signal with an amplitude of 1 and a period of 1.
+
+        The shapes are cached by the variables that influence them (signal type, phase, symmetry and duty cycle).
+        The lock for the variables that influence the signal preview graph needs to be held while calling this method.
+
+        Returns:
+            (np.ndarray, np.ndarray):
+                A tuple containing the vector of the normalized time values and the voltage values, respectively.
+        """
+        key = (self._signal_type, self._phase, self._symmetry, self._duty_cycle)
+        template = self._preview_templates.get(key)
+        if template is not None:
+            return template
+
         if self._signal_type == 'sine':
-            time_vector = np.linspace(0, self._period, self._preview_samples)
-            voltage_vector = self._amplitude * np.sin(
-                (2 * np.pi / self._period) * (time_vector + (self._phase / 360) * self._period)) + self._offset
+            unit_time = np.linspace(0, 1, self._preview_samples)
+            shape = np.sin(2 * np.pi * (unit_time + self._phase / 360))
 
         elif self._signal_type == 'square':
-            time_vector = np.linspace(0, self._period, self._preview_samples, endpoint=False)
-            voltage_vector = self._amplitude * scipy.signal.square(
-                (2 * np.pi / self._period) * (time_vector + (self._phase / 360) * self._period)) + self._offset
+            unit_time = np.linspace(0, 1, self._preview_samples, endpoint=False)
+            shape = scipy.signal.square(2 * np.pi * (unit_time + self._phase / 360))
 
         elif self._signal_type == 'ramp':
             start_phase = 180 * self._symmetry + self._phase
-            time_vector = np.linspace(0, self._period, self._preview_samples, endpoint=False)
-            voltage_vector = self._amplitude * scipy.signal.sawtooth(
-                2 * np.pi / self._period * (time_vector + (start_phase / 360) * self._period),
-                width=self._symmetry) + self._offset
+            unit_time = np.linspace(0, 1, self._preview_samples, endpoint=False)
+            shape = scipy.signal.sawtooth(2 * np.pi * (unit_time + start_phase / 360), width=self._symmetry)
+
+        else:
+            unit_time = np.linspace(0, 1, self._preview_samples, endpoint=False)
+            shape = scipy.signal.square(2 * np.pi * (unit_time + self._phase / 360), duty=self._duty_cycle)
+
+        # keep only the most recent templates
+        self._preview_templates[key] = (unit_time, shape)
+        while len(self._preview_templates) > self._preview_templates_size:
+            self._preview_templates.pop(next(iter(self._preview_templates)))
 
-        elif self._signal_type == 'pulse':
-            time_vector = np.linspace(0, self._period, self._preview_samples, endpoint=False)
-            voltage_vector = self._amplitude * scipy.signal.square(
-                (2 * np.pi / self._period) * (time_vector + (self._phase / 360) * self._period),
-                duty=self._duty_cycle) + self._offset
+        return unit_time, shape
 
-        elif self._signal_type == 'arbitrary':
-            time_vector = np.array(self._arbitrary_data[0])
-            voltage_vector = np.array(self._arbitrary_data[1])
+    def _calc_arb_preview(self, samples, sample_period, scale, shift):
+        """
+        Calculates the signal preview graph of an arbitrary waveform.
+
+        The samples are transformed linearly (voltage = sample * scale + shift).
+        Waveforms with more samples than the preview graph can reasonably display are decimated
+        by keeping the minimum and maximum sample of each section, so that no peaks get lost.
+
+        Args:
+            samples (np.ndarray):
+                The vector of the arbitrary signal samples (as stored in the generator's waveform buffer).
+            sample_period (float):
+                The time in seconds between two consecutive samples.
+            scale (float):
+                The factor by which each sample is multiplied.
+            shift (float):
+                The value which is added to each (multiplied) sample.
 
+        Returns:
+            (np.ndarray, np.ndarray):
+                A tuple containing the vector of the time values and the voltage values, respectively.
+        """
+        samples = np.asarray(samples, dtype=float)
+        if not len(samples):
+            return np.array([0.0]), np.array([0.0])
+
+        section_cnt = self._preview_samples
+        if len(samples) > 2 * section_cnt:
+            section_len = len(samples) // section_cnt
+            sections = samples[:section_cnt * section_len].reshape(section_cnt, section_len)
+            offsets = np.arange(section_cnt) * section_len
+
+            # order the minimum & maximum of each section by their position
+            arg_min = sections.argmin(axis=1)
+            arg_max = sections.argmax(axis=1)
+            indices = np.column_stack((np.minimum(arg_min, arg_max), np.maximum(arg_min, arg_max)))
+            indices = (indices + offsets[:, np.newaxis]).ravel()
         else:
-            time_vector = np.array([0.0])
-            voltage_vector = np.array([0.0])
+            indices = np.arange(len(samples))
 
-        self._mutex_preview_variables.release()
+        time_vector = indices * sample_period
+        voltage_vector = samples[indices] * scale + shift
 
         return time_vector, voltage_vector
 
+    def _fit_arb_data(self, value, length_min, length_max, resolution=None):
+        """
+        Fits arbitrary data into the generator's waveform buffer.
+
+        Data exceeding the maximum length (or falling below the minimum length) is resampled
+        rather than truncated, so that the complete waveform is generated.
+        Small resampling ratios are handled by a polyphase filter, all others via FFT
+        (assuming the waveform to be periodic).
+        Optionally, the data is quantized to the generator's DAC resolution afterwards.
+        The results are cached, so that fitting the same data again takes no time.
+        Data that has been fitted already (e.g. by a GenSequence) can be passed to the channel's arb_data method
+        with "is_fitted" set to True, so that it is uploaded as is.
+
+        Args:
+            value (Any):
+                The vector of the arbitrary signal samples.
+            length_min (int):
+                The minimum number of samples that the generator's waveform buffer needs to hold.
+            length_max (int):
+                The maximum number of samples that the generator's waveform buffer can hold.
+            resolution (int):
+                The DAC resolution in bits. If omitted, the data is not quantized.
+
+        Returns:
+            np.ndarray:
+                The vector of the arbitrary signal samples with the fitting number of samples,
+                or the vector of the DAC codes (ranging from 0 to 2 ** resolution - 1) if a resolution is passed.
+                The vector is read-only.
+        """
+        value = np.ascontiguousarray(value, dtype=float)
+        target_length = min(max(len(value), length_min), length_max)
+
+        key = (hashlib.blake2b(value.tobytes(), digest_size=16).digest(), len(value), target_length, resolution)
+
+        self._mutex_arb_data_cache.acquire()
+        result = self._arb_data_cache.get(key)
+        self._mutex_arb_data_cache.release()
+
+        if result is None:
+            result = value
+            if len(value) != target_length:
+                gcd = math.gcd(len(value), target_length)
+                up, down = target_length // gcd, len(value) // gcd
+                if max(up, down) <= self._resample_poly_factor_max:
+                    result = scipy.signal.resample_poly(value, up, down, padtype='line')
+                else:
+                    result = scipy.signal.resample(value, target_length)
+
+            if resolution is not None:
+                min_voltage = result.min()
+                voltage_range = result.max() - min_voltage
+                code_max = 2 ** resolution - 1
+                if voltage_range > 0:
+                    result = np.rint((result - min_voltage) * (code_max / voltage_range)).astype(np.int32)
+                else:
+                    result = np.zeros(len(result), dtype=np.int32)
+            elif result is value:
+                result = value.copy()
+
+            result.flags.writeable = False
+
+            # keep only the most recent results
+            self._mutex_arb_data_cache.acquire()
+            self._arb_data_cache[key] = result
+            while len(self._arb_data_cache) > self._arb_data_cache_size:
+                self._arb_data_cache.pop(next(iter(self._arb_data_cache)))
+            self._mutex_arb_data_cache.release()
+
+        return result
+
     # ABSTRACT METHODS #################################################################################################
 
+    @property
+    def arb_data_limits(self):
+        """
+        The properties of the channel's waveform buffer that arbitrary data is fitted into.
+
+        Returns:
+            (int, int, int or None):
+                A tuple of the minimum and maximum number of samples and the DAC resolution in bits
+                (None if the device quantizes the samples itself).
+        """
+        raise NotImplementedError
+
+    def _read_state(self):
+        """
+        Reads all device settings that influence the shape of the signal preview graph at once and caches them.
+
+        Setters that change a single one of these settings update the cache themselves,
+        so that reading the settings again is only necessary if several of them change (e.g. due to a reset).
+        """
+        raise NotImplementedError
+
     def _update_preview_variables(self):
         """
         Updates the values of all variables that influence the shape of the signal preview graph.
 
-        Reads several of the currently set device settings in order to convert those values for the attributes
+        Converts the cached device settings into the attributes
         "signal type", "amplitude", "offset", "period", "phase", "symmetry", "duty cycle" and "arbitrary data".
         """
         raise NotImplementedError
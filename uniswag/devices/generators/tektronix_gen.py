@@ -1,5 +1,4 @@
 import math
-import time
 
 import numpy as np
 import tektronixsg
@@ -149,13 +148,40 @@ class TektronixGenChannel(GenChannel):
         else:
             self._sig_types_avail = ['-']
 
+        # the maximum number of samples that the edit memory can hold
+        if self._ch.generator.connected_device == "AFG1022":
+            self._arb_data_length_max = 8192
+        else:
+            self._arb_data_length_max = 131072
+
+        # the number of bytes per chunk when uploading arbitrary data
+        self._upload_chunk_size = 4096
+
         # initialize all the attributes that influence the signal preview graph
+        self._read_state()
         self._update_preview_variables()
 
+    def _read_state(self):
+        state = {
+            'signal_type': self._ch.signal_type,
+            'offset': self._ch.voltage_offset,
+            'amplitude': self._ch.voltage_amplitude,
+            'period': self._ch.pulse_period,
+            'phase': math.degrees(self._ch.phase),
+            'duty_cycle': self._ch.pulse_duty * 0.01,
+            'arb_data': self._state.get('arb_data')
+        }
+
+        # the content of the waveform buffer is only needed (and therefore read) for arbitrary signals
+        if state['signal_type'][:-1] == 'memory' or state['arb_data'] is None:
+            state['arb_data'] = np.asarray(self._ch.generator.read_data_emom(self._id['No']))
+
+        self._state = state
+
     def _update_preview_variables(self):
         self._mutex_preview_variables.acquire()
 
-        sig_type = self._ch.signal_type
+        sig_type = self._state['signal_type']
         if sig_type == 'sine':
             self._signal_type = 'sine'
         elif sig_type == 'ramp':
@@ -169,30 +195,29 @@ class TektronixGenChannel(GenChannel):
         else:
             self._signal_type = 'unknown'
 
-        self._offset = self._ch.voltage_offset
-        self._amplitude = self._ch.voltage_amplitude / 2
-        self._period = self._ch.pulse_period
-        self._phase = math.degrees(self._ch.phase)
-        self._duty_cycle = self._ch.pulse_duty * 0.01
+        self._offset = self._state['offset']
+        self._amplitude = self._state['amplitude'] / 2
+        self._period = self._state['period']
+        self._phase = self._state['phase']
+        self._duty_cycle = self._state['duty_cycle']
 
         # no VISA commands defined by Tektronix to set/query symmetry
         self._symmetry = 0.5
 
-        # get new content of the waveform buffer (after the device applied normalization etc.)
-        raw_arb_data = self._ch.generator.read_data_emom(self._id['No'])
-        normalizing_factor = ((self._offset + self._amplitude) - (self._offset - self._amplitude)) / 16383
-        normalized_values = [entry * normalizing_factor + (self._offset - self._amplitude) for entry in raw_arb_data]
-        self._arbitrary_data[1] = normalized_values
-
-        # calculate the time vector associated with the waveform buffer's content
-        time_vector = []
-        time_value = 0
-        number_of_samples = len(self._arbitrary_data[1])
-        for _ in range(number_of_samples):
-            time_vector.append(time_value)
-            time_value += self._period / number_of_samples
-        self._arbitrary_data[0] = time_vector
+        offset = self._offset
+        amplitude = self._amplitude
+        period = self._period
+
+        self._mutex_preview_variables.release()
+
+        # calculate the preview of the waveform buffer's content (after the device applied normalization etc.),
+        # values from 0 to 16383 span the range from (offset - amplitude) to (offset + amplitude)
+        raw_arb_data = self._state['arb_data']
+        arbitrary_data = self._calc_arb_preview(
+            raw_arb_data, period / max(len(raw_arb_data), 1), 2 * amplitude / 16383, offset - amplitude)
 
+        self._mutex_preview_variables.acquire()
+        self._arbitrary_data = list(arbitrary_data)
         self._mutex_preview_variables.release()
 
     @GenChannel.is_enabled.setter
@@ -205,32 +230,31 @@ class TektronixGenChannel(GenChannel):
         self._mutex_dev_access.release()
 
     def reset_preview_variables(self):
+        self._read_state()
         self._update_preview_variables()
 
-    def arb_data(self, value):
+    @property
+    def arb_data_limits(self):
+        # the edit memory holds 14 bit values
+        return 2, self._arb_data_length_max, 14
+
+    def arb_data(self, value, progress_callback=None, is_fitted=False):
         success = False
 
         # ensure the minimum vector length
         if len(value) >= 2:
 
-            # assert that maximum amount of applicable values is not exceeded
-            value = value[:8192]
-
-            value = np.array(value)
+            # resample data exceeding the edit memory's depth instead of truncating it
+            # and scale it to the range of the edit memory's values
+            if is_fitted:
+                voltage_bits = value
+            else:
+                voltage_bits = self._fit_arb_data(value, *self.arb_data_limits)
 
             self._mutex_dev_access.acquire()
 
-            # from the set_arbitrary_signal function
-            min_voltage = min(value)
-            max_voltage = max(value)
-            voltage_range = abs(max_voltage - min_voltage)
-            normed_voltage = abs(value - min_voltage) / voltage_range
-            tmp = 16383 * normed_voltage
-            voltage_bits = tmp.astype(int)
-            self._ch.generator.write_data_emom(voltage_bits, self._id['No'])
-            time.sleep(0.2)
-
-            # self._ch.set_arbitrary_signal(value)
+            self._write_arb_data(voltage_bits, progress_callback)
+            self._state['arb_data'] = voltage_bits
             self._update_preview_variables()
 
             self._mutex_dev_access.release()
@@ -239,6 +263,54 @@ class TektronixGenChannel(GenChannel):
 
         return success
 
+    def _write_arb_data(self, data, progress_callback=None):
+        """
+        Uploads data into the channel's edit memory.
+
+        Instead of a single write operation, the binary block is streamed in chunks,
+        with the passed callback being invoked after each chunk.
+        Afterwards, the method waits until the device has finished processing the data.
+        The device access lock needs to be held while calling this method.
+
+        Args:
+            data (np.ndarray):
+                The values to write into the edit memory (ranging from 0 to 16383).
+            progress_callback (function):
+                A function which receives the share of the data transferred so far (from 0 to 1).
+        """
+        instrument = self._ch.generator._instrument
+
+        if self._ch.generator.connected_device == 'AFG1022':
+            memory = ''
+        else:
+            memory = self._id['No']
+
+        # IEEE 488.2 definite length block of big-endian 16 bit integers
+        payload = np.asarray(data).astype('>i2').tobytes()
+        block_length = str(len(payload))
+        header = 'DATA:DATA EMEM{},#{}{}'.format(memory, len(block_length), block_length)
+
+        # only the last chunk terminates the message
+        send_end = instrument.send_end
+        instrument.send_end = False
+        try:
+            instrument.write_raw(header.encode('ascii'))
+            for start in range(0, len(payload), self._upload_chunk_size):
+                stop = min(start + self._upload_chunk_size, len(payload))
+                chunk = payload[start:stop]
+                if stop == len(payload):
+                    chunk += (instrument.write_termination or '').encode('ascii')
+                    instrument.send_end = send_end
+                instrument.write_raw(chunk)
+
+                if progress_callback is not None:
+                    progress_callback(stop / len(payload))
+        finally:
+            instrument.send_end = send_end
+
+        # wait until all pending operations are completed
+        instrument.query('*OPC?')
+
     @property
     def volt_max(self):
         self._mutex_dev_access.acquire()
@@ -251,6 +323,9 @@ class TektronixGenChannel(GenChannel):
     def volt_max(self, value):
         self._mutex_dev_access.acquire()
         self._ch.voltage_max = value
+
+        # several other settings depend on this one
+        self._read_state()
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -266,6 +341,9 @@ class TektronixGenChannel(GenChannel):
     def volt_min(self, value):
         self._mutex_dev_access.acquire()
         self._ch.voltage_min = value
+
+        # several other settings depend on this one
+        self._read_state()
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -281,6 +359,8 @@ class TektronixGenChannel(GenChannel):
     def offset(self, value):
         self._mutex_dev_access.acquire()
         self._ch.voltage_offset = value
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['offset'] = self._ch.voltage_offset
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -296,6 +376,8 @@ class TektronixGenChannel(GenChannel):
     def amp(self, value):
         self._mutex_dev_access.acquire()
         self._ch.voltage_amplitude = value
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['amplitude'] = self._ch.voltage_amplitude
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -316,6 +398,9 @@ class TektronixGenChannel(GenChannel):
     def sig_type(self, value):
         self._mutex_dev_access.acquire()
         self._ch.signal_type = value
+
+        # several other settings depend on this one
+        self._read_state()
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -331,6 +416,9 @@ class TektronixGenChannel(GenChannel):
     def impedance(self, value):
         self._mutex_dev_access.acquire()
         self._ch.impedance = value
+
+        # several other settings depend on this one
+        self._read_state()
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -346,6 +434,8 @@ class TektronixGenChannel(GenChannel):
     def freq(self, value):
         self._mutex_dev_access.acquire()
         self._ch.frequency = value
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['period'] = self._ch.pulse_period
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -361,6 +451,8 @@ class TektronixGenChannel(GenChannel):
     def phase(self, value):
         self._mutex_dev_access.acquire()
         self._ch.phase = math.radians(value)
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['phase'] = math.degrees(self._ch.phase)
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -473,6 +565,8 @@ class TektronixGenChannel(GenChannel):
     def pulse_width(self, value):
         self._mutex_dev_access.acquire()
         self._ch.pulse_width = value
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['duty_cycle'] = self._ch.pulse_width / self._state['period']
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -488,6 +582,8 @@ class TektronixGenChannel(GenChannel):
     def duty_cycle(self, value):
         self._mutex_dev_access.acquire()
         self._ch.pulse_duty = value * 100
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['duty_cycle'] = self._ch.pulse_duty * 0.01
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -531,6 +627,8 @@ class TektronixGenChannel(GenChannel):
     def period(self, value):
         self._mutex_dev_access.acquire()
         self._ch.pulse_period = value
+        # the device may coerce the value (e.g. round it), so the applied one is read back
+        self._state['period'] = self._ch.pulse_period
         self._update_preview_variables()
         self._mutex_dev_access.release()
 
@@ -561,3 +659,15 @@ class TektronixGenChannel(GenChannel):
         self._mutex_dev_access.acquire()
         self._ch.pulse_trailing_transition = value
         self._mutex_dev_access.release()
+
+
+def list_connected_devices():
+    """
+    The list of all currently connected Tektronix signal generators.
+
+    Returns:
+        list[dict[str, str]]:
+            A list containing the shortened ID (name, serial number and type) of every connected device.
+    """
+    return [{'Name': dev['Model'], 'SerNo': dev['Serial Number'], 'Type': 'OSC' if 'TBS' in dev['Model'] else 'GEN'}
+            for dev in tektronixsg.list_connected_tektronix_generators()]
@@ -1,4 +1,6 @@
 import handyscope
+import numpy as np
+from handyscope.library import libtiepie
 
 from uniswag.devices.generator import Generator, GenChannel
 
@@ -34,6 +36,12 @@ class TiepieGen(Generator):
         # halt the signal generation initially
         self._is_running = False
 
+    def load_capabilities(self):
+        for channel in self._ch:
+            channel.sig_types_avail
+            channel.amp_ranges_avail
+            channel.arb_data_limits
+
     def _term_deletion(self):
         self._gen.close()
 
@@ -117,15 +125,34 @@ class TiepieGenChannel(GenChannel):
         self._ch.is_out_on = False
 
         # the vector of the raw arbitrary signal samples that is uploaded into the device's waveform buffer
-        self._raw_arb_data = [0]
+        self._raw_arb_data = np.array([0.0])
+
+        # the available signal types, amplitude ranges and arbitrary data lengths, which are fixed for each device
+        # (read upon first use, see load_capabilities)
+        self._sig_types_avail = None
+        self._amp_ranges_avail = None
+        self._arb_data_limits = None
 
         # initialize all the attributes that influence the signal preview graph
+        self._read_state()
         self._update_preview_variables()
 
+    def _read_state(self):
+        state = {'signal_type': self._ch.signal_type, 'offset': self._ch.offset}
+
+        # functionalities that are not available with certain settings / certain TiePie models
+        for name in ['amplitude', 'freq', 'phase', 'symmetry', 'pulse_width', 'freq_mode']:
+            try:
+                state[name] = getattr(self._ch, name)
+            except OSError:
+                state[name] = None
+
+        self._state = state
+
     def _update_preview_variables(self):
         self._mutex_preview_variables.acquire()
 
-        sig_type = self._ch.signal_type
+        sig_type = self._state['signal_type']
         if sig_type == 'sine':
             self._signal_type = 'sine'
         elif sig_type == 'triangle':
@@ -139,58 +166,48 @@ class TiepieGenChannel(GenChannel):
         else:
             self._signal_type = 'unknown'
 
-        self._offset = self._ch.offset
+        self._offset = self._state['offset']
 
         # functionalities that are not available with certain settings / certain TiePie models
-        try:
-            self._amplitude = self._ch.amplitude
-        except OSError:
-            pass
-        try:
-            self._period = 1 / self._ch.freq
-        except OSError:
-            pass
-        try:
-            self._phase = self._ch.phase
-        except OSError:
-            pass
-        try:
-            self._symmetry = self._ch.symmetry
-        except OSError:
-            pass
-        try:
-            self._duty_cycle = self._ch.pulse_width / self._period
-        except OSError:
-            pass
-
-        try:
-
-            # calculate new content of the waveform buffer (after the device applied normalization etc.)
-            limit = max(abs(min(self._raw_arb_data)), abs(max(self._raw_arb_data)))
+        if self._state['amplitude'] is not None:
+            self._amplitude = self._state['amplitude']
+        if self._state['freq'] is not None:
+            self._period = 1 / self._state['freq']
+        if self._state['phase'] is not None:
+            self._phase = self._state['phase']
+        if self._state['symmetry'] is not None:
+            self._symmetry = self._state['symmetry']
+        if self._state['pulse_width'] is not None:
+            self._duty_cycle = self._state['pulse_width'] / self._period
+
+        # the time between two consecutive samples of the waveform buffer
+        if self._state['freq_mode'] is None:
+            sample_period = None
+        elif self._state['freq_mode'] == 'signal':
+            sample_period = self._period / max(len(self._raw_arb_data), 1)
+        else:
+            sample_period = self._period
+
+        offset = self._offset
+        amplitude = self._amplitude
+
+        self._mutex_preview_variables.release()
+
+        if sample_period is not None:
+
+            # calculate new content of the waveform buffer (after the device applied normalization etc.),
+            # the highest absolute value equals the amplitude
+            raw_arb_data = np.asarray(self._raw_arb_data, dtype=float)
+            limit = np.abs(raw_arb_data).max() if len(raw_arb_data) else 0
             if limit != 0:
-                normalizing_factor = self._amplitude / limit
+                normalizing_factor = amplitude / limit
             else:
                 normalizing_factor = 0
-            normalized_values = [entry * normalizing_factor + self._offset for entry in self._raw_arb_data]
-            self._arbitrary_data[1] = normalized_values
-
-            # calculate the time vector associated with the waveform buffer's content
-            time_vector = []
-            time_value = 0
-            number_of_samples = len(self._raw_arb_data)
-            if self._ch.freq_mode == 'signal':
-                time_difference = self._period / number_of_samples
-            else:
-                time_difference = self._period
-            for _ in range(number_of_samples):
-                time_vector.append(time_value)
-                time_value += time_difference
-            self._arbitrary_data[0] = time_vector
+            arbitrary_data = self._calc_arb_preview(raw_arb_data, sample_period, normalizing_factor, offset)
 
-        except OSError:
-            pass
-
-        self._mutex_preview_variables.release()
+            self._mutex_preview_variables.acquire()
+            self._arbitrary_data = list(arbitrary_data)
+            self._mutex_preview_variables.release()
 
     @GenChannel.is_enabled.setter
     def is_enabled(self, value):
@@ -203,7 +220,22 @@ class TiepieGenChannel(GenChannel):
 
         self._mutex_dev_access.release()
 
-    def arb_data(self, value):
+    def _read_arb_data_limits(self):
+        # the device access lock has to be acquired by the caller
+        if self._arb_data_limits is None:
+            self._arb_data_limits = (self._ch.arb_data_length_min, self._ch.arb_data_length_max, None)
+
+        return self._arb_data_limits
+
+    @property
+    def arb_data_limits(self):
+        self._mutex_dev_access.acquire()
+        result = self._read_arb_data_limits()
+        self._mutex_dev_access.release()
+
+        return result
+
+    def arb_data(self, value, progress_callback=None, is_fitted=False):
         success = False
 
         self._mutex_dev_access.acquire()
@@ -211,13 +243,24 @@ class TiepieGenChannel(GenChannel):
         # assert that generator property can be accessed
         if self._ch.is_controllable and self._ch.signal_type == 'arbitrary':
 
+            length_min, length_max, _ = self._read_arb_data_limits()
+
             # ensure the minimum vector length
-            if len(value) >= self._ch.arb_data_length_min:
+            if len(value) >= length_min:
+
+                # resample data exceeding the maximum amount of applicable values instead of truncating it
+                # (the device normalizes the samples itself, so no quantization is needed)
+                if not is_fitted:
+                    value = self._fit_arb_data(value, length_min, length_max)
 
-                # assert that maximum amount of applicable values is not exceeded
-                value = value[:self._ch.arb_data_length_max]
+                # pass the samples to the library directly,
+                # since the "handyscope" library's setting method creates a Python list first
+                # (the library transfers the whole buffer at once, so no progress is available inbetween)
+                buffer = np.ascontiguousarray(value, dtype=np.float32)
+                libtiepie.GenSetData(self._ch._dev_handle, buffer.ctypes.data, len(buffer))
+                if progress_callback is not None:
+                    progress_callback(1.0)
 
-                self._ch.arb_data(value)
                 self._raw_arb_data = value
                 self._update_preview_variables()
 
@@ -248,9 +291,11 @@ class TiepieGenChannel(GenChannel):
     @property
     def sig_types_avail(self):
         self._mutex_dev_access.acquire()
+        if self._sig_types_avail is None:
+            self._sig_types_avail = self._ch.signal_types_available
 
         # convert tuple into list
-        result = list(self._ch.signal_types_available)
+        result = list(self._sig_types_avail)
 
         self._mutex_dev_access.release()
 
@@ -271,6 +316,9 @@ class TiepieGenChannel(GenChannel):
         # assert that generator property can be accessed
         if self._ch.is_controllable:
             self._ch.signal_type = value
+
+            # the availability of other settings depends on the signal type
+            self._read_state()
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -300,6 +348,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.amplitude_max, max(self._ch.amplitude_min, value))
 
             self._ch.amplitude = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['amplitude'] = self._ch.amplitude
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -307,9 +358,11 @@ class TiepieGenChannel(GenChannel):
     @property
     def amp_ranges_avail(self):
         self._mutex_dev_access.acquire()
+        if self._amp_ranges_avail is None:
+            self._amp_ranges_avail = self._ch.amplitude_ranges_available
 
         # convert tuple into list
-        result = list(self._ch.amplitude_ranges_available)
+        result = list(self._amp_ranges_avail)
 
         self._mutex_dev_access.release()
 
@@ -370,6 +423,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.offset_max, max(self._ch.offset_min, value))
 
             self._ch.offset = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['offset'] = self._ch.offset
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -399,6 +455,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.freq_max, max(self._ch.freq_min, value))
 
             self._ch.freq = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['freq'] = self._ch.freq
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -441,6 +500,9 @@ class TiepieGenChannel(GenChannel):
         # assert that generator property can be accessed
         if self._ch.is_controllable and self._ch.signal_type not in ['DC', 'noise']:
             self._ch.freq_mode = value
+
+            # the meaning of the frequency depends on the frequency mode
+            self._read_state()
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -464,6 +526,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.phase_max, max(self._ch.phase_min, value))
 
             self._ch.phase = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['phase'] = self._ch.phase
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -493,6 +558,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.symmetry_max, max(self._ch.symmetry_min, value))
 
             self._ch.symmetry = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['symmetry'] = self._ch.symmetry
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -516,6 +584,9 @@ class TiepieGenChannel(GenChannel):
             value = min(self._ch.pulse_width_max, max(self._ch.pulse_width_min, value))
 
             self._ch.pulse_width = value
+
+            # the device may still coerce the value (e.g. quantize it), so the applied one is read back
+            self._state['pulse_width'] = self._ch.pulse_width
             self._update_preview_variables()
 
         self._mutex_dev_access.release()
@@ -1,10 +1,11 @@
 import threading
+import time
 
 import numpy as np
 import scipy.fft as fft
-from PySide6.QtCore import QPointF
 
 from uniswag.devices.device import Device, Channel
+from uniswag.devices.software_trigger import SoftwareTrigger
 
 
 class Oscilloscope(Device):
@@ -51,9 +52,13 @@ class Oscilloscope(Device):
         self._cond_running = threading.Condition()
 
         # the dictionary containing the latest measured data points;
-        # each key represents a channel, to which the corresponding two lists of data points belongs
-        # (first list for directly measured data, second list for fourier-transformed data)
-        self._points = {1: ([QPointF(0, 0)], [QPointF(0, 0)])}
+        # each key represents a channel, to which the corresponding two pairs of X and Y vectors belong
+        # (first pair for directly measured data, second pair for fourier-transformed data)
+        self._points = {1: ((np.zeros(1), np.zeros(1)), (np.zeros(1), np.zeros(1)))}
+
+        # the segments extracted by the software trigger from the latest measured data
+        # (None if the software trigger is disabled)
+        self._segments = None
 
         # the minimum and maximum measurement values in the entire data points dictionary
         self._limits_norm = {'Time': (0, 0), 'Voltage': (0, 0)}
@@ -63,6 +68,17 @@ class Oscilloscope(Device):
         # indicates, whether the data points dictionary has been updated since the last time it was read
         self._new_data_available = False
 
+        # the number of the latest measured frame (incremented with every update of the data points dictionary)
+        self._frame_id = 0
+
+        # a threading condition which notifies threads waiting for a new frame
+        self._cond_new_frame = threading.Condition(self._mutex_data)
+
+        # a trigger evaluated in software, which aligns the measured data to trigger events and extracts segments
+        self._soft_trig = SoftwareTrigger()
+        # a threading lock which ensures thread-safe access to the software trigger settings
+        self._mutex_soft_trig = threading.Lock()
+
         # a thread that continuously retrieves new measurement data while the oscilloscope is running
         self._new_data_retrieval_thread = threading.Thread(target=self._retrieve_new_data, daemon=True)
 
@@ -91,13 +107,22 @@ class Oscilloscope(Device):
 
         Returns:
             dict[str, Any]:
-                A dictionary with the following four keys:
+                A dictionary with the following keys:
                 'New' is a flag which indicates that there might be unread values (True if new).
+                'Frame' is the number of the frame the values belong to (increasing with every new frame).
                 'Points' contains a dictionary with the enabled channels' numbers as keys and
-                the measured data points in the form of two lists (normal and FFT) combined into a tuple as values.
+                the measured data points in the form of two tuples of X and Y vectors (normal and FFT)
+                combined into a tuple as values.
                 'Norm limits' contains a dictionary with 'Time' and 'Voltage' as keys and
                 tuples of the respective minimum and maximum as values.
                 'FFT limits' is the same but with 'Frequency' and 'Share' keys.
+                'Segments' contains the segments extracted by the software trigger or
+                captured by a segmented measurement as a dictionary with the keys
+                'Time' (the segments' common time vector), 'Data' (a dictionary with the channels' numbers
+                as keys and 2-D arrays of the shape segments × samples as values) and
+                'Timestamps' (an array of the UNIX time of each segment's trigger event,
+                or None if the device does not provide them),
+                or None if neither the software trigger nor a segmented measurement is active.
         """
         new_data = False
 
@@ -114,24 +139,56 @@ class Oscilloscope(Device):
         points = self._points
         lim_norm = self._limits_norm
         lim_fft = self._limits_fft
+        segments = self._segments
+        frame_id = self._frame_id
 
         self._mutex_data.release()
 
         return {
             'New': new_data,
+            'Frame': frame_id,
             'Points': points,
-            'Norm limits': lim_norm, 'FFT limits': lim_fft
+            'Norm limits': lim_norm, 'FFT limits': lim_fft,
+            'Segments': segments
         }
 
+    def wait_for_frame(self, frame_id, timeout=None):
+        """
+        Waits until a frame newer than the specified one has been measured and provides its data.
+
+        Unlike polling the retrieving method, this allows waiting for data that was measured
+        after a certain point in time (e.g. after changing a signal generator's settings)
+        without any fixed delays.
+
+        Args:
+            frame_id (int):
+                The number of the latest frame that is not of interest (as provided by the retrieving method).
+            timeout (float):
+                The maximum time in seconds to wait (None to wait indefinitely).
+
+        Returns:
+            dict[str, Any] or None:
+                The same dictionary as provided by the retrieving method (without clearing the "new" flag),
+                or None if no newer frame has been measured within the timeout.
+        """
+        self._cond_new_frame.acquire()
+        is_newer = self._cond_new_frame.wait_for(lambda: self._frame_id > frame_id, timeout)
+        self._cond_new_frame.release()
+
+        if not is_newer:
+            return None
+
+        return self.retrieve()
+
     @staticmethod
     def calculate_fft_points(x_points, y_points):
         """
         Performs a Fast Fourier Transform on the specified time signal.
 
         Args:
-            x_points (list):
+            x_points (np.ndarray):
                 The original signal's time vector.
-            y_points (list):
+            y_points (np.ndarray):
                 The original signal's voltage vector.
 
         Returns:
@@ -139,12 +196,318 @@ class Oscilloscope(Device):
                 A tuple containing the resulting frequency- & share-vector.
         """
         sample_points = len(x_points)
-        sample_spacing = max(x_points) / len(x_points)
+        if sample_points < 2:
+            return np.zeros(1), np.zeros(1)
+
+        # the time vector does not necessarily start at zero (e.g. if pre-trigger samples are included)
+        sample_spacing = (x_points[-1] - x_points[0]) / (sample_points - 1)
+        if sample_spacing <= 0:
+            return np.zeros(1), np.zeros(1)
 
-        yf = 2.0 / sample_points * np.abs(fft.fft(y_points)[0:sample_points // 2])
-        xf = fft.fftfreq(sample_points, sample_spacing)[:sample_points // 2]
+        # the spectrum of a real signal is symmetric, so only its first half is calculated
+        yf = 2.0 / sample_points * np.abs(fft.rfft(y_points)[:sample_points // 2])
+        xf = fft.rfftfreq(sample_points, sample_spacing)[:sample_points // 2]
         return xf, yf
 
+    def _update_points(self, channel_data, continuous=False, segments=None):
+        """
+        Stores the passed measurement data as the latest data points.
+
+        If the data stems from a segmented measurement, the latest segment is used as data points,
+        while all segments are stored alongside.
+        Otherwise, if the software trigger is enabled, the data is aligned to the most recent trigger event first,
+        and the segments around all trigger events found in the data are stored alongside.
+        If no trigger event is found, the previously stored data points remain unchanged.
+        Afterwards, the FFT is calculated for each channel, the value limits are determined and
+        the flag indicating that new data is available is set.
+
+        Args:
+            channel_data (dict[int, (Any, Any)]):
+                A dictionary with the enabled channels' numbers as keys and
+                tuples of the respective time and voltage vectors as values.
+                If both vectors of a channel differ in length, the surplus values are omitted.
+                Can be empty if segments are passed.
+            continuous (bool):
+                Whether the passed data directly follows the data passed in the previous call
+                (e.g. in case of streaming measurements).
+            segments (dict[str, Any]):
+                The segments captured by a segmented measurement, in the same format as
+                the 'Segments' entry of the dictionary provided by the retrieving method.
+        """
+        vectors = {}
+        for ch_no, (time_vector, voltage) in channel_data.items():
+            length = min(len(time_vector), len(voltage))
+            if length > 0:
+                vectors[ch_no] = (np.asarray(time_vector[:length], dtype=float),
+                                  np.asarray(voltage[:length], dtype=float))
+
+        # skip value updates if not a single channel provided data
+        if not vectors and segments is None:
+            return
+
+        # align the measured data to the most recent software trigger event
+        self._mutex_soft_trig.acquire()
+        if segments is None and self._soft_trig.is_enabled and self._soft_trig.src in vectors:
+            src_time = vectors[self._soft_trig.src][0]
+            sample_period = (src_time[-1] - src_time[0]) / max(len(src_time) - 1, 1)
+            result = self._soft_trig.scan(sample_period, {no: vec[1] for no, vec in vectors.items()}, continuous)
+            if result is not None:
+                segments = {'Time': result[0], 'Data': result[1], 'Timestamps': time.time() + result[2]}
+        self._mutex_soft_trig.release()
+
+        if segments is not None:
+            # keep displaying the previous data points until the next trigger event occurs
+            if not any(len(data) for data in segments['Data'].values()):
+                return
+
+            for ch_no, data in segments['Data'].items():
+                vectors[ch_no] = (np.asarray(segments['Time'], dtype=float), np.asarray(data[-1], dtype=float))
+
+        points = {}
+        min_time = max_time = min_voltage = max_voltage = None
+        min_frequency = max_frequency = min_share = max_share = None
+        for ch_no, (time_vector, voltage) in vectors.items():
+            frequency, share = self.calculate_fft_points(time_vector, voltage)
+            points[ch_no] = ((time_vector, voltage), (frequency, share))
+
+            # set minimum and maximum across all channels
+            if min_time is None:
+                min_time, max_time = time_vector[0], time_vector[-1]
+                min_voltage, max_voltage = np.min(voltage), np.max(voltage)
+                min_frequency, max_frequency = frequency[0], frequency[-1]
+                min_share, max_share = np.min(share), np.max(share)
+            else:
+                min_time, max_time = min(min_time, time_vector[0]), max(max_time, time_vector[-1])
+                min_voltage, max_voltage = min(min_voltage, np.min(voltage)), max(max_voltage, np.max(voltage))
+                min_frequency, max_frequency = min(min_frequency, frequency[0]), max(max_frequency, frequency[-1])
+                min_share, max_share = min(min_share, np.min(share)), max(max_share, np.max(share))
+
+        lim_norm = {'Time': (float(min_time), float(max_time)), 'Voltage': (float(min_voltage), float(max_voltage))}
+        lim_fft = {'Frequency': (float(min_frequency), float(max_frequency)),
+                   'Share': (float(min_share), float(max_share))}
+
+        self._mutex_data.acquire()
+
+        # update the dictionaries containing
+        # the latest measured data points and the minimum & maximum values
+        self._points = points
+        self._limits_norm = lim_norm
+        self._limits_fft = lim_fft
+        self._segments = segments
+
+        # indicate that new values have been retrieved from the oscilloscope
+        self._new_data_available = True
+        self._frame_id += 1
+        self._cond_new_frame.notify_all()
+
+        self._mutex_data.release()
+
+    # SOFTWARE TRIGGER #################################################################################################
+
+    @property
+    def soft_trig_kinds_avail(self):
+        """
+        The trigger kinds supported by the software trigger.
+
+        Returns:
+            list[str]:
+                The names of all available software trigger kinds ('Off' disables the software trigger).
+        """
+        self._mutex_soft_trig.acquire()
+        result = list(self._soft_trig.kinds_avail)
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @property
+    def soft_trig_kind(self):
+        """
+        The currently selected software trigger kind.
+
+        Returns:
+            str:
+                One of the entries of the list of available software trigger kinds.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.kind
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_kind.setter
+    def soft_trig_kind(self, value):
+        self._mutex_soft_trig.acquire()
+        if value in self._soft_trig.kinds_avail:
+            self._soft_trig.kind = value
+            self._soft_trig.reset()
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_srcs_avail(self):
+        """
+        The channels whose measurement data can be scanned for software trigger events.
+
+        Returns:
+            list[int]:
+                The numbers of all of the oscilloscope's channels.
+        """
+        return [c.id['No'] for c in self._ch]
+
+    @property
+    def soft_trig_src(self):
+        """
+        The channel whose measurement data is scanned for software trigger events.
+
+        Returns:
+            int:
+                The number of the trigger source channel.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.src
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_src.setter
+    def soft_trig_src(self, value):
+        self._mutex_soft_trig.acquire()
+        if value in self.soft_trig_srcs_avail:
+            self._soft_trig.src = value
+            self._soft_trig.reset()
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_lvl(self):
+        """
+        The software trigger level in volts (the lower bound of the voltage window for window triggers).
+
+        Returns:
+            float:
+                The trigger level.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.lvl
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_lvl.setter
+    def soft_trig_lvl(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.lvl = value
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_lvl_high(self):
+        """
+        The upper bound of the voltage window in volts (only used by window triggers).
+
+        Returns:
+            float:
+                The upper window bound.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.lvl_high
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_lvl_high.setter
+    def soft_trig_lvl_high(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.lvl_high = value
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_hyst(self):
+        """
+        The software trigger hysteresis in volts.
+
+        After a trigger event, the signal needs to fall back below (resp. rise above) the trigger level
+        by this distance before the next trigger event can occur.
+
+        Returns:
+            float:
+                The trigger hysteresis.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.hyst
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_hyst.setter
+    def soft_trig_hyst(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.hyst = abs(value)
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_width(self):
+        """
+        The minimum and maximum pulse width in seconds (only used by pulse width triggers).
+
+        Returns:
+            list[float]:
+                A list with the minimum as first and the maximum as second entry.
+        """
+        self._mutex_soft_trig.acquire()
+        result = [self._soft_trig.width_min, self._soft_trig.width_max]
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_width.setter
+    def soft_trig_width(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.width_min = max(min(value), 0)
+        self._soft_trig.width_max = max(value)
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_seg_len(self):
+        """
+        The number of samples of each segment extracted around a software trigger event.
+
+        Returns:
+            int:
+                The segment length.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.seg_len
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_seg_len.setter
+    def soft_trig_seg_len(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.seg_len = max(value, 2)
+        self._soft_trig.reset()
+        self._mutex_soft_trig.release()
+
+    @property
+    def soft_trig_pre_ratio(self):
+        """
+        The share of each extracted segment's samples that lie before the software trigger event.
+
+        Returns:
+            float:
+                A value between 0 and 1.
+        """
+        self._mutex_soft_trig.acquire()
+        result = self._soft_trig.pre_ratio
+        self._mutex_soft_trig.release()
+
+        return result
+
+    @soft_trig_pre_ratio.setter
+    def soft_trig_pre_ratio(self, value):
+        self._mutex_soft_trig.acquire()
+        self._soft_trig.pre_ratio = min(1, max(0, value))
+        self._soft_trig.reset()
+        self._mutex_soft_trig.release()
+
     # ABSTRACT METHODS #################################################################################################
 
     def _retrieve_new_data(self):
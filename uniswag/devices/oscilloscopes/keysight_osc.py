@@ -1,5 +1,4 @@
 import keysightosc
-from PySide6.QtCore import QPointF
 
 from uniswag.devices.oscilloscope import Oscilloscope, OscChannel
 
@@ -78,6 +77,9 @@ class KeysightOsc(Oscilloscope):
         # halt the oscilloscope's measurement initially
         self._is_running = False
 
+        # the maximum record length, which is fixed for each device (read upon first use, see load_capabilities)
+        self._rec_len_max = None
+
         # start the thread that continuously retrieves new measurement data while the oscilloscope is running
         self._new_data_retrieval_thread.start()
 
@@ -92,81 +94,29 @@ class KeysightOsc(Oscilloscope):
             # retrieve new measurement data from the oscilloscope if it is currently running
             if self.is_running:
 
-                points = {}
-                min_voltage = None
-                max_voltage = None
-
-                frequency = [0]
-                min_share = None
-                max_share = None
-
                 # get the time vector from the oscilloscope
                 self._mutex_dev_access.acquire()
                 time = self._osc.get_time_vector()
                 self._mutex_dev_access.release()
 
-                raw_data = None
+                channel_data = {}
 
-                # convert the raw measurement data into QPoint arrays for each enabled channel
-                # and save both the minimum & maximum value
+                # retrieve the raw measurement data for each enabled channel
                 for i in range(self.ch_cnt):
 
                     self._mutex_dev_access.acquire()
 
                     # retrieve the raw measurement data from the oscilloscope only if the channel is enabled
                     if self._ch[i].is_enabled:
-                        raw_data = self._osc.channels[i].get_signal()
-
-                        self._mutex_dev_access.release()
-
-                        # combine each element from the time vector and one channel's raw measurement data
-                        # into a QPoint
-                        current_norm_points = [QPointF(time[j], raw_data[j]) for j in range(
-                            min(len(time), len(raw_data)))]
-
-                        # calculate FFT
-                        frequency, share = self.calculate_fft_points(time, raw_data)
-                        current_fft_points = [QPointF(frequency[j], share[j]) for j in range(len(frequency))]
-
-                        # use the channel's number as key and the QPoint array tuple as value
-                        points[i + 1] = (current_norm_points, current_fft_points)
-
-                        # set minimum and maximum across all channels
-                        if min_voltage is None and max_voltage is None:
-                            min_voltage = min(raw_data)
-                            max_voltage = max(raw_data)
-                        else:
-                            min_voltage = min(min_voltage, min(raw_data))
-                            max_voltage = max(max_voltage, max(raw_data))
-                        if min_share is None and max_share is None:
-                            min_share = min(share)
-                            max_share = max(share)
-                        else:
-                            min_share = min(min_share, min(share))
-                            max_share = max(max_share, max(share))
-
-                    else:
-                        self._mutex_dev_access.release()
-
-                self._mutex_running.release()
+                        channel_data[i + 1] = (time, self._osc.channels[i].get_signal())
 
-                # skip value updates if not a single channel was enabled
-                if raw_data is not None:
-                    lim_norm = {'Time': (time[0], time[-1]), 'Voltage': (min_voltage, max_voltage)}
-                    lim_fft = {'Frequency': (frequency[0], frequency[-1]), 'Share': (min_share, max_share)}
+                    self._mutex_dev_access.release()
 
-                    self._mutex_data.acquire()
-
-                    # update the dictionaries containing
-                    # the latest measured data points and the minimum & maximum values
-                    self._points = points
-                    self._limits_norm = lim_norm
-                    self._limits_fft = lim_fft
-
-                    # indicate that new values have been retrieved from the oscilloscope
-                    self._new_data_available = True
+                self._mutex_running.release()
 
-                    self._mutex_data.release()
+                # combine the time vector with each enabled channel's raw measurement data
+                # and update the latest data points accordingly (skipped if not a single channel was enabled)
+                self._update_points(channel_data)
 
             else:
                 self._mutex_running.release()
@@ -265,9 +215,23 @@ class KeysightOsc(Oscilloscope):
         self._osc.waveform_points_mode = value
         self._mutex_dev_access.release()
 
+    def load_capabilities(self):
+        self.rec_len_max
+
     @property
     def rec_len_max(self):
-        return self._osc.waveform_count_max
+        self._mutex_dev_access.acquire()
+        result = self._read_rec_len_max()
+        self._mutex_dev_access.release()
+
+        return result
+
+    def _read_rec_len_max(self):
+        # the device access lock has to be acquired by the caller
+        if self._rec_len_max is None:
+            self._rec_len_max = self._osc.waveform_count_max
+
+        return self._rec_len_max
 
     @property
     def rec_len(self):
@@ -285,7 +249,7 @@ class KeysightOsc(Oscilloscope):
         self._mutex_dev_access.acquire()
 
         # assert that maximum value is not exceeded
-        self._osc.waveform_points = min(value, self.rec_len_max)
+        self._osc.waveform_points = min(value, self._read_rec_len_max())
 
         self._mutex_dev_access.release()
 
@@ -499,3 +463,15 @@ class KeysightOscChannel(OscChannel):
         self._mutex_dev_access.acquire()
         self._ch.trig_lvl = value
         self._mutex_dev_access.release()
+
+
+def list_connected_devices():
+    """
+    The list of all currently connected Keysight oscilloscopes.
+
+    Returns:
+        list[dict[str, str]]:
+            A list containing the shortened ID (name, serial number and type) of every connected device.
+    """
+    return [{'Name': dev['Model'], 'SerNo': dev['Serial Number'], 'Type': 'OSC'}
+            for dev in keysightosc.list_connected_keysight_oscilloscopes()]
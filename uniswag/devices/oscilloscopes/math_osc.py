@@ -1,5 +1,4 @@
 import numpy as np
-from PySide6.QtCore import QPointF
 
 from uniswag.devices.oscilloscope import Oscilloscope, OscChannel
 
@@ -53,16 +52,9 @@ class MathOsc(Oscilloscope):
 
             # retrieve new measurement data from the oscilloscope if it is currently running
             if self.is_running:
-                points = {}
-                min_voltage = max_voltage = None
+                channel_data = {}
 
-                frequency = [0]
-                min_share = max_share = None
-
-                time = None
-
-                # convert the raw measurement data into QPoint arrays for each enabled channel
-                # and save both the minimum & maximum value
+                # calculate the measurement data for each enabled channel
                 for i in range(self.ch_cnt):
 
                     self._mutex_dev_access.acquire()
@@ -74,55 +66,15 @@ class MathOsc(Oscilloscope):
                         self._mutex_dev_access.release()
 
                         if valid:
-                            # combine each element from the time vector and one channel's raw measurement data
-                            # into a QPoint
-                            current_norm_points = [QPointF(time[j], raw_data[j]) for j in range(len(time))]
-
-                            # calculate FFT
-                            frequency, share = self.calculate_fft_points(time, raw_data)
-                            current_fft_points = [QPointF(frequency[j], share[j]) for j in range(len(frequency))]
-
-                            # use the channel's number as the key and the QPoint array tuple as the value
-                            points[i + 1] = (current_norm_points, current_fft_points)
-
-                            # set minimum and maximum across all channels
-                            if min_voltage is None and max_voltage is None:
-                                min_voltage = min(raw_data)
-                                max_voltage = max(raw_data)
-                            else:
-                                min_voltage = min(min_voltage, min(raw_data))
-                                max_voltage = max(max_voltage, max(raw_data))
-                            if min_share is None and max_share is None:
-                                min_share = min(share)
-                                max_share = max(share)
-                            else:
-                                min_share = min(min_share, min(share))
-                                max_share = max(max_share, max(share))
-                        else:
-                            time = None
+                            channel_data[i + 1] = (time, raw_data)
 
                     else:
                         self._mutex_dev_access.release()
 
                 self._mutex_running.release()
 
-                # skip value updates if not a single channel was enabled
-                if time is not None:
-                    lim_norm = {'Time': (time[0], time[-1]), 'Voltage': (min_voltage, max_voltage)}
-                    lim_fft = {'Frequency': (frequency[0], frequency[-1]), 'Share': (min_share, max_share)}
-
-                    self._mutex_data.acquire()
-
-                    # update the dictionaries containing
-                    # the latest measured data points and the minimum & maximum values
-                    self._points = points
-                    self._limits_norm = lim_norm
-                    self._limits_fft = lim_fft
-
-                    # indicate that new values have been retrieved
-                    self._new_data_available = True
-
-                    self._mutex_data.release()
+                # update the latest data points (skipped if not a single channel was enabled)
+                self._update_points(channel_data)
 
             else:
                 self._mutex_running.release()
@@ -330,27 +282,23 @@ class MathOscChannel(OscChannel):
             return False, [], []
 
         try:
-            graph1 = self._operand1['Device'].retrieve()['Points'][self._operand1['Channel'].id['No']][0]
-            graph2 = self._operand2['Device'].retrieve()['Points'][self._operand2['Channel'].id['No']][0]
+            x_vec1, y_vec1 = self._operand1['Device'].retrieve()['Points'][self._operand1['Channel'].id['No']][0]
+            x_vec2, y_vec2 = self._operand2['Device'].retrieve()['Points'][self._operand2['Channel'].id['No']][0]
         except KeyError:
             return False, [], []
 
-        x_vec1 = []
-        y_vec1 = []
-        x_vec2 = []
-        y_vec2 = []
+        x_vec2 = x_vec2 + self._shift
 
-        for point in graph1:
-            x_vec1.append(point.x())
-            y_vec1.append(point.y())
-        for point in graph2:
-            x_vec2.append(point.x() + self._shift)
-            y_vec2.append(point.y())
-
-        time = np.unique(np.concatenate((x_vec1, x_vec2)))
+        # interpolation is only necessary if both operands were not sampled at the same points in time
+        if np.array_equal(x_vec1, x_vec2):
+            time = x_vec1
+            op1 = y_vec1
+            op2 = y_vec2
+        else:
+            time = np.union1d(x_vec1, x_vec2)
 
-        op1 = np.interp(time, x_vec1, y_vec1, left=0, right=0)
-        op2 = np.interp(time, x_vec2, y_vec2, left=0, right=0)
+            op1 = np.interp(time, x_vec1, y_vec1, left=0, right=0)
+            op2 = np.interp(time, x_vec2, y_vec2, left=0, right=0)
 
         voltage = self._operator(op1, op2)
 
@@ -1,5 +1,4 @@
 import tektronixosc
-from PySide6.QtCore import QPointF
 
 from uniswag.devices.oscilloscope import Oscilloscope, OscChannel
 
@@ -61,6 +60,9 @@ class TektronixOsc(Oscilloscope):
 
         self._osc.data_source = 'CH1'
 
+        # the maximum sample frequency, which is fixed for each device (read upon first use, see load_capabilities)
+        self._sample_freq_max = None
+
         # start the thread that continuously retrieves new measurement data while the oscilloscope is running
         self._new_data_retrieval_thread.start()
 
@@ -75,79 +77,24 @@ class TektronixOsc(Oscilloscope):
             # retrieve new measurement data from the oscilloscope if it is currently running
             if self.is_running:
 
-                points = {}
-                min_voltage = None
-                max_voltage = None
-
-                frequency = [0]
-                min_share = None
-                max_share = None
-
-                # get the time vector from the oscilloscope
-                time = []
-
-                raw_data = None
+                channel_data = {}
 
-                # convert the raw measurement data into QPoint arrays for each enabled channel
-                # and save both the minimum & maximum value
+                # retrieve the time vector and raw measurement data for each enabled channel
                 for i in range(self.ch_cnt):
 
                     self._mutex_dev_access.acquire()
 
                     # retrieve the raw measurement data from the oscilloscope only if the channel is enabled
                     if self._ch[i].is_enabled:
-                        time, raw_data = self._osc.channels[i].get_signal()
-
-                        self._mutex_dev_access.release()
-
-                        # combine each element from the time vector and one channel's raw measurement data
-                        # into a QPoint
-                        current_norm_points = [QPointF(time[j], raw_data[j]) for j in range(
-                            min(len(time), len(raw_data)))]
-
-                        # calculate FFT
-                        frequency, share = self.calculate_fft_points(time, raw_data)
-                        current_fft_points = [QPointF(frequency[j], share[j]) for j in range(len(frequency))]
-
-                        # use the channel's number as key and the QPoint array tuple as value
-                        points[i + 1] = (current_norm_points, current_fft_points)
-
-                        # set minimum and maximum across all channels
-                        if min_voltage is None and max_voltage is None:
-                            min_voltage = min(raw_data)
-                            max_voltage = max(raw_data)
-                        else:
-                            min_voltage = min(min_voltage, min(raw_data))
-                            max_voltage = max(max_voltage, max(raw_data))
-                        if min_share is None and max_share is None:
-                            min_share = min(share)
-                            max_share = max(share)
-                        else:
-                            min_share = min(min_share, min(share))
-                            max_share = max(max_share, max(share))
-
-                    else:
-                        self._mutex_dev_access.release()
-
-                self._mutex_running.release()
-
-                # skip value updates if not a single channel was enabled
-                if raw_data is not None:
-                    lim_norm = {'Time': (time[0], time[-1]), 'Voltage': (min_voltage, max_voltage)}
-                    lim_fft = {'Frequency': (frequency[0], frequency[-1]), 'Share': (min_share, max_share)}
-
-                    self._mutex_data.acquire()
+                        channel_data[i + 1] = self._osc.channels[i].get_signal()
 
-                    # update the dictionaries containing
-                    # the latest measured data points and the minimum & maximum values
-                    self._points = points
-                    self._limits_norm = lim_norm
-                    self._limits_fft = lim_fft
+                    self._mutex_dev_access.release()
 
-                    # indicate that new values have been retrieved from the oscilloscope
-                    self._new_data_available = True
+                self._mutex_running.release()
 
-                    self._mutex_data.release()
+                # combine each time vector with the corresponding channel's raw measurement data
+                # and update the latest data points accordingly (skipped if not a single channel was enabled)
+                self._update_points(channel_data)
 
             else:
                 self._mutex_running.release()
@@ -248,14 +195,24 @@ class TektronixOsc(Oscilloscope):
 
         self._mutex_dev_access.release()
 
+    def load_capabilities(self):
+        self.sample_freq_max
+
     @property
     def sample_freq_max(self):
         self._mutex_dev_access.acquire()
-        result = self._osc.max_sample_rate
+        result = self._read_sample_freq_max()
         self._mutex_dev_access.release()
 
         return result
 
+    def _read_sample_freq_max(self):
+        # the device access lock has to be acquired by the caller
+        if self._sample_freq_max is None:
+            self._sample_freq_max = self._osc.max_sample_rate
+
+        return self._sample_freq_max
+
     @property
     def sample_freq(self):
         self._mutex_dev_access.acquire()
@@ -272,7 +229,7 @@ class TektronixOsc(Oscilloscope):
         self._mutex_dev_access.acquire()
 
         # assert that maximum value is not exceeded
-        self._osc.sample_rate = min(value, self._osc.max_sample_rate)
+        self._osc.sample_rate = min(value, self._read_sample_freq_max())
 
         self._mutex_dev_access.release()
 
@@ -463,3 +420,15 @@ class TektronixOscChannel(OscChannel):
         self._mutex_dev_access.acquire()
         self._ch.trig_lvl = value
         self._mutex_dev_access.release()
+
+
+def list_connected_devices():
+    """
+    The list of all currently connected Tektronix oscilloscopes.
+
+    Returns:
+        list[dict[str, str]]:
+            A list containing the shortened ID (name, serial number and type) of every connected device.
+    """
+    return [{'Name': dev['Model'], 'SerNo': dev['Serial Number'], 'Type': 'OSC' if 'TBS' in dev['Model'] else 'GEN'}
+            for dev in tektronixosc.list_connected_tektronix_oscilloscopes()]
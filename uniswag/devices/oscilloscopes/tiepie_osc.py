@@ -1,5 +1,6 @@
 import handyscope
-from PySide6.QtCore import QPointF
+import numpy as np
+from handyscope.library import libtiepie
 
 from uniswag.devices.oscilloscope import Oscilloscope, OscChannel
 
@@ -43,11 +44,16 @@ class TiepieOsc(Oscilloscope):
         self._measure_mode = 'block'
 
         # define available measure modes
+        # (the ones provided by the hardware are read upon first use, see load_capabilities)
         self._special_measure_mode = 'repeat'
-        self._measure_modes_avail = [self._special_measure_mode]
-        hardware_measure_modes_avail = list(self._osc.measure_modes_available)
-        for mode in hardware_measure_modes_avail:
-            self._measure_modes_avail.append(mode)
+        self._measure_modes_avail = None
+
+        # the available resolutions and clock settings, which are fixed for each device
+        # (read upon first use as well, see load_capabilities)
+        self._auto_res_avail = None
+        self._res_avail = None
+        self._clock_src_avail = None
+        self._clock_outs_avail = None
 
         # halt the oscilloscope's measurement initially
         self._should_run = False
@@ -55,6 +61,9 @@ class TiepieOsc(Oscilloscope):
         # Fetch the data from the device after the device is already stopped again
         self._data_not_fetched_from_last_run = False
 
+        # whether the measurement data can be read via "libtiepie" directly (see _get_data_layout)
+        self._is_direct_retrieval_available = True
+
         # start the thread that continuously retrieves new measurement data while the oscilloscope is running
         self._new_data_retrieval_thread.start()
 
@@ -79,17 +88,10 @@ class TiepieOsc(Oscilloscope):
 
                     self._mutex_dev_access.release()
 
-                    points = {}
-                    min_voltage = None
-                    max_voltage = None
-
-                    frequency = [0]
-                    min_share = None
-                    max_share = None
-
                     # get the time vector from the oscilloscope
                     self._mutex_dev_access.acquire()
-                    time = self._osc.time_vector
+                    time_vector = self._osc.time_vector
+                    continuous = self._measure_mode == 'stream'
                     self._mutex_dev_access.release()
 
                     en_ch_numbers = []
@@ -101,57 +103,30 @@ class TiepieOsc(Oscilloscope):
                         if self._ch[i].is_enabled:
                             en_ch_numbers.append(i + 1)
                     if en_ch_numbers:
-                        raw_data = self._osc.retrieve(en_ch_numbers)
+                        start, raw_data = self._retrieve_raw_data(en_ch_numbers)
                     self._mutex_dev_access.release()
 
                     self._mutex_running.release()
 
                     if raw_data is not None:
-                        # convert the raw measurement data into QPoint arrays for each enabled channel
-                        # and save both the minimum & maximum value
-                        for i in range(len(en_ch_numbers)):
-                            raw_channel_data = raw_data[en_ch_numbers[i] - 1]
-
-                            # combine each element from the time vector and one channel's raw measurement data
-                            # into a QPoint
-                            current_norm_points = [QPointF(time[j], raw_channel_data[j]) for j in range(len(time))]
-
-                            # calculate FFT
-                            frequency, share = self.calculate_fft_points(time, raw_channel_data)
-                            current_fft_points = [QPointF(frequency[j], share[j]) for j in range(len(frequency))]
-
-                            # use the channel's number as key and the QPoint array tuple as value
-                            points[en_ch_numbers[i]] = (current_norm_points, current_fft_points)
-
-                            # set minimum and maximum across all channels
-                            if min_voltage is None and max_voltage is None:
-                                min_voltage = min(raw_channel_data)
-                                max_voltage = max(raw_channel_data)
-                            else:
-                                min_voltage = min(min_voltage, min(raw_channel_data))
-                                max_voltage = max(max_voltage, max(raw_channel_data))
-                            if min_share is None and max_share is None:
-                                min_share = min(share)
-                                max_share = max(share)
-                            else:
-                                min_share = min(min_share, min(share))
-                                max_share = max(max_share, max(share))
-
-                        lim_norm = {'Time': (time[0], time[-1]), 'Voltage': (min_voltage, max_voltage)}
-                        lim_fft = {'Frequency': (frequency[0], frequency[-1]), 'Share': (min_share, max_share)}
-
-                        self._mutex_data.acquire()
-
-                        # update the dictionaries containing
-                        # the latest measured data points and the minimum & maximum values
-                        self._points = points
-                        self._limits_norm = lim_norm
-                        self._limits_fft = lim_fft
-
-                        # indicate that new values have been retrieved from the oscilloscope
-                        self._new_data_available = True
-
-                        self._mutex_data.release()
+                        # omit the time vector's entries for invalid pre samples
+                        time_vector = time_vector[start:start + raw_data.shape[2]]
+
+                        # in case of a segmented measurement, pass all segments at once
+                        # (the library does not provide the segments' trigger timestamps)
+                        if len(raw_data) > 1:
+                            segments = {
+                                'Time': time_vector,
+                                'Data': {no: raw_data[:, i] for i, no in enumerate(en_ch_numbers)},
+                                'Timestamps': None
+                            }
+                            self._update_points({}, segments=segments)
+
+                        # otherwise, combine the time vector with each enabled channel's raw measurement data
+                        # and update the latest data points accordingly
+                        else:
+                            self._update_points(
+                                {no: (time_vector, raw_data[0, i]) for i, no in enumerate(en_ch_numbers)}, continuous)
 
                 else:
                     self._mutex_dev_access.release()
@@ -193,6 +168,102 @@ class TiepieOsc(Oscilloscope):
                 with self._cond_running:
                     self._cond_running.wait()
 
+    def _retrieve_raw_data(self, channel_numbers):
+        """
+        Retrieves the measurement data of the specified channels directly into a numpy array.
+
+        In contrast to the "handyscope" library's retrieving method, no intermediate Python lists are created.
+        In case of a segmented measurement, all segments stored in the oscilloscope's memory are read in one pass,
+        since the hardware captures them without any interaction in between.
+        If the data cannot be read directly (see _get_data_layout), the library's retrieving method is used instead.
+        The device access lock needs to be held while calling this method.
+
+        Args:
+            channel_numbers (list[int]):
+                The numbers of the channels to retrieve (all of which need to be enabled).
+
+        Returns:
+            (int, np.ndarray):
+                A tuple containing the index of the first valid sample (all previous pre samples are invalid) and
+                the measurement data as a 3-D array of the shape segments × channels × samples.
+        """
+        layout = self._get_data_layout()
+        if layout is None:
+            return self._retrieve_listed_data(channel_numbers)
+        dev_handle, start, sample_cnt = layout
+
+        # only block measurements can be segmented
+        seg_cnt = 1
+        if self._osc.measure_mode == 'block' and self._osc.is_trig_available:
+            seg_cnt = max(self._osc.segment_cnt, 1)
+
+        data = np.empty((seg_cnt, len(channel_numbers), sample_cnt), dtype=np.float32)
+
+        # each call of the library function provides the next segment's data
+        ch_cnt = max(channel_numbers)
+        pointer_array = libtiepie.HlpPointerArrayNew(ch_cnt)
+        for seg in range(seg_cnt):
+            for i, ch_no in enumerate(channel_numbers):
+                libtiepie.HlpPointerArraySet(pointer_array, ch_no - 1, data[seg, i].ctypes.data)
+            libtiepie.ScpGetData(dev_handle, pointer_array, ch_cnt, start, sample_cnt)
+        libtiepie.HlpPointerArrayDelete(pointer_array)
+
+        return start, data
+
+    def _retrieve_listed_data(self, channel_numbers):
+        """
+        Retrieves the measurement data of the specified channels via the "handyscope" library's retrieving method.
+
+        This is slower than reading the data directly, as the library creates Python lists first.
+        Furthermore, only a single segment of a segmented measurement is provided.
+        The device access lock needs to be held while calling this method.
+
+        Args:
+            channel_numbers (list[int]):
+                The numbers of the channels to retrieve (all of which need to be enabled).
+
+        Returns:
+            (int, np.ndarray):
+                A tuple containing the index of the first valid sample (all previous pre samples are invalid) and
+                the measurement data as a 3-D array of the shape 1 × channels × samples.
+        """
+        channel_data = self._osc.retrieve(channel_numbers)
+        data = np.array([[channel_data[no - 1] for no in channel_numbers]], dtype=np.float32)
+
+        # samples missing from the record are invalid pre samples at its beginning
+        start = max(self._osc.record_length - data.shape[2], 0)
+
+        return start, data
+
+    def _get_data_layout(self):
+        """
+        Provides what is needed to read the measurement data via "libtiepie" directly.
+
+        The "handyscope" library only returns the measurement data as Python lists,
+        so reading it into numpy arrays requires calling the underlying "libtiepie" function.
+        This function needs the device handle and the range of valid samples,
+        both of which the "handyscope" library only provides via private members.
+        They are only accessed here, so that a change of them in a future library version only affects this method:
+        if they are missing, this is reported once and the data is retrieved via the library's public method instead.
+        The device access lock needs to be held while calling this method.
+
+        Returns:
+            (int, int, int) or None:
+                A tuple containing the "libtiepie" device handle, the index of the first valid sample
+                and the number of samples to read, or None if the data cannot be read directly.
+        """
+        dev_handle = getattr(self._osc, '_dev_handle', None)
+        get_sample_cnts = getattr(self._osc, '_get_sample_cnts', None)
+        if dev_handle is None or get_sample_cnts is None:
+            if self._is_direct_retrieval_available:
+                self._is_direct_retrieval_available = False
+                print('The "handyscope" library does not allow reading the data of ' + self._id['Name'] +
+                      ' directly, falling back to its slower retrieving method.')
+            return None
+
+        start, sample_cnt = get_sample_cnts()
+        return dev_handle, start, sample_cnt
+
     def _term_deletion(self):
         self._osc.close()
 
@@ -277,9 +348,18 @@ class TiepieOsc(Oscilloscope):
 
         return success
 
+    def load_capabilities(self):
+        self.measure_modes_avail
+        self.auto_res_avail
+        self.res_avail
+        self.clock_src_avail
+        self.clock_outs_avail
+
     @property
     def measure_modes_avail(self):
         self._mutex_dev_access.acquire()
+        if self._measure_modes_avail is None:
+            self._measure_modes_avail = [self._special_measure_mode] + list(self._osc.measure_modes_available)
         result = self._measure_modes_avail
         self._mutex_dev_access.release()
 
@@ -309,9 +389,11 @@ class TiepieOsc(Oscilloscope):
     @property
     def auto_res_avail(self):
         self._mutex_dev_access.acquire()
+        if self._auto_res_avail is None:
+            self._auto_res_avail = self._osc.auto_resolutions_available
 
         # convert tuple into list
-        result = list(self._osc.auto_resolutions_available)
+        result = list(self._auto_res_avail)
 
         self._mutex_dev_access.release()
 
@@ -334,9 +416,11 @@ class TiepieOsc(Oscilloscope):
     @property
     def res_avail(self):
         self._mutex_dev_access.acquire()
+        if self._res_avail is None:
+            self._res_avail = self._osc.resolutions_available
 
         # convert tuple into list
-        result = list(self._osc.resolutions_available)
+        result = list(self._res_avail)
 
         self._mutex_dev_access.release()
 
@@ -415,9 +499,11 @@ class TiepieOsc(Oscilloscope):
     @property
     def clock_src_avail(self):
         self._mutex_dev_access.acquire()
+        if self._clock_src_avail is None:
+            self._clock_src_avail = self._osc.clock_sources_available
 
         # convert tuple into list
-        result = list(self._osc.clock_sources_available)
+        result = list(self._clock_src_avail)
 
         self._mutex_dev_access.release()
 
@@ -440,9 +526,11 @@ class TiepieOsc(Oscilloscope):
     @property
     def clock_outs_avail(self):
         self._mutex_dev_access.acquire()
+        if self._clock_outs_avail is None:
+            self._clock_outs_avail = self._osc.clock_outputs_available
 
         # convert tuple into list
-        result = list(self._osc.clock_outputs_available)
+        result = list(self._clock_outs_avail)
 
         self._mutex_dev_access.release()
 
@@ -1072,3 +1160,15 @@ class TiepieOscChannel(OscChannel):
 
             self._ch.trig_time = value
         self._mutex_dev_access.release()
+
+
+def list_connected_devices():
+    """
+    The list of all currently connected TiePie engineering devices.
+
+    Returns:
+        list[dict[str, str]]:
+            A list containing the shortened ID (name, serial number and type) of every connected device.
+    """
+    return [{'Name': dev['Name'], 'SerNo': str(dev['SerNo']), 'Type': 'OSC'}
+            for dev in handyscope.DeviceList().get_overview()]
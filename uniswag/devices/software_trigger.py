@@ -0,0 +1,210 @@
+import numpy as np
+
+
+class SoftwareTrigger:
+    def __init__(self):
+        """
+        A trigger that is evaluated in software on already acquired measurement data.
+
+        Scans the samples of a source channel for trigger events, aligns the data of all channels
+        to the found trigger positions and extracts one segment (with a fixed number of samples) per event.
+        Every scan is fully vectorized, so even records with several million samples are processed
+        within a fraction of a typical frame period.
+
+        Supported trigger kinds are rising and falling edges (with hysteresis),
+        entering and exiting a voltage window as well as positive pulses within a given width range.
+        For continuous (streaming) measurements, the tail of the previously scanned data is kept,
+        so that trigger events spanning two consecutive data blocks are still found.
+
+        Returns:
+            SoftwareTrigger:
+                A SoftwareTrigger object.
+        """
+        # a list of all available trigger kinds
+        self.kinds_avail = ['Off', 'Rising edge', 'Falling edge', 'Window enter', 'Window exit', 'Pulse width']
+
+        # the currently selected trigger kind ('Off' disables the software trigger)
+        self.kind = 'Off'
+
+        # the number of the channel whose samples are scanned for trigger events
+        self.src = 1
+
+        # the trigger level (lower bound in case of a window trigger) in volts
+        self.lvl = 0.0
+        # the upper bound of the voltage window in volts (only used by window triggers)
+        self.lvl_high = 1.0
+        # the voltage distance the signal needs to cross before the trigger is re-armed
+        self.hyst = 0.0
+
+        # the minimum and maximum width of a pulse in seconds (only used by pulse width triggers)
+        self.width_min = 0.0
+        self.width_max = np.inf
+
+        # the number of samples of each extracted segment
+        self.seg_len = 1000
+        # the share of each segment's samples that lie before the trigger position
+        self.pre_ratio = 0.5
+
+        # the maximum total number of samples that is extracted from a single scan (across all segments);
+        # if more trigger events are found, only the most recent ones are used
+        self.max_samples = 2 ** 22
+
+        # the most recent samples of the previous scan (per channel) in case of continuous measurements
+        self._history = None
+
+    @property
+    def is_enabled(self):
+        """
+        Whether a trigger kind other than 'Off' is selected.
+
+        Returns:
+            bool:
+                True if the software trigger is active, False otherwise.
+        """
+        return self.kind != 'Off'
+
+    def reset(self):
+        """
+        Discards the retained samples of previous continuous scans.
+        """
+        self._history = None
+
+    def scan(self, sample_period, channel_data, continuous=False):
+        """
+        Searches the source channel's samples for trigger events and extracts aligned segments from all channels.
+
+        Channels whose sample count differs from the one of the source channel are ignored.
+
+        Args:
+            sample_period (float):
+                The time in seconds between two consecutive samples.
+            channel_data (dict[int, np.ndarray]):
+                A dictionary with the channel numbers as keys and the voltage vectors as values.
+            continuous (bool):
+                Whether the passed data directly follows the data of the previous scan (streaming measurements).
+                If so, the retained samples of the previous scan are prepended before searching.
+
+        Returns:
+            (np.ndarray, dict[int, np.ndarray], np.ndarray) or None:
+                A tuple of the segment time vector (with the trigger positions at zero),
+                a dictionary with the channel numbers as keys and 2-D arrays (segments × samples) as values
+                and the trigger positions in seconds relative to the end of the passed data (negative values).
+                None if the source channel is not contained in the passed data.
+        """
+        if self.src not in channel_data:
+            self._history = None
+            return None
+
+        seg_len = max(int(self.seg_len), 2)
+        pre = min(max(int(round(self.pre_ratio * seg_len)), 0), seg_len - 1)
+        post = seg_len - pre
+
+        src_len = len(channel_data[self.src])
+        data = {no: np.asarray(vec, dtype=float) for no, vec in channel_data.items() if len(vec) == src_len}
+
+        # prepend the samples retained from the previous scan
+        first_valid = 0
+        if continuous and self._history is not None and self._history.keys() == data.keys():
+            history_len = len(self._history[self.src])
+            data = {no: np.concatenate((self._history[no], vec)) for no, vec in data.items()}
+
+            # trigger events up to this position have already been extracted in the previous scan
+            first_valid = history_len - post + 1
+
+        # keep the tail of the scanned data for the next scan
+        if continuous:
+            self._history = {no: vec[-seg_len:].copy() for no, vec in data.items()}
+        else:
+            self._history = None
+
+        triggers = self.find_triggers(data[self.src], sample_period)
+
+        # only keep trigger events whose segments lie entirely within the scanned data
+        n = len(data[self.src])
+        triggers = triggers[(triggers >= max(pre, first_valid)) & (triggers <= n - post)]
+
+        # limit the number of extracted segments
+        max_segments = max(self.max_samples // seg_len, 1)
+        triggers = triggers[-max_segments:]
+
+        # a 2-D index array with one row of sample indices per segment
+        indices = triggers[:, np.newaxis] + np.arange(-pre, post)
+
+        segment_time = np.arange(-pre, post) * sample_period
+        segments = {no: vec[indices] for no, vec in data.items()}
+        trigger_times = (triggers - n) * sample_period
+
+        return segment_time, segments, trigger_times
+
+    def find_triggers(self, samples, sample_period):
+        """
+        Determines the positions of all trigger events in the passed voltage vector.
+
+        Args:
+            samples (np.ndarray):
+                The voltage vector to scan.
+            sample_period (float):
+                The time in seconds between two consecutive samples.
+
+        Returns:
+            np.ndarray:
+                The indices of the samples at which trigger events occur.
+        """
+        hyst = abs(self.hyst)
+        low = min(self.lvl, self.lvl_high)
+        high = max(self.lvl, self.lvl_high)
+
+        if self.kind == 'Rising edge':
+            return self._edges(samples >= self.lvl, samples < self.lvl - hyst)
+        elif self.kind == 'Falling edge':
+            return self._edges(samples <= self.lvl, samples > self.lvl + hyst)
+        elif self.kind == 'Window enter':
+            inside = (samples >= low) & (samples <= high)
+            return self._edges(inside, (samples < low - hyst) | (samples > high + hyst))
+        elif self.kind == 'Window exit':
+            outside = (samples < low) | (samples > high)
+            return self._edges(outside, (samples >= low + hyst) & (samples <= high - hyst))
+        elif self.kind == 'Pulse width':
+            rising = self._edges(samples >= self.lvl, samples < self.lvl - hyst)
+            falling = self._edges(samples <= self.lvl, samples > self.lvl + hyst)
+
+            # pair every rising edge with the next falling edge
+            next_falling = np.searchsorted(falling, rising)
+            paired = next_falling < len(falling)
+            rising = rising[paired]
+            width = (falling[next_falling[paired]] - rising) * sample_period
+
+            return rising[(width >= self.width_min) & (width <= self.width_max)]
+        else:
+            return np.empty(0, dtype=np.intp)
+
+    @staticmethod
+    def _edges(fire, arm):
+        """
+        Determines the positions at which the "fire" condition becomes true while the trigger is armed.
+
+        The trigger is armed by any sample that fulfills the "arm" condition and disarmed by each trigger event.
+        Both conditions must be mutually exclusive.
+
+        Args:
+            fire (np.ndarray):
+                A boolean vector which is True for each sample that lies beyond the trigger level.
+            arm (np.ndarray):
+                A boolean vector which is True for each sample that lies beyond the re-arming level (hysteresis).
+
+        Returns:
+            np.ndarray:
+                The indices of the samples at which trigger events occur.
+        """
+        # the positions at which the signal enters the "fire" resp. "arm" region
+        candidates = np.flatnonzero(fire[1:] & ~fire[:-1]) + 1
+        arm_starts = np.flatnonzero(arm[1:] & ~arm[:-1]) + 1
+        if len(arm) and arm[0]:
+            arm_starts = np.concatenate(([0], arm_starts))
+
+        # a candidate is a valid trigger event if the signal has entered the "arm" region
+        # since the previous candidate (the samples inbetween never lie within the "fire" region)
+        previous = np.concatenate(([-1], candidates[:-1]))
+        armed = np.searchsorted(arm_starts, candidates) > np.searchsorted(arm_starts, previous, side='right')
+
+        return candidates[armed]
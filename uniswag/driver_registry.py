@@ -0,0 +1,399 @@
+import importlib
+import importlib.metadata
+import sys
+import threading
+import time
+
+
+# the entry point group under which installed packages provide their drivers
+ENTRY_POINT_GROUP = 'uniswag.drivers'
+
+# marks references which have not been resolved yet (None being a valid attribute value)
+_UNRESOLVED = object()
+
+
+class Driver:
+    def __init__(self, vendor, vendor_matchers, device_lists, device_classes, visa_manufacturers=(),
+                 detection_backoff=(0.05, 0.5)):
+        """
+        Describes how the devices of a vendor are detected and which classes control them.
+
+        The functions and classes are given as references of the form "module:attribute",
+        so that neither the driver modules nor the vendor libraries they depend on are imported
+        before a device of the vendor is actually plugged in.
+
+        Drivers are provided by installed packages as entry points of the group "uniswag.drivers",
+        each one referring to a Driver object (or a function returning one).
+
+        Args:
+            vendor (str):
+                The name of the vendor, as used in the devices' IDs.
+            vendor_matchers (list[str]):
+                The vendor information reported by the OS for the vendor's USB devices
+                (e.g. the manufacturer's name or the USB vendor ID).
+            device_lists (list[str]):
+                References to functions which return the vendor's currently connected devices,
+                each one as a dictionary with the keys 'Name', 'SerNo' and 'Type' ('OSC' or 'GEN').
+            device_classes (dict[str, list[str]]):
+                References to the classes which are instantiated per connected device, mapped to the device type.
+                Oscilloscope classes receive the name, serial number and "device stopped" callback function,
+                generator classes the name and serial number.
+            visa_manufacturers (list[str]):
+                The manufacturer names the vendor's devices report via VISA (used on Windows only).
+            detection_backoff ((float, float)):
+                The delay in seconds before the second attempt to detect a newly plugged in device and
+                the maximum delay between two attempts.
+
+        Returns:
+            Driver:
+                A Driver object.
+        """
+        self.vendor = vendor
+        self.vendor_matchers = list(vendor_matchers)
+        self.device_lists = list(device_lists)
+        self.device_classes = {dev_type: list(classes) for dev_type, classes in device_classes.items()}
+        self.visa_manufacturers = list(visa_manufacturers)
+        self.detection_backoff = tuple(detection_backoff)
+
+
+# the drivers of all natively supported vendors
+# (declared as entry points in setup.py, but also used directly when running from a source checkout)
+TIEPIE_DRIVER = Driver('Tiepie', ['TiePie engineering'],
+                       ['uniswag.devices.oscilloscopes.tiepie_osc:list_connected_devices'],
+                       {'OSC': ['uniswag.devices.oscilloscopes.tiepie_osc:TiepieOsc',
+                                'uniswag.devices.generators.tiepie_gen:TiepieGen']},
+                       detection_backoff=(0.02, 0.5))
+KEYSIGHT_DRIVER = Driver('Keysight', ['Keysight_Technologies'],
+                         ['uniswag.devices.oscilloscopes.keysight_osc:list_connected_devices'],
+                         {'OSC': ['uniswag.devices.oscilloscopes.keysight_osc:KeysightOsc']},
+                         visa_manufacturers=['KEYSIGHT TECHNOLOGIES'])
+TEKTRONIX_DRIVER = Driver('Tektronix', ['0699'],
+                          ['uniswag.devices.generators.tektronix_gen:list_connected_devices',
+                           'uniswag.devices.oscilloscopes.tektronix_osc:list_connected_devices'],
+                          {'OSC': ['uniswag.devices.oscilloscopes.tektronix_osc:TektronixOsc'],
+                           'GEN': ['uniswag.devices.generators.tektronix_gen:TektronixGen']},
+                          visa_manufacturers=['TEKTRONIX'])
+# (Hantek devices need to load their firmware & re-enumerate first)
+HANTEK_DRIVER = Driver('Hantek', ['Cypress Semiconductor Corp.', 'OpenHantek'],
+                       ['uniswag.devices.oscilloscopes.hantek_osc:list_connected_devices'],
+                       {'OSC': ['uniswag.devices.oscilloscopes.hantek_osc:HantekOsc']},
+                       detection_backoff=(0.2, 1.0))
+
+BUILTIN_DRIVERS = [TIEPIE_DRIVER, KEYSIGHT_DRIVER, TEKTRONIX_DRIVER, HANTEK_DRIVER]
+
+
+def load_entry_point_drivers():
+    """
+    Loads the drivers that installed packages provide as entry points of the group "uniswag.drivers".
+
+    Entry points which cannot be loaded or do not provide a Driver object are skipped.
+
+    Returns:
+        list[Driver]:
+            The drivers in the order of the entry points.
+    """
+    try:
+        entry_points = importlib.metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        # Python < 3.10 returns all entry points, grouped in a dictionary
+        entry_points = importlib.metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+
+    drivers = []
+    for entry_point in entry_points:
+        try:
+            driver = entry_point.load()
+            if callable(driver) and not isinstance(driver, Driver):
+                driver = driver()
+        except Exception as e:
+            print('Could not load the driver "' + entry_point.name + '": ' + str(e))
+            continue
+
+        if isinstance(driver, Driver):
+            drivers.append(driver)
+        else:
+            print('The entry point "' + entry_point.name + '" does not provide a driver.')
+
+    return drivers
+
+
+class DriverRegistry:
+    def __init__(self, drivers=None):
+        """
+        Provides the drivers of all supported vendors and imports their modules on first use.
+
+        The vendor of a USB device is looked up by its vendor information in a single dictionary
+        containing the matchers of all drivers.
+        The time needed for every deferred import is recorded, so that it can be reported.
+
+        Args:
+            drivers (list[Driver] or None):
+                The drivers to register.
+                By default, these are the built-in drivers and the drivers of all installed packages
+                (see load_entry_point_drivers), the latter replacing built-in drivers of the same vendor.
+
+        Returns:
+            DriverRegistry:
+                A DriverRegistry object.
+        """
+        # the registered drivers, mapped to their vendors
+        self._drivers = {}
+
+        # the vendors of the registered drivers, mapped to their vendor matchers and VISA manufacturer names
+        self._matchers = {}
+        self._visa_manufacturers = {}
+
+        # the resolved functions and classes, mapped to their references
+        self._resolved = {}
+
+        # the time in seconds each deferred import took, mapped to the module name
+        self._import_times = {}
+
+        # the vendors whose driver modules (or vendor libraries) could not be imported, mapped to the error
+        self._unavailable = {}
+
+        # a threading lock which protects the dictionaries above (but is never held during an import)
+        self._mutex_resolve = threading.Lock()
+
+        # threading locks which ensure that every module is only imported once, mapped to the module name
+        # (so that the drivers of different vendors can be imported concurrently)
+        self._module_locks = {}
+
+        if drivers is None:
+            drivers = BUILTIN_DRIVERS + load_entry_point_drivers()
+        for driver in drivers:
+            self.register(driver)
+
+    @property
+    def vendors(self):
+        """
+        The vendors of all registered drivers.
+
+        Returns:
+            list[str]:
+                The names of the vendors.
+        """
+        return list(self._drivers)
+
+    @property
+    def visa_vendors(self):
+        """
+        The vendors of all registered drivers whose devices can be detected via VISA.
+
+        Returns:
+            list[str]:
+                The names of the vendors.
+        """
+        return [vendor for vendor, driver in self._drivers.items() if driver.visa_manufacturers]
+
+    @property
+    def import_times(self):
+        """
+        The time each deferred import of a driver module (including the vendor library) took.
+
+        Returns:
+            dict[str, float]:
+                A dictionary with the module names as keys and the import durations in seconds as values.
+        """
+        self._mutex_resolve.acquire()
+        result = dict(self._import_times)
+        self._mutex_resolve.release()
+
+        return result
+
+    @property
+    def unavailable(self):
+        """
+        The vendors whose drivers could not be loaded (e.g. due to a missing vendor library).
+
+        Returns:
+            dict[str, str]:
+                A dictionary with the names of the vendors as keys and the error messages as values.
+        """
+        self._mutex_resolve.acquire()
+        result = dict(self._unavailable)
+        self._mutex_resolve.release()
+
+        return result
+
+    def register(self, driver):
+        """
+        Registers a driver, replacing any previously registered driver of the same vendor.
+
+        Args:
+            driver (Driver):
+                The driver to register.
+        """
+        replaced = self._drivers.get(driver.vendor)
+        if replaced is not None:
+            for matcher in replaced.vendor_matchers:
+                self._matchers.pop(matcher, None)
+            for manufacturer in replaced.visa_manufacturers:
+                self._visa_manufacturers.pop(manufacturer, None)
+
+        self._drivers[driver.vendor] = driver
+        self._unavailable.pop(driver.vendor, None)
+        for matcher in driver.vendor_matchers:
+            self._matchers[matcher] = driver.vendor
+        for manufacturer in driver.visa_manufacturers:
+            self._visa_manufacturers[manufacturer] = driver.vendor
+
+    def get(self, vendor):
+        """
+        The driver of the given vendor.
+
+        Args:
+            vendor (str):
+                The name of the vendor.
+
+        Returns:
+            Driver or None:
+                The driver, or None if no driver of the vendor is registered.
+        """
+        return self._drivers.get(vendor)
+
+    def match(self, dev_vendor_info):
+        """
+        Determines the vendor of a USB device.
+
+        Args:
+            dev_vendor_info (list[str]):
+                All available information on the device vendor.
+
+        Returns:
+            str or None:
+                The name of the vendor, or None if no registered driver matches the device.
+        """
+        for info in dev_vendor_info:
+            vendor = self._matchers.get(info)
+            if vendor is not None:
+                return vendor
+
+        return None
+
+    def match_visa(self, manufacturer):
+        """
+        Determines the vendor of a VISA device.
+
+        Args:
+            manufacturer (str):
+                The manufacturer name reported by the device's identification.
+
+        Returns:
+            str or None:
+                The name of the vendor, or None if no registered driver matches the device.
+        """
+        return self._visa_manufacturers.get(manufacturer)
+
+    def list_devices(self, vendor):
+        """
+        The functions which list the currently connected devices of the given vendor.
+
+        Imports the driver's modules if necessary.
+
+        Args:
+            vendor (str):
+                The name of the vendor.
+
+        Returns:
+            list[function]:
+                The functions, each returning a list of dictionaries with the keys 'Name', 'SerNo' and 'Type'
+                (empty if the driver could not be loaded).
+        """
+        return self._resolve_driver(vendor, self._drivers[vendor].device_lists)
+
+    def device_classes(self, vendor, dev_type):
+        """
+        The classes which are instantiated for a connected device of the given vendor and type.
+
+        Imports the driver's modules if necessary.
+
+        Args:
+            vendor (str):
+                The name of the vendor.
+            dev_type (str):
+                The type of the device ('OSC' or 'GEN').
+
+        Returns:
+            list[type]:
+                The "Oscilloscope" and/or "Generator" subclasses (empty if the driver could not be loaded).
+        """
+        return self._resolve_driver(vendor, self._drivers[vendor].device_classes.get(dev_type, []))
+
+    def _resolve_driver(self, vendor, references):
+        """
+        Resolves the given references of a vendor's driver.
+
+        If any of them cannot be imported (e.g. since the vendor library or one of its native dependencies
+        is missing), the error is reported once and the driver is marked as unavailable,
+        so that the devices of this vendor are ignored from then on.
+
+        Args:
+            vendor (str):
+                The name of the vendor.
+            references (list[str]):
+                The references to resolve (see resolve).
+
+        Returns:
+            list[Any]:
+                The referenced attributes, or an empty list if the driver is unavailable.
+        """
+        if vendor in self._unavailable:
+            return []
+
+        try:
+            return [self.resolve(reference) for reference in references]
+        except Exception as e:
+            self._mutex_resolve.acquire()
+            is_reported = vendor in self._unavailable
+            self._unavailable[vendor] = str(e)
+            self._mutex_resolve.release()
+
+            if not is_reported:
+                print('Could not load the driver of ' + vendor + ': ' + str(e))
+            return []
+
+    def resolve(self, reference):
+        """
+        Imports the module of the given reference (if not yet imported) and returns the referenced attribute.
+
+        Args:
+            reference (str):
+                A reference of the form "module:attribute" (the attribute may contain dots)
+                or just the module name.
+
+        Returns:
+            Any:
+                The referenced attribute or module.
+        """
+        self._mutex_resolve.acquire()
+        result = self._resolved.get(reference, _UNRESOLVED)
+        module_name, _, attribute = reference.partition(':')
+        module_lock = self._module_locks.setdefault(module_name, threading.Lock())
+        self._mutex_resolve.release()
+
+        if result is not _UNRESOLVED:
+            return result
+
+        # only the import of the same module is waited for, the global lock is released meanwhile
+        module_lock.acquire()
+
+        try:
+            # import the module and record the time it took (if it was not imported elsewhere before)
+            is_imported = module_name in sys.modules
+            start = time.perf_counter()
+            result = importlib.import_module(module_name)
+            duration = time.perf_counter() - start
+
+            if attribute:
+                for name in attribute.split('.'):
+                    result = getattr(result, name)
+        finally:
+            module_lock.release()
+
+        self._mutex_resolve.acquire()
+        if not is_imported:
+            self._import_times[module_name] = duration
+        result = self._resolved.setdefault(reference, result)
+        self._mutex_resolve.release()
+
+        return result
@@ -0,0 +1,222 @@
+import concurrent.futures
+import threading
+
+import numpy as np
+import scipy.signal
+
+
+def goertzel(samples, sample_period, freq):
+    """
+    Calculates the complex amplitude of a single frequency within the passed samples (single-bin DFT).
+
+    Uses the Goertzel algorithm, which (unlike an FFT) only evaluates the frequency of interest
+    and does not require it to lie on the FFT's frequency grid.
+    In order to minimize spectral leakage, only the largest whole number of signal periods is evaluated.
+
+    Args:
+        samples (np.ndarray):
+            The voltage vector, or a 2-D array with one voltage vector per row.
+        sample_period (float):
+            The time in seconds between two consecutive samples.
+        freq (float):
+            The frequency of interest in hertz.
+
+    Returns:
+        complex or np.ndarray:
+            The complex amplitude (peak value and phase relative to the first sample) per voltage vector.
+    """
+    samples = np.asarray(samples, dtype=float)
+
+    # evaluate a whole number of periods if the samples contain at least one
+    sample_cnt = samples.shape[-1]
+    period_cnt = np.floor(sample_cnt * sample_period * freq)
+    if period_cnt >= 1:
+        sample_cnt = min(max(int(round(period_cnt / (freq * sample_period))), 2), sample_cnt)
+    samples = samples[..., :sample_cnt]
+
+    # the Goertzel recurrence s[n] = x[n] + 2 cos(w) s[n-1] - s[n-2] as a (compiled) IIR filter
+    omega = 2 * np.pi * freq * sample_period
+    state = scipy.signal.lfilter([1.0], [1.0, -2 * np.cos(omega), 1.0], samples, axis=-1)
+
+    # the DFT term with respect to the last sample, shifted to the first one
+    result = state[..., -1] - np.exp(-1j * omega) * state[..., -2]
+    result *= np.exp(-1j * omega * (sample_cnt - 1))
+
+    return 2 * result / sample_cnt
+
+
+class FrequencyResponse:
+    def __init__(self, gen_channel, oscilloscope, ref_ch_no, resp_ch_no, frequencies, settle_frames=1, timeout=5.0,
+                 point_callback=None, finished_callback=None):
+        """
+        Measures the frequency response (gain & phase) between two oscilloscope channels,
+        stimulated by a signal generator channel.
+
+        For each frequency, the generator's frequency is set and the first oscilloscope frame
+        that was entirely measured afterwards is used, which is determined via the oscilloscope's frame numbers
+        instead of fixed delays.
+        Gain and phase are calculated from the complex amplitudes of the generator frequency
+        in the response and the reference channel (see goertzel).
+        The analysis of a frame runs in a separate thread, so that the next frequency is already set meanwhile.
+
+        Args:
+            gen_channel (uniswag.devices.generator.GenChannel):
+                The generator channel providing the stimulus.
+            oscilloscope (uniswag.devices.oscilloscope.Oscilloscope):
+                The (running) oscilloscope measuring the reference and the response.
+            ref_ch_no (int):
+                The number of the oscilloscope channel measuring the stimulus (reference).
+            resp_ch_no (int):
+                The number of the oscilloscope channel measuring the response.
+            frequencies (Any):
+                The vector of the frequencies to measure in hertz.
+            settle_frames (int):
+                The number of frames that are discarded after changing the frequency
+                (the first one might have been started before the change).
+            timeout (float):
+                The maximum time in seconds to wait for a frame, the frequency is skipped afterwards.
+            point_callback (function):
+                A function which is invoked after each analyzed frequency with
+                its index, the frequency, the gain and the phase in degrees as arguments.
+            finished_callback (function):
+                A function which is invoked with the results (see results) after the measurement
+                is finished or stopped.
+
+        Returns:
+            FrequencyResponse:
+                A FrequencyResponse object.
+        """
+        self._gen_ch = gen_channel
+        self._osc = oscilloscope
+        self._ref_ch_no = ref_ch_no
+        self._resp_ch_no = resp_ch_no
+        self._settle_frames = max(int(settle_frames), 0)
+        self._timeout = timeout
+        self._point_callback = point_callback
+        self._finished_callback = finished_callback
+
+        # the measured frequencies (as actually set by the generator), gains and phases (NaN if not yet measured)
+        self._frequencies = np.asarray(frequencies, dtype=float).copy()
+        self._gains = np.full(len(self._frequencies), np.nan)
+        self._phases = np.full(len(self._frequencies), np.nan)
+
+        # a threading lock which ensures thread-safe access to the results
+        self._mutex_results = threading.Lock()
+
+        # the thread running the measurement and the event that stops it
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_running(self):
+        """
+        Indicates, whether the measurement is currently being run.
+
+        Returns:
+            bool:
+                True if the measurement is running, False otherwise.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def results(self):
+        """
+        The results of the measurement so far.
+
+        Returns:
+            dict[str, np.ndarray]:
+                A dictionary with the keys 'Frequency' (in hertz), 'Gain' (as ratio) and 'Phase' (in degrees),
+                each containing a vector with one value per frequency (NaN if not measured).
+        """
+        self._mutex_results.acquire()
+        result = {'Frequency': self._frequencies.copy(), 'Gain': self._gains.copy(), 'Phase': self._phases.copy()}
+        self._mutex_results.release()
+
+        return result
+
+    def start(self):
+        """
+        Starts the measurement in a separate thread.
+
+        Has no effect if the measurement is already running.
+        """
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stops the measurement after the current frequency.
+        """
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self):
+        """
+        Sets each frequency, waits for the first frame measured afterwards and hands it over to the analysis.
+        """
+        # a generator sweep would interfere with the measurement
+        self._gen_ch.stop_sequence()
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        for i, freq in enumerate(self._frequencies):
+            if self._stop_event.is_set():
+                break
+
+            self._gen_ch.freq = float(freq)
+
+            # frames completed after this point might still have been started before the change
+            frame_id = self._osc.retrieve()['Frame'] + self._settle_frames
+            actual_freq = self._gen_ch.freq
+
+            frame = self._osc.wait_for_frame(frame_id, self._timeout)
+            if frame is None:
+                continue
+
+            # analyze the frame while the next frequency is set
+            executor.submit(self._analyze, i, actual_freq, frame['Points'])
+
+        executor.shutdown(wait=True)
+
+        if self._finished_callback is not None:
+            self._finished_callback(self.results)
+
+    def _analyze(self, index, freq, points):
+        """
+        Calculates gain & phase of a single frequency from the data points of an oscilloscope frame.
+
+        Args:
+            index (int):
+                The index of the frequency.
+            freq (float):
+                The frequency in hertz.
+            points (dict[int, ((np.ndarray, np.ndarray), (np.ndarray, np.ndarray))]):
+                The frame's data points, as provided by the oscilloscope's retrieving method.
+        """
+        if self._ref_ch_no not in points or self._resp_ch_no not in points:
+            return
+
+        time_vector, ref = points[self._ref_ch_no][0]
+        resp = points[self._resp_ch_no][0][1]
+        length = min(len(time_vector), len(ref), len(resp))
+        if length < 2:
+            return
+
+        sample_period = (time_vector[length - 1] - time_vector[0]) / (length - 1)
+        ref_amp, resp_amp = goertzel(np.vstack((ref[:length], resp[:length])), sample_period, freq)
+
+        gain = np.abs(resp_amp) / np.abs(ref_amp) if ref_amp != 0 else np.nan
+        phase = np.degrees(np.angle(resp_amp * np.conj(ref_amp)))
+
+        self._mutex_results.acquire()
+        self._frequencies[index] = freq
+        self._gains[index] = gain
+        self._phases[index] = phase
+        self._mutex_results.release()
+
+        if self._point_callback is not None:
+            self._point_callback(index, freq, gain, phase)
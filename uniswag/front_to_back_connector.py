@@ -1,15 +1,18 @@
-import csv
 import os
 import threading
 import time
 
+import numpy as np
 from PySide6 import QtCore, QtCharts
-from PySide6.QtCore import QPointF
 from PySide6.QtGui import QColor
 from PySide6.QtQuick import QQuickItemGrabResult
 
+from uniswag.data_export import collect_metadata, write_csv, write_hdf5, write_npz, write_parquet
 from uniswag.device_manager import DeviceManager
 from uniswag.devices.oscilloscopes.math_osc import MathOsc
+from uniswag.frequency_response import FrequencyResponse
+from uniswag.persistence_image_provider import PersistenceImageProvider
+from uniswag.waveform_accumulator import WaveformAccumulator
 
 
 # noinspection PyCallingNonCallable
@@ -26,6 +29,7 @@ class FrontToBackConnector(QtCore.QObject):
     reloadMathChProp = QtCore.Signal('QVariantMap', int)
     addSeries = QtCore.Signal(QColor)
     isRunning = QtCore.Signal('QVariantMap', bool)
+    persistenceUpdated = QtCore.Signal(bool)
 
     def __init__(self):
         """
@@ -71,6 +75,11 @@ class FrontToBackConnector(QtCore.QObject):
         # how much smaller the respective graph's values can become before the axis limits are adjusted
         self._axis_range_tolerance = 0.1
 
+        # accumulates the measurement data of all enabled channels (averaging or persistence)
+        self._accumulator = WaveformAccumulator()
+        # provides the rendered persistence image to frontend
+        self.persistence_image_provider = PersistenceImageProvider()
+
         # the series of the diagram that displays the currently selected device's generated signal
         # ("series" objects can hold a series of data points)
         self.preview_series = None
@@ -132,6 +141,9 @@ class FrontToBackConnector(QtCore.QObject):
         # a list of non-alphanumeric characters that are allowed for use in the file names of exported measurement data
         self._allowed_file_name_chars = [' ', '&', '(', ')', '=', '+', '~', '#', ',', ';', '-', '_']
 
+        # the currently (or most recently) run frequency response measurement
+        self._freq_response = None
+
     def _get_file_prefix(self):
         """
         Returns a string that represents the absolute file path to the "uniswag_exports" folder
@@ -173,18 +185,134 @@ class FrontToBackConnector(QtCore.QObject):
 
         One file per graph, with the file name format being the following:
         Date_Time_DeviceID_ChannelNumber_GraphType.csv
-        Blocks chart updates and oscilloscope channel enabling/disabling during execution (and vice versa).
+        In case of a segmented measurement, all segments of a channel are additionally saved to a single file.
+        Chart updates and oscilloscope channel enabling/disabling are only blocked while the data is collected,
+        the files are written afterwards.
         """
         # define the file prefix (first part of the file name) based on the current date/time and absolute file path
         file_prefix = self._get_file_prefix()
 
-        # iterate through all oscilloscopes where at least 1 channel is set to "visible"
+        for device_id, retrieved_vals, _ in self._collect_visible_osc_data():
+
+            # iterate through measurement data by channels
+            for channel_data in retrieved_vals['Points'].items():
+
+                # get the channel number
+                channel_no = str(channel_data[0])
+
+                # the first graph in a channel's data set is always the raw measurement data
+                graph_type = 'Norm'
+
+                # iterate through the channel data by graphs (raw measurement graph & FFT graph)
+                for data_list in channel_data[1]:
+
+                    # create a separate file per graph
+                    file_name = file_prefix + '_' + device_id + '_' + channel_no + '_' + graph_type
+                    write_csv(file_name + '.csv', [['X', 'Y']], [data_list[0], data_list[1]])
+
+                    # the next graph in the channel's data set is the FFT graph
+                    graph_type = 'FFT'
+
+            # in case of a segmented measurement, additionally write all segments of each channel as one block
+            segments = retrieved_vals['Segments']
+            if segments is not None:
+                for channel_no, data in segments['Data'].items():
+                    file_name = file_prefix + '_' + device_id + '_' + str(channel_no) + '_Segments'
+
+                    # the header's second row contains each segment's timestamp (if available),
+                    # afterwards, one row per sample follows with the time in the first column
+                    # and one column per segment
+                    header = [['X'] + ['Y' + str(i + 1) for i in range(len(data))]]
+                    if segments['Timestamps'] is not None:
+                        header.append(['Timestamp'] + [repr(float(timestamp)) for timestamp in segments['Timestamps']])
+                    write_csv(file_name + '.csv', header, [segments['Time']] + list(data))
+
+    @QtCore.Slot()
+    def save_as_npz(self):
+        """
+        Saves the data points currently visible in the oscilloscope measurement and FFT charts to compressed NPZ files.
+
+        The actual process of writing data to file is delegated to a separate thread.
+        """
+        thread = threading.Thread(target=self._save_as_binary_thread, args=['npz', write_npz], daemon=True)
+        thread.start()
+
+    @QtCore.Slot()
+    def save_as_hdf5(self):
+        """
+        Saves the data points currently visible in the oscilloscope measurement and FFT charts to HDF5 files.
+
+        The actual process of writing data to file is delegated to a separate thread.
+        """
+        thread = threading.Thread(target=self._save_as_binary_thread, args=['h5', write_hdf5], daemon=True)
+        thread.start()
+
+    @QtCore.Slot()
+    def save_as_parquet(self):
+        """
+        Saves the data points currently visible in the oscilloscope measurement and FFT charts to Parquet files.
+
+        The actual process of writing data to file is delegated to a separate thread.
+        """
+        thread = threading.Thread(target=self._save_as_binary_thread, args=['parquet', write_parquet], daemon=True)
+        thread.start()
+
+    def _save_as_binary_thread(self, file_extension, write_func):
+        """
+        Saves the data points currently visible in the oscilloscope measurement and FFT charts to binary files.
+
+        One file per oscilloscope (containing all channels' graphs and the oscilloscope's settings as metadata),
+        with the file name format being the following:
+        Date_Time_DeviceID.FileExtension
+        Chart updates and oscilloscope channel enabling/disabling are only blocked while the data is collected,
+        the files are written afterwards.
+
+        Args:
+            file_extension (str):
+                The extension of the files to write (without the leading dot).
+            write_func (function):
+                The function which writes a single file, receiving the file name,
+                the retrieved measurement data and the metadata as arguments.
+        """
+        # define the file prefix (first part of the file name) based on the current date/time and absolute file path
+        file_prefix = self._get_file_prefix()
+
+        for device_id, retrieved_vals, metadata in self._collect_visible_osc_data():
+            try:
+                write_func(file_prefix + '_' + device_id + '.' + file_extension, retrieved_vals, metadata)
+            except ImportError as e:
+                print('Could not export as ' + file_extension.upper() + ': ' + str(e))
+                return
+
+    def _collect_visible_osc_data(self):
+        """
+        Retrieves the measurement data and settings of all oscilloscopes where at least 1 channel is set to "visible".
+
+        Blocks chart updates and oscilloscope channel enabling/disabling while the measurement data is retrieved
+        (and vice versa), but not while the settings are read from the devices.
+        As the retrieved arrays are never modified in place, no copies are necessary.
+
+        Returns:
+            list[(str, dict[str, Any], dict[str, Any])]:
+                A list containing a tuple per oscilloscope, consisting of its ID (usable as part of a file name),
+                its retrieved measurement data and its metadata.
+        """
+        retrieved = []
+
         self._mutex_osc_visibility.acquire()
-        for visible_osc in self._visible_oscs.values():
+        try:
+            for visible_osc in self._visible_oscs.values():
+                # get the Oscilloscope object and retrieve its measurement data
+                device = visible_osc['Device']
+                retrieved.append((device, device.retrieve(), time.time()))
+        finally:
+            self._mutex_osc_visibility.release()
+
+        snapshots = []
+        for device, retrieved_vals, timestamp in retrieved:
 
-            # get the Oscilloscope object and retrieve its measurement data
-            device = visible_osc['Device']
-            retrieved_vals = device.retrieve()
+            # read the settings (which may involve device round trips) without blocking the chart updates
+            metadata = collect_metadata(device, timestamp)
 
             # get the oscilloscope's ID
             device_id_raw = device.id['Vendor'] + '_' + device.id['Name'] + '_' + device.id['SerNo']
@@ -195,34 +323,90 @@ class FrontToBackConnector(QtCore.QObject):
                 else:
                     device_id += '_'
 
-            # iterate through measurement data by channels
-            for channel_data in retrieved_vals['Points'].items():
+            snapshots.append((device_id, retrieved_vals, metadata))
 
-                # get the channel number
-                channel_no = str(channel_data[0])
+        return snapshots
 
-                # the first graph in a channel's data set is always the raw measurement data
-                graph_type = 'Norm'
+    @QtCore.Slot(float, float, int)
+    def measure_frequency_response(self, freq_start, freq_stop, point_cnt):
+        """
+        Measures the frequency response between the first two enabled channels of the selected oscilloscope,
+        stimulated by the selected generator channel, and saves the results to a CSV file.
 
-                # iterate through the channel data by graphs (raw measurement graph & FFT graph)
-                for data_list in channel_data[1]:
+        The first channel measures the stimulus (reference), the second one the response.
+        The frequencies are spaced logarithmically.
+        The actual measurement is delegated to a separate thread.
 
-                    # create and open a separate file per graph
-                    file_name = file_prefix + '_' + device_id + '_' + channel_no + '_' + graph_type
-                    with open(file_name + '.csv', 'w') as opened_file:
-                        csv_w = csv.writer(opened_file)
+        Args:
+            freq_start (float):
+                The first frequency in hertz.
+            freq_stop (float):
+                The last frequency in hertz.
+            point_cnt (int):
+                The number of frequencies to measure.
+        """
+        thread = threading.Thread(target=self._measure_frequency_response_thread,
+                                  args=[freq_start, freq_stop, point_cnt], daemon=True)
+        thread.start()
 
-                        # CSV header
-                        csv_w.writerow(['X', 'Y'])
+    def _measure_frequency_response_thread(self, freq_start, freq_stop, point_cnt):
+        """
+        Measures the frequency response between the first two enabled channels of the selected oscilloscope,
+        stimulated by the selected generator channel, and saves the results to a CSV file.
 
-                        # write every single point contained in the graph to the file
-                        for data_point in data_list:
-                            csv_w.writerow([data_point.x(), data_point.y()])
+        The file name format is the following:
+        Date_Time_FrequencyResponse.csv
 
-                    # the next graph in the channel's data set is the FFT graph
-                    graph_type = 'FFT'
+        Args:
+            freq_start (float):
+                The first frequency in hertz.
+            freq_stop (float):
+                The last frequency in hertz.
+            point_cnt (int):
+                The number of frequencies to measure.
+        """
+        self._mutex_osc_selection.acquire()
+        oscilloscope = self.selected_osc
+        self._mutex_osc_selection.release()
 
-        self._mutex_osc_visibility.release()
+        self._mutex_gen_ch_selection.acquire()
+        gen_channel = self.selected_gen_ch
+        self._mutex_gen_ch_selection.release()
+
+        if oscilloscope is None or gen_channel is None or not oscilloscope.is_running:
+            print('Frequency response: select a generator channel and a running oscilloscope first')
+            return
+
+        channel_numbers = sorted(oscilloscope.retrieve()['Points'].keys())
+        if len(channel_numbers) < 2 or freq_start <= 0 or freq_stop <= 0:
+            print('Frequency response: at least two enabled channels and positive frequencies are required')
+            return
+
+        def finished_callback(results):
+            file_name = self._get_file_prefix() + '_FrequencyResponse.csv'
+            write_csv(file_name, [['Frequency', 'Gain', 'Phase']],
+                      [results['Frequency'], results['Gain'], results['Phase']])
+            print('Frequency response saved to ' + file_name)
+
+        # only one measurement at a time
+        if self._freq_response is not None:
+            self._freq_response.stop()
+
+        frequencies = np.geomspace(freq_start, freq_stop, max(point_cnt, 2))
+        self._freq_response = FrequencyResponse(gen_channel, oscilloscope, channel_numbers[0], channel_numbers[1],
+                                                frequencies, finished_callback=finished_callback)
+        self._freq_response.start()
+
+    @QtCore.Slot()
+    def stop_frequency_response(self):
+        """
+        Stops the currently running frequency response measurement (if any).
+
+        The results measured so far are saved nonetheless.
+        """
+        if self._freq_response is not None:
+            thread = threading.Thread(target=self._freq_response.stop, daemon=True)
+            thread.start()
 
     @QtCore.Slot(QQuickItemGrabResult)
     def save_as_png(self, image):
@@ -325,6 +509,16 @@ class FrontToBackConnector(QtCore.QObject):
         self.preview_x_axis = x_axis
         self.preview_y_axis = y_axis
 
+    def driver_import_times(self):
+        """
+        The time each deferred import of a driver module (including the vendor library) took so far.
+
+        Returns:
+            dict[str, float]:
+                A dictionary with the module names as keys and the import durations in seconds as values.
+        """
+        return self._devices.driver_import_times
+
     def start_device_list_updates(self):
         """
         Once called, notifications to frontend about changes in the device list are enabled.
@@ -535,6 +729,38 @@ class FrontToBackConnector(QtCore.QObject):
         self._update_fft_chart_axes = enable
         self._mutex_fft_chart_axes_update.release()
 
+    @QtCore.Slot(str)
+    def set_accumulation_mode(self, mode):
+        """
+        Sets the mode in which the measurement data of successive frames is accumulated in the measurement chart.
+
+        Args:
+            mode (str):
+                "Off" to display every frame as is,
+                "Average" to display the running mean of the latest frames,
+                "Persistence" to additionally display a histogram of all samples as an image.
+        """
+        self._accumulator.mode = mode
+        self.persistenceUpdated.emit(self._accumulator.mode == 'Persistence')
+
+    @QtCore.Slot(int)
+    def set_averaging_cnt(self, count):
+        """
+        Sets the number of frames across which the running mean is calculated in the "Average" accumulation mode.
+
+        Args:
+            count (int):
+                The number of frames to average.
+        """
+        self._accumulator.avg_cnt = count
+
+    @QtCore.Slot()
+    def clear_accumulation(self):
+        """
+        Discards the accumulated measurement data of all channels.
+        """
+        self._accumulator.clear()
+
     @QtCore.Slot()
     def start_chart_updates(self):
         """
@@ -550,6 +776,8 @@ class FrontToBackConnector(QtCore.QObject):
         Measurement data is retrieved from every oscilloscope that has at least one enabled channel.
         Each graph in a chart is updated according to the data
         (provided that the data has changed since the last update).
+        Depending on the accumulation mode, the measurement data graphs display the running mean of
+        the latest frames, or a persistence image of all frames is rendered in addition.
         Optionally, the graph axis limits are set to the smallest resp. biggest overall data value.
         """
         while True:
@@ -557,6 +785,17 @@ class FrontToBackConnector(QtCore.QObject):
             norm_x_min = norm_x_max = norm_y_min = norm_y_max = None
             fft_x_min = fft_x_max = fft_y_min = fft_y_max = None
 
+            accumulation_mode = self._accumulator.mode
+            persistence_updated = False
+            accumulation_colors = {}
+
+            # the persistence histograms cover exactly the currently displayed section of the measurement chart
+            if accumulation_mode == 'Persistence' and self.norm_x_axis is not None:
+                persistence_range = ((self.norm_x_axis.min(), self.norm_x_axis.max()),
+                                     (self.norm_y_axis.min(), self.norm_y_axis.max()))
+            else:
+                persistence_range = None
+
             # iterate through all oscilloscopes where at least 1 channel is set to "visible"
             self._mutex_osc_visibility.acquire()
             for obj in self._visible_oscs.values():
@@ -578,8 +817,31 @@ class FrontToBackConnector(QtCore.QObject):
 
                             current_channel = next(channel for channel in obj['Channels'] if channel['No'] == ch_no)
 
-                            current_channel['Norm series'].replace(data_points_norm)
-                            current_channel['FFT series'].replace(data_points_fft)
+                            # accumulate the new data (all extracted segments, if available)
+                            if accumulation_mode != 'Off':
+                                accumulation_key = (frozenset(device.id.values()), ch_no)
+                                segments = retrieved_vals['Segments']
+                                if segments is not None and ch_no in segments['Data']:
+                                    frames = (segments['Time'], segments['Data'][ch_no])
+                                else:
+                                    frames = data_points_norm
+
+                                if accumulation_mode == 'Average':
+                                    data_points_norm = (frames[0], self._accumulator.average(accumulation_key, *frames))
+                                elif persistence_range is not None:
+                                    self._accumulator.accumulate(accumulation_key, *frames, *persistence_range)
+                                    persistence_updated = True
+
+                            # pass the X and Y vectors directly to the series (without creating a QPoint per sample)
+                            current_channel['Norm series'].replaceNp(*data_points_norm)
+                            current_channel['FFT series'].replaceNp(*data_points_fft)
+
+                # collect the keys (and colors) of all channels whose accumulated data is kept
+                if accumulation_mode != 'Off':
+                    for channel in obj['Channels']:
+                        color = channel['Norm series'].color()
+                        accumulation_colors[(frozenset(device.id.values()), channel['No'])] = \
+                            (color.red(), color.green(), color.blue())
 
                 # get the new X and Y axis limits
                 lim_time = retrieved_vals['Norm limits']['Time']
@@ -596,6 +858,15 @@ class FrontToBackConnector(QtCore.QObject):
                 fft_y_max = max(fft_y_max, lim_share[1]) if fft_y_max is not None else lim_share[1]
             self._mutex_osc_visibility.release()
 
+            # discard the accumulated data of channels that are not visible anymore
+            if accumulation_mode != 'Off':
+                self._accumulator.retain(accumulation_colors.keys())
+
+            # render the persistence histograms of all visible channels into a single image
+            if persistence_updated:
+                self.persistence_image_provider.update(self._accumulator.render(accumulation_colors))
+                self.persistenceUpdated.emit(True)
+
             # determine whether the new X and Y axis limits should be set
             self._mutex_norm_chart_axes_update.acquire()
             update_norm_axes = self._update_norm_chart_axes
@@ -709,18 +980,15 @@ class FrontToBackConnector(QtCore.QObject):
 
         # get the graph's new X and Y values
         time_vector, voltage_vector = channel.get_signal_preview()
-        x_min = min(time_vector)
-        x_max = max(time_vector)
-        y_min = min(voltage_vector)
-        y_max = max(voltage_vector)
+        x_min = float(np.min(time_vector))
+        x_max = float(np.max(time_vector))
+        y_min = float(np.min(voltage_vector))
+        y_max = float(np.max(voltage_vector))
         if x_min != x_max:
             update_x_axis = True
         if y_min != y_max:
             update_y_axis = True
 
-        # combine each element from the time and voltage vector into a QPoint
-        generated_waveform = [QPointF(time_vector[i], voltage_vector[i]) for i in range(len(time_vector))]
-
         self._mutex_gen_ch_selection.acquire()
         selected_channel = self.selected_gen_ch
         self._mutex_gen_ch_selection.release()
@@ -732,7 +1000,7 @@ class FrontToBackConnector(QtCore.QObject):
         # ensure that the update of the signal preview graph was issued for the currently selected generator channel
         if selected_device.id == device_id and selected_channel.id == channel.id:
             self._mutex_preview_series.acquire()
-            self.preview_series.replace(generated_waveform)
+            self.preview_series.replaceNp(time_vector, voltage_vector)
             if update_x_axis:
                 self.preview_x_axis.setRange(x_min, x_max)
             if update_y_axis:
@@ -785,61 +1053,61 @@ class FrontToBackConnector(QtCore.QObject):
                 The numbers of the oscilloscope's currently enabled channels.
         """
         # find the oscilloscope whose channels are to be enabled
-        for device in self._devices.device_list:
-            if device.id == device_id:
-
-                enabled_channels = []
-                enabled_channel_nos = []
-
-                # enable all channels, if no specific channel number is given
-                if channel_no is None:
-                    for i in range(device.ch_cnt):
+        device = self._devices.get_device(device_id)
+        if device is not None:
 
-                        # wait for the main thread to add the new series
-                        # (pass threading barrier for "adding a chart series tuple")
-                        self.addSeries.emit(colors[i])
-                        self._barrier_series_addition.wait()
+            enabled_channels = []
+            enabled_channel_nos = []
 
-                        # save the series and the corresponding channel number
-                        enabled_channels.append({
-                            'No': i + 1,
-                            'Norm series': self._latest_series[0],
-                            'FFT series': self._latest_series[1]
-                        })
-
-                        enabled_channel_nos.append(i + 1)
-
-                        # enable the oscilloscope channel
-                        device.ch[i].is_enabled = True
-
-                # enable a specific channel, if the corresponding number is given
-                else:
+            # enable all channels, if no specific channel number is given
+            if channel_no is None:
+                for i in range(device.ch_cnt):
 
                     # wait for the main thread to add the new series
                     # (pass threading barrier for "adding a chart series tuple")
-                    self.addSeries.emit(colors[0])
+                    self.addSeries.emit(colors[i])
                     self._barrier_series_addition.wait()
 
                     # save the series and the corresponding channel number
                     enabled_channels.append({
-                        'No': channel_no,
+                        'No': i + 1,
                         'Norm series': self._latest_series[0],
                         'FFT series': self._latest_series[1]
                     })
 
-                    enabled_channel_nos.append(channel_no)
+                    enabled_channel_nos.append(i + 1)
 
                     # enable the oscilloscope channel
-                    device.ch[channel_no - 1].is_enabled = True
+                    device.ch[i].is_enabled = True
 
-                # save the series and numbers of all enabled channels along with the oscilloscope,
-                # to which they belong
-                self._visible_oscs[frozenset(device_id.values())] = {
-                    'Device': device,
-                    'Channels': enabled_channels
-                }
+            # enable a specific channel, if the corresponding number is given
+            else:
 
-                return enabled_channel_nos
+                # wait for the main thread to add the new series
+                # (pass threading barrier for "adding a chart series tuple")
+                self.addSeries.emit(colors[0])
+                self._barrier_series_addition.wait()
+
+                # save the series and the corresponding channel number
+                enabled_channels.append({
+                    'No': channel_no,
+                    'Norm series': self._latest_series[0],
+                    'FFT series': self._latest_series[1]
+                })
+
+                enabled_channel_nos.append(channel_no)
+
+                # enable the oscilloscope channel
+                device.ch[channel_no - 1].is_enabled = True
+
+            # save the series and numbers of all enabled channels along with the oscilloscope,
+            # to which they belong
+            self._visible_oscs[frozenset(device_id.values())] = {
+                'Device': device,
+                'Channels': enabled_channels
+            }
+
+            return enabled_channel_nos
 
     def _remove_visible_osc(self, device_id):
         """
@@ -897,67 +1165,67 @@ class FrontToBackConnector(QtCore.QObject):
                 The numbers of the oscilloscope's currently enabled channels.
         """
         # find the oscilloscope whose channels are to be enabled/disabled
-        for device in self._devices.device_list:
-            if device.id == device_id:
-                visible_device = self._visible_oscs.get(frozenset(device_id.values()))
+        device = self._devices.get_device(device_id)
+        if device is not None:
+            visible_device = self._visible_oscs.get(frozenset(device_id.values()))
 
-                # get the oscilloscope's currently enabled channels
-                enabled_channels = visible_device['Channels']
+            # get the oscilloscope's currently enabled channels
+            enabled_channels = visible_device['Channels']
 
-                enabled_channel_nos = []
-                channel_position_in_list = None
+            enabled_channel_nos = []
+            channel_position_in_list = None
 
-                # try to find the passed channel number in the list of enabled channels
-                for i in range(len(enabled_channels)):
-                    current_ch_no = enabled_channels[i]['No']
-                    enabled_channel_nos.append(current_ch_no)
-                    if current_ch_no == channel_no:
-                        channel_position_in_list = i
+            # try to find the passed channel number in the list of enabled channels
+            for i in range(len(enabled_channels)):
+                current_ch_no = enabled_channels[i]['No']
+                enabled_channel_nos.append(current_ch_no)
+                if current_ch_no == channel_no:
+                    channel_position_in_list = i
 
-                # the passed channel number needs to be enabled, if it is not already
-                if channel_position_in_list is None:
+            # the passed channel number needs to be enabled, if it is not already
+            if channel_position_in_list is None:
 
-                    # wait for the main thread to add the new series
-                    # (pass threading barrier for "adding a chart series tuple")
-                    self.addSeries.emit(colors[0])
-                    self._barrier_series_addition.wait()
+                # wait for the main thread to add the new series
+                # (pass threading barrier for "adding a chart series tuple")
+                self.addSeries.emit(colors[0])
+                self._barrier_series_addition.wait()
 
-                    # save the series and the corresponding channel number
-                    enabled_channels.append({
-                        'No': channel_no,
-                        'Norm series': self._latest_series[0],
-                        'FFT series': self._latest_series[1]
-                    })
+                # save the series and the corresponding channel number
+                enabled_channels.append({
+                    'No': channel_no,
+                    'Norm series': self._latest_series[0],
+                    'FFT series': self._latest_series[1]
+                })
 
-                    enabled_channel_nos.append(channel_no)
+                enabled_channel_nos.append(channel_no)
 
-                    # enable the oscilloscope channel
-                    device.ch[channel_no - 1].is_enabled = True
+                # enable the oscilloscope channel
+                device.ch[channel_no - 1].is_enabled = True
 
-                # the passed channel number needs to be disabled, if it is currently enabled
-                else:
+            # the passed channel number needs to be disabled, if it is currently enabled
+            else:
 
-                    # disable the oscilloscope channel
-                    device.ch[channel_no - 1].is_enabled = False
+                # disable the oscilloscope channel
+                device.ch[channel_no - 1].is_enabled = False
 
-                    # remove the series that corresponds to the formerly enabled channel
-                    self.norm_chart.removeSeries(enabled_channels[channel_position_in_list]['Norm series'])
-                    self.fft_chart.removeSeries(enabled_channels[channel_position_in_list]['FFT series'])
+                # remove the series that corresponds to the formerly enabled channel
+                self.norm_chart.removeSeries(enabled_channels[channel_position_in_list]['Norm series'])
+                self.fft_chart.removeSeries(enabled_channels[channel_position_in_list]['FFT series'])
 
-                    del enabled_channels[channel_position_in_list]
-                    if not enabled_channels:
+                del enabled_channels[channel_position_in_list]
+                if not enabled_channels:
 
-                        # stop the oscilloscope as soon as possible
-                        thread = threading.Thread(target=self._device_full_stop_thread,
-                                                  args=[visible_device['Device']],
-                                                  daemon=True)
-                        thread.start()
+                    # stop the oscilloscope as soon as possible
+                    thread = threading.Thread(target=self._device_full_stop_thread,
+                                              args=[visible_device['Device']],
+                                              daemon=True)
+                    thread.start()
 
-                        self._visible_oscs.pop(frozenset(device_id.values()))
+                    self._visible_oscs.pop(frozenset(device_id.values()))
 
-                    enabled_channel_nos.remove(channel_no)
+                enabled_channel_nos.remove(channel_no)
 
-                return enabled_channel_nos
+            return enabled_channel_nos
 
     @QtCore.Slot('QVariantMap', str, list)
     def visibility_checkbox_toggled(self, device_id, channel_no, colors):
@@ -1102,54 +1370,53 @@ class FrontToBackConnector(QtCore.QObject):
                 If none is given, all channels will be enabled/disabled.
         """
         # find the generator whose channels are to be enabled/disabled
-        for dev in self._devices.device_list:
-            if dev.id == device_id:
-                device = dev
-                enabled_channel_nos = []
-
-                self._mutex_gen_output.acquire()
-
-                # case: no channel number was provided
-                if channel_no is None:
-
-                    # disable all channels if at least one of them was enabled
-                    if any([channel.is_enabled for channel in device.ch]):
-                        for channel in device.ch:
-                            channel.is_enabled = False
-                            if channel.is_enabled:
-                                enabled_channel_nos.append(channel.id['No'])
-
-                        # stop the generator if no channel is enabled anymore
-                        if not enabled_channel_nos:
-                            thread = threading.Thread(target=self._device_full_stop_thread, args=[device], daemon=True)
-                            thread.start()
-
-                    # enable all channels otherwise
-                    else:
-                        for channel in device.ch:
-                            channel.is_enabled = True
-                            if channel.is_enabled:
-                                enabled_channel_nos.append(channel.id['No'])
-
-                # case: a specific channel number was provided
-                else:
+        device = self._devices.get_device(device_id)
+        if device is not None:
+            enabled_channel_nos = []
+
+            self._mutex_gen_output.acquire()
 
+            # case: no channel number was provided
+            if channel_no is None:
+
+                # disable all channels if at least one of them was enabled
+                if any([channel.is_enabled for channel in device.ch]):
                     for channel in device.ch:
-                        if channel.id['No'] == channel_no:
-                            # toggle the specified channel
-                            channel.is_enabled = not channel.is_enabled
+                        channel.is_enabled = False
                         if channel.is_enabled:
                             enabled_channel_nos.append(channel.id['No'])
 
+                    # stop the generator if no channel is enabled anymore
                     if not enabled_channel_nos:
-                        # stop the generator if no channel is enabled anymore
                         thread = threading.Thread(target=self._device_full_stop_thread, args=[device], daemon=True)
                         thread.start()
 
-                self._mutex_gen_output.release()
+                # enable all channels otherwise
+                else:
+                    for channel in device.ch:
+                        channel.is_enabled = True
+                        if channel.is_enabled:
+                            enabled_channel_nos.append(channel.id['No'])
+
+            # case: a specific channel number was provided
+            else:
+
+                for channel in device.ch:
+                    if channel.id['No'] == channel_no:
+                        # toggle the specified channel
+                        channel.is_enabled = not channel.is_enabled
+                    if channel.is_enabled:
+                        enabled_channel_nos.append(channel.id['No'])
+
+                if not enabled_channel_nos:
+                    # stop the generator if no channel is enabled anymore
+                    thread = threading.Thread(target=self._device_full_stop_thread, args=[device], daemon=True)
+                    thread.start()
+
+            self._mutex_gen_output.release()
 
-                # pass the updated list of enabled channels (and the generator to which they belong) to frontend
-                self.enabledChannelsUpdated.emit(device_id, enabled_channel_nos)
+            # pass the updated list of enabled channels (and the generator to which they belong) to frontend
+            self.enabledChannelsUpdated.emit(device_id, enabled_channel_nos)
 
     @QtCore.Slot('QVariantMap')
     def set_selected_device(self, device_id):
@@ -1163,22 +1430,20 @@ class FrontToBackConnector(QtCore.QObject):
                 The device that has been selected.
         """
         # find the device that was selected in frontend
-        for device in self._devices.device_list:
-            if device.id == device_id:
+        device = self._devices.get_device(device_id)
+        if device is not None:
 
-                if device_id['DevType'] == 'Osc':
-                    self._mutex_osc_selection.acquire()
-                    self.selected_osc = device
-                    self._mutex_osc_selection.release()
-                elif device_id['DevType'] == 'Gen':
-                    self._mutex_gen_selection.acquire()
-                    self.selected_gen = device
-                    self._mutex_gen_selection.release()
-
-                # confirm selection to frontend
-                self.selectedDeviceUpdated.emit(device.id)
+            if device_id['DevType'] == 'Osc':
+                self._mutex_osc_selection.acquire()
+                self.selected_osc = device
+                self._mutex_osc_selection.release()
+            elif device_id['DevType'] == 'Gen':
+                self._mutex_gen_selection.acquire()
+                self.selected_gen = device
+                self._mutex_gen_selection.release()
 
-                break
+            # confirm selection to frontend
+            self.selectedDeviceUpdated.emit(device.id)
 
     @QtCore.Slot('QVariantMap', int)
     def set_selected_channel(self, device_id, channel_no):
@@ -0,0 +1,640 @@
+"""Headless module."""
+
+import argparse
+import ast
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+
+from uniswag.data_export import collect_metadata, write_csv, write_hdf5, write_npz, write_parquet
+from uniswag.device_manager import DeviceManager
+from uniswag.devices.oscilloscope import Oscilloscope
+
+
+def write_csv_frame(file_name, retrieved_vals, metadata):
+    """
+    Writes the measurement data of an oscilloscope to CSV files, one per channel.
+
+    The channel number is appended to the file name (e.g. "frame.csv" becomes "frame_1.csv").
+    Only the time and voltage vectors are written, the metadata is omitted.
+
+    Args:
+        file_name (str):
+            The absolute path of the file to write (including the file extension).
+        retrieved_vals (dict[str, Any]):
+            The measurement data as provided by the oscilloscope's retrieving method.
+        metadata (dict[str, Any]):
+            The metadata as provided by the collecting method (unused).
+    """
+    root, extension = os.path.splitext(file_name)
+    for ch_no, ((time_vector, voltage), _) in retrieved_vals['Points'].items():
+        write_csv(root + '_' + str(ch_no) + extension, [['X', 'Y']], [time_vector, voltage])
+
+
+# the functions which write a single frame, mapped to the respective file extensions
+RECORDING_FORMATS = {
+    'npz': write_npz,
+    'h5': write_hdf5,
+    'parquet': write_parquet,
+    'csv': write_csv_frame
+}
+
+
+def device_key(device):
+    """
+    Combines an oscilloscope's ID into a single string, usable as part of a file name.
+
+    Args:
+        device (uniswag.devices.device.Device):
+            The device.
+
+    Returns:
+        str:
+            The device's vendor, name and serial number, joined by underscores
+            (with all characters other than letters, digits, '-' and '.' being replaced by underscores).
+    """
+    key = device.id['Vendor'] + '_' + device.id['Name'] + '_' + device.id['SerNo']
+    return ''.join(character if character.isalnum() or character in '-.' else '_' for character in key)
+
+
+class FrameRecorder:
+    def __init__(self, output_dir, file_format='npz', queue_size=16):
+        """
+        Writes oscilloscope frames to files, one file (or one file per channel for CSV) per frame.
+
+        The files are written by a dedicated thread, so that the acquisition is never blocked by the file system.
+        If the writing thread falls behind by more than the queue size, further frames are dropped (and counted)
+        instead of accumulating in memory.
+        The settings stored alongside every frame are read once per oscilloscope (on its first frame),
+        as reading them for every frame would compete with the acquisition for the device.
+        After changing the settings of a running oscilloscope, they can be read again by update_metadata.
+
+        Args:
+            output_dir (str):
+                The directory to write the files to (created if it does not exist).
+            file_format (str):
+                The file format, one of the keys of RECORDING_FORMATS.
+            queue_size (int):
+                The maximum number of frames waiting to be written.
+
+        Returns:
+            FrameRecorder:
+                A FrameRecorder object.
+        """
+        if file_format not in RECORDING_FORMATS:
+            raise ValueError('Unknown recording format: ' + str(file_format))
+
+        os.makedirs(output_dir, exist_ok=True)
+        self._output_dir = output_dir
+        self._file_format = file_format
+
+        # the frames waiting to be written, as tuples of file name, measurement data and metadata
+        self._queue = queue.Queue(maxsize=queue_size)
+
+        # the metadata of the recorded oscilloscopes, mapped to the device keys
+        self._metadata = {}
+
+        # a threading lock which ensures thread-safe access to the counters
+        self._mutex_stats = threading.Lock()
+        # the number of written and dropped frames, mapped to the device keys
+        self._recorded = {}
+        self._dropped = {}
+
+        # the thread which writes the queued frames
+        self._writer_thread = threading.Thread(target=self._write_frames, daemon=True)
+        self._writer_thread.start()
+
+    def __call__(self, device, retrieved_vals):
+        """
+        Queues a frame to be written.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope which measured the frame.
+            retrieved_vals (dict[str, Any]):
+                The measurement data as provided by the oscilloscope's retrieving method.
+
+        Returns:
+            bool:
+                False if the frame was dropped, True otherwise.
+        """
+        key = device_key(device)
+        file_name = os.path.join(self._output_dir,
+                                 key + '_' + '{:08d}'.format(retrieved_vals['Frame']) + '.' + self._file_format)
+
+        # the settings are only read on the device's first frame, afterwards just the timestamp is updated
+        metadata = self._metadata.get(key)
+        if metadata is None:
+            metadata = self.update_metadata(device)
+        metadata = dict(metadata, Timestamp=time.time())
+
+        try:
+            self._queue.put_nowait((key, file_name, retrieved_vals, metadata))
+        except queue.Full:
+            self._mutex_stats.acquire()
+            self._dropped[key] = self._dropped.get(key, 0) + 1
+            self._mutex_stats.release()
+            return False
+
+        return True
+
+    def update_metadata(self, device):
+        """
+        Reads the settings of an oscilloscope which are stored alongside its subsequently recorded frames.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope.
+
+        Returns:
+            dict[str, Any]:
+                The metadata as provided by uniswag.data_export.collect_metadata.
+        """
+        metadata = collect_metadata(device, time.time())
+        self._metadata[device_key(device)] = metadata
+
+        return metadata
+
+    def _write_frames(self):
+        """
+        Continuously writes the queued frames until the recorder is closed.
+        """
+        write_func = RECORDING_FORMATS[self._file_format]
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            key, file_name, retrieved_vals, metadata = item
+            try:
+                write_func(file_name, retrieved_vals, metadata)
+            except (ImportError, OSError) as e:
+                print('Could not write ' + file_name + ': ' + str(e))
+                continue
+
+            self._mutex_stats.acquire()
+            self._recorded[key] = self._recorded.get(key, 0) + 1
+            self._mutex_stats.release()
+
+    def close(self):
+        """
+        Writes all frames that are still queued and stops the writing thread.
+        """
+        self._queue.put(None)
+        self._writer_thread.join()
+
+    @property
+    def stats(self):
+        """
+        The number of written and dropped frames per device.
+
+        Returns:
+            dict[str, dict[str, int]]:
+                A dictionary with the keys 'Recorded' and 'Dropped' per device key.
+        """
+        self._mutex_stats.acquire()
+        result = {key: {'Recorded': self._recorded.get(key, 0), 'Dropped': self._dropped.get(key, 0)}
+                  for key in set(self._recorded) | set(self._dropped)}
+        self._mutex_stats.release()
+
+        return result
+
+
+class HeadlessAcquisition:
+    def __init__(self, device_patterns=(), channels=None, settings=(), ch_settings=(), drivers=None,
+                 monitor_usb=True):
+        """
+        Runs the acquisition of oscilloscopes without any GUI.
+
+        Every oscilloscope that is connected (now or later) and matches the device patterns is configured,
+        started and continuously read by a dedicated thread,
+        which passes each new frame to all sinks (e.g. a FrameRecorder).
+        The measurement data is passed as provided by the oscilloscopes' retrieving method,
+        i.e. as plain numpy arrays without any Qt types being involved.
+
+        Args:
+            device_patterns (Iterable[str]):
+                Only oscilloscopes whose vendor, name or serial number contain any of these patterns
+                (case-insensitive) are acquired; all oscilloscopes except math oscilloscopes if empty.
+            channels (list[int] or None):
+                The numbers of the channels to enable (all other channels are disabled), all channels if None.
+            settings (Iterable[(str, Any)]):
+                The oscilloscope settings to apply before starting, as tuples of property name and value
+                (e.g. ('rec_len', 10000)), in the given order.
+            ch_settings (Iterable[(str, Any)]):
+                The channel settings to apply to every enabled channel before starting.
+            drivers (uniswag.driver_registry.DriverRegistry or None):
+                The drivers of the supported vendors (the built-in and installed drivers by default).
+            monitor_usb (bool):
+                Whether devices are added and removed automatically when they are plugged in or out via USB.
+
+        Returns:
+            HeadlessAcquisition:
+                A HeadlessAcquisition object.
+        """
+        self._device_patterns = [pattern.lower() for pattern in device_patterns]
+        self._channels = channels
+        self._settings = list(settings)
+        self._ch_settings = list(ch_settings)
+
+        # the functions receiving the oscilloscope and its measurement data for each new frame
+        self._sinks = []
+
+        # the oscilloscopes that have been added to the device list, but have not been started yet
+        self._added_oscs = queue.Queue()
+
+        # signals all threads to stop the acquisition
+        self._stop_event = threading.Event()
+
+        # the number of frames after which an oscilloscope's acquisition ends (None for no limit)
+        self._frame_cnt = None
+
+        # a threading lock which ensures thread-safe access to the acquisitions and their counters
+        self._mutex_acquisitions = threading.Lock()
+        # the acquired oscilloscopes, mapped to their device keys, each with its reading thread and counters
+        self._acquisitions = {}
+
+        # (all devices, including those connected initially, are passed to the device list callback)
+        self._manager = DeviceManager(self._on_device_list_event, self._on_device_stopped, drivers, monitor_usb)
+
+    @property
+    def device_manager(self):
+        """
+        The device manager providing the connected devices.
+
+        Returns:
+            uniswag.device_manager.DeviceManager:
+                The DeviceManager object.
+        """
+        return self._manager
+
+    def add_sink(self, sink):
+        """
+        Adds a function which receives every new frame of all acquired oscilloscopes.
+
+        Sinks are invoked from the reading threads and should return quickly,
+        since frames measured in the meantime are skipped.
+
+        Args:
+            sink (function):
+                The function, receiving the oscilloscope and its retrieved measurement data as parameters.
+        """
+        self._sinks.append(sink)
+
+    @property
+    def stats(self):
+        """
+        The acquisition counters per oscilloscope.
+
+        Returns:
+            dict[str, dict[str, Any]]:
+                A dictionary with the keys 'Frames' (the number of frames passed to the sinks),
+                'Skipped' (the number of frames measured while the sinks were still busy),
+                'Elapsed' (the time in seconds since the first frame) and 'Running' per device key.
+        """
+        self._mutex_acquisitions.acquire()
+        result = {key: {'Frames': acquisition['Frames'], 'Skipped': acquisition['Skipped'],
+                        'Elapsed': (time.perf_counter() - acquisition['Begin']) if acquisition['Begin'] else 0.0,
+                        'Running': acquisition['Thread'].is_alive()}
+                  for key, acquisition in self._acquisitions.items()}
+        self._mutex_acquisitions.release()
+
+        return result
+
+    def _on_device_list_event(self, event, devices):
+        """
+        Queues all added oscilloscopes, so that they are configured and started by the running acquisition.
+
+        Args:
+            event (str):
+                The kind of update ('add' or 'remove').
+            devices (list[uniswag.devices.device.Device]):
+                The added or removed "Oscilloscope" and/or "Generator" objects.
+        """
+        if event == 'add':
+            for dev in devices:
+                self._added_oscs.put(dev)
+
+    def _on_device_stopped(self, device_id):
+        # the reading threads notice stopped oscilloscopes by themselves
+        pass
+
+    def _matches(self, device):
+        """
+        Checks whether an added device is to be acquired.
+
+        Args:
+            device (uniswag.devices.device.Device):
+                The device.
+
+        Returns:
+            bool:
+                True if the device is an oscilloscope (other than a math oscilloscope) matching the device patterns.
+        """
+        if not isinstance(device, Oscilloscope) or device.id['Vendor'] == 'MS-SWAG':
+            return False
+        if not self._device_patterns:
+            return True
+
+        description = ' '.join((device.id['Vendor'], device.id['Name'], device.id['SerNo'])).lower()
+        return any(pattern in description for pattern in self._device_patterns)
+
+    def _configure(self, device):
+        """
+        Applies the channel selection and settings to an oscilloscope.
+
+        Settings that cannot be applied are reported and skipped.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope.
+        """
+        for name, value in self._settings:
+            try:
+                setattr(device, name, value)
+            except Exception as e:
+                print('Could not set ' + name + ' of ' + device_key(device) + ': ' + str(e))
+
+        for ch in device.ch:
+            ch.is_enabled = self._channels is None or ch.id['No'] in self._channels
+            if not ch.is_enabled:
+                continue
+
+            for name, value in self._ch_settings:
+                try:
+                    setattr(ch, name, value)
+                except Exception as e:
+                    print('Could not set ' + name + ' of ' + device_key(device) + ' channel ' + str(ch.id['No'])
+                          + ': ' + str(e))
+
+    def _start(self, device):
+        """
+        Configures and starts an oscilloscope and the thread which reads its frames.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope.
+        """
+        key = device_key(device)
+
+        self._configure(device)
+        if not device.start():
+            print('Could not start ' + key + '.')
+            return
+
+        thread = threading.Thread(target=self._read_frames, args=[device, key], daemon=True)
+
+        self._mutex_acquisitions.acquire()
+        self._acquisitions[key] = {'Device': device, 'Thread': thread, 'Frames': 0, 'Skipped': 0, 'Begin': None}
+        self._mutex_acquisitions.release()
+
+        thread.start()
+        print('Started ' + key + '.')
+
+    def _read_frames(self, device, key):
+        """
+        Passes every new frame of an oscilloscope to the sinks until the acquisition is stopped,
+        the number of frames to acquire is reached or the oscilloscope is removed.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope.
+            key (str):
+                The oscilloscope's device key.
+        """
+        frame_id = device.retrieve()['Frame']
+
+        while not self._stop_event.is_set():
+            retrieved_vals = device.wait_for_frame(frame_id, 0.5)
+            if retrieved_vals is None:
+                # stop reading once the oscilloscope has been removed (or has stopped by itself)
+                if device not in self._manager.device_list or not device.is_running:
+                    break
+                continue
+
+            skipped = retrieved_vals['Frame'] - frame_id - 1
+            frame_id = retrieved_vals['Frame']
+
+            for sink in self._sinks:
+                sink(device, retrieved_vals)
+
+            self._mutex_acquisitions.acquire()
+            acquisition = self._acquisitions[key]
+            if acquisition['Begin'] is None:
+                acquisition['Begin'] = time.perf_counter()
+            else:
+                acquisition['Skipped'] += skipped
+            acquisition['Frames'] += 1
+            frames = acquisition['Frames']
+            self._mutex_acquisitions.release()
+
+            if self._frame_cnt is not None and frames >= self._frame_cnt:
+                device.stop()
+                break
+
+    def run(self, duration=None, frame_cnt=None, status_interval=None):
+        """
+        Runs the acquisition until it is stopped.
+
+        The acquisition stops when the duration has elapsed, when every acquired oscilloscope has provided
+        the specified number of frames, when stopped (e.g. by another thread or a signal handler)
+        or on a keyboard interrupt. Afterwards, all acquired oscilloscopes are stopped.
+
+        Args:
+            duration (float or None):
+                The maximum run time in seconds (None for no limit).
+            frame_cnt (int or None):
+                The number of frames after which an oscilloscope's acquisition ends (None for no limit).
+            status_interval (float or None):
+                The interval in seconds at which the counters are printed (None to never print them).
+        """
+        self._frame_cnt = frame_cnt
+        begin = last_status = time.perf_counter()
+
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    device = self._added_oscs.get(timeout=0.1)
+                    if self._matches(device) and device_key(device) not in self._acquisitions:
+                        self._start(device)
+                except queue.Empty:
+                    pass
+
+                now = time.perf_counter()
+                if duration is not None and now - begin >= duration:
+                    break
+
+                stats = self.stats
+                if frame_cnt is not None and stats and not any(s['Running'] for s in stats.values()):
+                    break
+
+                if status_interval is not None and now - last_status >= status_interval:
+                    last_status = now
+                    self.print_stats()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            self._stop_event.set()
+            self._stop_acquisitions()
+
+    def stop(self):
+        """
+        Stops the running acquisition.
+
+        Only signals the acquisition to stop, so that it can also be invoked from a signal handler.
+        """
+        self._stop_event.set()
+
+    def _stop_acquisitions(self):
+        """
+        Waits for all reading threads to finish and stops all acquired oscilloscopes.
+        """
+        self._mutex_acquisitions.acquire()
+        acquisitions = list(self._acquisitions.values())
+        self._mutex_acquisitions.release()
+
+        for acquisition in acquisitions:
+            acquisition['Thread'].join()
+            acquisition['Device'].stop()
+
+    def print_stats(self):
+        """
+        Prints the frame rate and counters of every acquired oscilloscope.
+        """
+        for key, stats in self.stats.items():
+            rate = (stats['Frames'] - 1) / stats['Elapsed'] if stats['Elapsed'] > 0 else 0.0
+            print('{}: {} frames ({:.2f} frames/s), {} skipped{}'.format(
+                key, stats['Frames'], rate, stats['Skipped'], '' if stats['Running'] else ', stopped'))
+
+
+def parse_assignment(text):
+    """
+    Parses a command line assignment of the form NAME=VALUE.
+
+    The value is interpreted as a Python literal (e.g. a number or boolean) if possible, as a string otherwise.
+
+    Args:
+        text (str):
+            The assignment.
+
+    Returns:
+        (str, Any):
+            The name and the value.
+    """
+    name, separator, value = text.partition('=')
+    if not separator or not name:
+        raise argparse.ArgumentTypeError('expected NAME=VALUE, got ' + repr(text))
+
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='uniswag-headless',
+        description='Acquires and records oscilloscope measurements without the GUI.')
+    parser.add_argument('--device', action='append', default=[], metavar='PATTERN',
+                        help='only acquire oscilloscopes whose vendor, name or serial number contain the pattern '
+                             '(can be repeated; all oscilloscopes by default)')
+    parser.add_argument('--channels', type=lambda text: [int(no) for no in text.split(',') if no],
+                        help='comma-separated numbers of the channels to enable (all channels by default)')
+    parser.add_argument('--set', action='append', default=[], type=parse_assignment, metavar='NAME=VALUE',
+                        dest='settings', help='an oscilloscope setting to apply before starting, e.g. rec_len=10000 '
+                                              'or measure_mode=repeat (can be repeated)')
+    parser.add_argument('--ch-set', action='append', default=[], type=parse_assignment, metavar='NAME=VALUE',
+                        dest='ch_settings', help='a setting to apply to every enabled channel, e.g. range=2.0 '
+                                                 '(can be repeated)')
+    parser.add_argument('--duration', type=float, help='the run time in seconds (until interrupted by default)')
+    parser.add_argument('--frames', type=int, help='the number of frames to acquire per oscilloscope')
+    parser.add_argument('--output-dir', help='the directory to record every frame to (not recorded by default)')
+    parser.add_argument('--format', choices=sorted(RECORDING_FORMATS), default='npz',
+                        help='the file format of the recorded frames (default: npz)')
+    parser.add_argument('--queue-size', type=int, default=16,
+                        help='the number of frames that may wait to be written before frames are dropped')
+    parser.add_argument('--stream-port', type=int,
+                        help='publish every frame to subscribers connecting to this port (0 for any free port)')
+    parser.add_argument('--stream-host', default='127.0.0.1',
+                        help='the address to publish frames on (default: the loopback interface)')
+    parser.add_argument('--control-port', type=int,
+                        help='accept JSON-RPC remote control requests on this port (0 for any free port)')
+    parser.add_argument('--control-host', default='127.0.0.1',
+                        help='the address to accept remote control requests on (default: the loopback interface)')
+    parser.add_argument('--status-interval', type=float, default=10.0,
+                        help='the interval in seconds at which the frame counters are printed (0 to disable)')
+    parser.add_argument('--simulate', action='append', default=[], metavar='VENDOR:MODEL:SERNO',
+                        help='acquire a simulated device instead of monitoring USB, e.g. Tiepie:HS5:12345 '
+                             '(can be repeated)')
+    args = parser.parse_args(argv)
+
+    drivers = None
+    simulated_devices = []
+    if args.simulate:
+        from uniswag.simulation.drivers import simulated_driver_registry
+        from uniswag.simulation.instrument import SimulatedInstrument, add_instrument
+
+        drivers = simulated_driver_registry()
+        for description in args.simulate:
+            try:
+                vendor, model, ser_no = description.split(':')
+            except ValueError:
+                parser.error('expected VENDOR:MODEL:SERNO, got ' + repr(description))
+            add_instrument(vendor, SimulatedInstrument(model, ser_no))
+            simulated_devices.append(({'Name': model, 'SerNo': ser_no, 'Type': 'OSC'}, vendor))
+
+    acquisition = HeadlessAcquisition(args.device, args.channels, args.settings, args.ch_settings,
+                                      drivers=drivers, monitor_usb=not args.simulate)
+
+    recorder = None
+    if args.output_dir:
+        recorder = FrameRecorder(args.output_dir, args.format, args.queue_size)
+        acquisition.add_sink(recorder)
+
+    server = None
+    if args.stream_port is not None:
+        from uniswag.streaming import StreamingServer
+
+        server = StreamingServer(args.stream_host, args.stream_port)
+        acquisition.add_sink(server)
+        print('Publishing frames on {}:{}.'.format(*server.address))
+
+    control_server = None
+    if args.control_port is not None:
+        from uniswag.remote_control import RemoteControlServer
+
+        control_server = RemoteControlServer(acquisition.device_manager, args.control_host, args.control_port)
+        print('Accepting remote control requests on {}:{}.'.format(*control_server.address))
+
+    for device_id, vendor in simulated_devices:
+        acquisition.device_manager.add_device(device_id, vendor)
+
+    # stop gracefully when interrupted or terminated (e.g. by a service manager)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda received_signum, frame: acquisition.stop())
+
+    acquisition.run(args.duration, args.frames, args.status_interval or None)
+    acquisition.print_stats()
+
+    if recorder is not None:
+        recorder.close()
+        for key, stats in recorder.stats.items():
+            print('{}: {} frames recorded, {} dropped'.format(key, stats['Recorded'], stats['Dropped']))
+
+    if server is not None:
+        server.close()
+
+    if control_server is not None:
+        control_server.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+
+
+class IdentityCache:
+    def __init__(self, file_name=None, max_age=30 * 24 * 3600):
+        """
+        Persistently remembers the identities (vendor, model, serial number etc.) of devices across runs.
+
+        Each identity is stored under the address of the device (e.g. a VISA resource string or a USB path),
+        along with a fingerprint of the address' current occupant (e.g. the USB vendor/product ID and serial string).
+        An identity is considered stale and discarded if the fingerprint differs upon lookup
+        (another device was plugged into the same port) or if it has not been confirmed for too long.
+        Thus, known devices can be identified without querying them again.
+
+        Args:
+            file_name (str or None):
+                The path of the JSON file in which the identities are stored.
+                Defaults to "identity_cache.json" in the ".uniswag" folder of the user's home directory.
+            max_age (float):
+                The time in seconds after which an unconfirmed identity is considered stale.
+
+        Returns:
+            IdentityCache:
+                An IdentityCache object.
+        """
+        if file_name is None:
+            file_name = os.path.join(os.path.expanduser('~'), '.uniswag', 'identity_cache.json')
+        self._file_name = file_name
+        self._max_age = max_age
+
+        # the cached entries, mapped to the devices' addresses;
+        # each entry is a dictionary with the keys 'Identity', 'Fingerprint' and 'Time' (UNIX time of confirmation)
+        self._entries = self._load()
+
+        # whether the cached entries have been changed since they were last saved to the file
+        self._is_modified = False
+
+        # a threading lock which ensures thread-safe access to the cached entries and the file
+        self._mutex_cache = threading.Lock()
+
+    def _load(self):
+        """
+        Reads the cached entries from the file.
+
+        Returns:
+            dict[str, dict[str, Any]]:
+                The cached entries (empty if the file does not exist or cannot be read).
+        """
+        try:
+            with open(self._file_name, 'r') as opened_file:
+                entries = json.load(opened_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(entries, dict):
+            return {}
+
+        return entries
+
+    def _save(self):
+        """
+        Writes the cached entries to the file (the cache's lock needs to be acquired beforehand).
+
+        The file is replaced atomically, so that a concurrently running instance never reads a partial file.
+        """
+        try:
+            os.makedirs(os.path.dirname(self._file_name), exist_ok=True)
+            temp_file_name = self._file_name + '.tmp'
+            with open(temp_file_name, 'w') as opened_file:
+                json.dump(self._entries, opened_file, indent=1)
+            os.replace(temp_file_name, self._file_name)
+            self._is_modified = False
+        except OSError as e:
+            print('Could not save the device identity cache: ' + str(e))
+
+    def get(self, address, fingerprint=None):
+        """
+        The cached identity of the device at the given address.
+
+        Args:
+            address (str):
+                The address of the device.
+            fingerprint (str or None):
+                The fingerprint of the device currently at the address (None if unknown).
+
+        Returns:
+            dict[str, Any] or None:
+                The identity, or None if none is cached or the cached one is stale.
+        """
+        self._mutex_cache.acquire()
+
+        entry = self._entries.get(address)
+        if entry is not None and (entry.get('Fingerprint') != fingerprint
+                                  or time.time() - entry.get('Time', 0) > self._max_age):
+            # discard the stale entry
+            del self._entries[address]
+            self._save()
+            entry = None
+
+        self._mutex_cache.release()
+
+        if entry is None:
+            return None
+
+        return dict(entry['Identity'])
+
+    def put(self, address, identity, fingerprint=None, save=True):
+        """
+        Caches (or confirms) the identity of the device at the given address.
+
+        Args:
+            address (str):
+                The address of the device.
+            identity (dict[str, Any]):
+                The identity of the device (must be serializable as JSON).
+            fingerprint (str or None):
+                The fingerprint of the device currently at the address (None if unknown).
+            save (bool):
+                Whether to save the cached entries to the file right away.
+                If not, they are saved by the next call of flush() (or of a method that saves them).
+        """
+        self._mutex_cache.acquire()
+        self._entries[address] = {'Identity': dict(identity), 'Fingerprint': fingerprint, 'Time': time.time()}
+        self._is_modified = True
+        if save:
+            self._save()
+        self._mutex_cache.release()
+
+    def flush(self):
+        """
+        Saves the cached entries to the file if they have been changed since they were last saved.
+        """
+        self._mutex_cache.acquire()
+        if self._is_modified:
+            self._save()
+        self._mutex_cache.release()
+
+    def invalidate(self, address):
+        """
+        Discards the cached identity of the device at the given address (if any).
+
+        Args:
+            address (str):
+                The address of the device.
+        """
+        self._mutex_cache.acquire()
+        if self._entries.pop(address, None) is not None:
+            self._save()
+        self._mutex_cache.release()
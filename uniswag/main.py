@@ -1,6 +1,7 @@
 """Main module."""
 
 import sys
+import time
 from os import path
 
 from PySide6.QtQml import QQmlApplicationEngine
@@ -13,6 +14,10 @@ from uniswag.front_to_back_connector import FrontToBackConnector
 
 def main():
 
+    # the point in time at which the startup began
+    # (the vendor libraries are only imported once a device of the vendor is detected)
+    startup_begin = time.perf_counter()
+
     # Material, Universal, Fusion
     sys.argv += ['--style', 'Fusion']
 
@@ -26,12 +31,18 @@ def main():
     engine.rootContext().setContextProperty('FrontToBackConnector', front_to_back_connector)
     engine.rootContext().setContextProperty('OscProperties', osc_properties)
     engine.rootContext().setContextProperty('GenProperties', gen_properties)
+    engine.addImageProvider('persistence', front_to_back_connector.persistence_image_provider)
 
     main_qml = path.join(path.dirname(__file__), 'qml', 'Main.qml')
     engine.load(main_qml)
 
     front_to_back_connector.start_device_list_updates()
 
+    # report the startup time and the driver modules that have been imported so far
+    print('Startup took {:.3f} s.'.format(time.perf_counter() - startup_begin))
+    for module_name, import_time in front_to_back_connector.driver_import_times().items():
+        print('  Importing {} took {:.3f} s.'.format(module_name, import_time))
+
     if not engine.rootObjects():
         sys.exit(-1)
     sys.exit(app.exec())
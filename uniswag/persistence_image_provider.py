@@ -0,0 +1,56 @@
+import threading
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from PySide6.QtQuick import QQuickImageProvider
+
+
+class PersistenceImageProvider(QQuickImageProvider):
+    def __init__(self):
+        """
+        Provides the latest rendered persistence image to frontend, inherits from QQuickImageProvider.
+
+        Frontend requests the image via the "image://persistence/<ID>" URL,
+        where the ID is irrelevant but needs to change on every update in order to bypass caching.
+
+        Returns:
+            PersistenceImageProvider:
+                A PersistenceImageProvider object.
+        """
+        super().__init__(QQuickImageProvider.Image)
+
+        # the latest rendered persistence image
+        self._image = QImage(1, 1, QImage.Format_RGBA8888)
+        self._image.fill(Qt.transparent)
+
+        # a threading lock which ensures thread-safe access to the latest image
+        self._mutex_image = threading.Lock()
+
+    def update(self, rgba):
+        """
+        Replaces the provided image.
+
+        Args:
+            rgba (np.ndarray):
+                A 3-D array of the shape height × width × 4 with the data type uint8.
+        """
+        height, width = rgba.shape[:2]
+
+        # copy the data, so that the image does not depend on the array's lifetime
+        image = QImage(rgba.tobytes(), width, height, 4 * width, QImage.Format_RGBA8888).copy()
+
+        self._mutex_image.acquire()
+        self._image = image
+        self._mutex_image.release()
+
+    def requestImage(self, image_id, size, requested_size):
+        self._mutex_image.acquire()
+        image = self._image
+        self._mutex_image.release()
+
+        if requested_size.isValid():
+            image = image.scaled(requested_size)
+        size.setWidth(image.width())
+        size.setHeight(image.height())
+
+        return image
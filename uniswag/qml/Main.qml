@@ -111,6 +111,49 @@ ApplicationWindow {
                             }
                         }
                     }
+                    //! The accumulation modes of the oscilloscope measurement chart.
+                    Menu {
+                        title: qsTr("Accumulation")
+                        MenuItem {
+                            text: qsTr("Off")
+                            onTriggered: {
+                                FrontToBackConnector.set_accumulation_mode("Off")
+                            }
+                        }
+                        MenuItem {
+                            text: qsTr("Average (4 Frames)")
+                            onTriggered: {
+                                FrontToBackConnector.set_averaging_cnt(4)
+                                FrontToBackConnector.set_accumulation_mode("Average")
+                            }
+                        }
+                        MenuItem {
+                            text: qsTr("Average (16 Frames)")
+                            onTriggered: {
+                                FrontToBackConnector.set_averaging_cnt(16)
+                                FrontToBackConnector.set_accumulation_mode("Average")
+                            }
+                        }
+                        MenuItem {
+                            text: qsTr("Average (64 Frames)")
+                            onTriggered: {
+                                FrontToBackConnector.set_averaging_cnt(64)
+                                FrontToBackConnector.set_accumulation_mode("Average")
+                            }
+                        }
+                        MenuItem {
+                            text: qsTr("Persistence")
+                            onTriggered: {
+                                FrontToBackConnector.set_accumulation_mode("Persistence")
+                            }
+                        }
+                        MenuItem {
+                            text: qsTr("Clear")
+                            onTriggered: {
+                                FrontToBackConnector.clear_accumulation()
+                            }
+                        }
+                    }
                 }
                 //! The entries of the "Export" menu.
                 Menu {
@@ -133,6 +176,40 @@ ApplicationWindow {
                             FrontToBackConnector.save_as_csv()
                         }
                     }
+                    MenuItem {
+                        text: qsTr("As NPZ")
+                        onTriggered: {
+                            FrontToBackConnector.save_as_npz()
+                        }
+                    }
+                    MenuItem {
+                        text: qsTr("As HDF5")
+                        onTriggered: {
+                            FrontToBackConnector.save_as_hdf5()
+                        }
+                    }
+                    MenuItem {
+                        text: qsTr("As Parquet")
+                        onTriggered: {
+                            FrontToBackConnector.save_as_parquet()
+                        }
+                    }
+                }
+                //! The entries of the "Measure" menu.
+                Menu {
+                    title: qsTr("Measure")
+                    MenuItem {
+                        text: qsTr("Frequency Response (10 Hz - 100 kHz)")
+                        onTriggered: {
+                            FrontToBackConnector.measure_frequency_response(10, 100000, 100)
+                        }
+                    }
+                    MenuItem {
+                        text: qsTr("Stop Frequency Response")
+                        onTriggered: {
+                            FrontToBackConnector.stop_frequency_response()
+                        }
+                    }
                 }
                 //! The entries of the "About" menu.
                 Menu {
@@ -140,6 +140,8 @@ UniswagGenChSettingsBar {
         }
 
         UniswagButton {
+            id: arbDataButton
+
             labelText: "Arbitrary Data"
             buttonText: "Load"
             backgroundColor: settingsBar.backgroundColor
@@ -149,12 +151,29 @@ UniswagGenChSettingsBar {
             }
         }
 
+        UniswagTextfield {
+            id: freqSweep
+
+            labelText: "Freq. Sweep"
+            widthExtension: 60
+            textfieldPlaceholder: "Start, Stop, Steps, Dwell"
+            backgroundColor: settingsBar.backgroundColor
+            onConfirm: function(enteredText) {
+                // an empty input stops the running sweep
+                if (enteredText === "") {
+                    GenProperties._stop_sequence()
+                } else {
+                    GenProperties._freq_sweep(enteredText)
+                }
+            }
+        }
+
     }
 
     UniswagFiledialog {
         id: arbData
 
-        filterList: ["Comma-separated values (*.csv)"]
+        filterList: ["Waveform files (*.csv *.txt *.npy *.wav *.bin)", "Comma-separated values (*.csv *.txt)", "NumPy arrays (*.npy)", "WAV audio files (*.wav)", "Raw 32 bit float samples (*.bin)"]
         onFileSelect: function(fileName) {
             GenProperties._arb_data(fileName)
             settingsBar.updateDisplayedChannelData()
@@ -164,6 +183,20 @@ UniswagGenChSettingsBar {
     Connections {
         target: GenProperties
 
+        function onArbDataProgress(device_id, ch_num, value) {
+            if (!functions.isSelectedDevice(device_id, ch_num)) {
+                return
+            }
+            arbDataButton.buttonText = value < 1 ? Math.round(value * 100) + " %" : "Load"
+        }
+
+        function onSequenceStep(device_id, ch_num, value) {
+            if (!functions.isSelectedDevice(device_id, ch_num)) {
+                return
+            }
+            freqSweep.textfieldPlaceholder = "Step " + (value + 1)
+        }
+
         function onSigType(device_id, ch_num, value) {
             if (!functions.isSelectedDevice(device_id, ch_num)) {
                 return
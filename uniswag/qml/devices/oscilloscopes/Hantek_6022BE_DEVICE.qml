@@ -66,6 +66,10 @@ UniswagOscDevSettingsBar {
             }
         }
 
+        UniswagSoftTriggerSettings {
+            oscSettingsBar: settingsBar
+        }
+
         UniswagButton {
             id: startStop
 
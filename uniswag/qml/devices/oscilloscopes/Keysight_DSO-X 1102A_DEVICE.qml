@@ -78,6 +78,10 @@ UniswagOscDevSettingsBar {
             }
         }
 
+        UniswagSoftTriggerSettings {
+            oscSettingsBar: settingsBar
+        }
+
         UniswagButton {
             id: startStop
 
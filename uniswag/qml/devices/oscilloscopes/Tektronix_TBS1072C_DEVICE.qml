@@ -94,6 +94,10 @@ UniswagOscDevSettingsBar {
             }
         }
 
+        UniswagSoftTriggerSettings {
+            oscSettingsBar: settingsBar
+        }
+
         UniswagButton {
             id: startStop
 
@@ -137,6 +137,10 @@ UniswagOscDevSettingsBar {
             }
         }
 
+        UniswagSoftTriggerSettings {
+            oscSettingsBar: settingsBar
+        }
+
         UniswagButton {
             id: startStop
 
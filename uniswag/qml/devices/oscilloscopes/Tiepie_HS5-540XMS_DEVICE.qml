@@ -170,6 +170,10 @@ UniswagOscDevSettingsBar {
             }
         }
 
+        UniswagSoftTriggerSettings {
+            oscSettingsBar: settingsBar
+        }
+
         UniswagButton {
             id: startStop
 
@@ -152,6 +152,33 @@ ChartView {
         }
     }
 
+    //! The persistence image of all accumulated frames, covering exactly the plot area.
+    Image {
+        id: persistenceImage
+
+        //! Changes on every update, so that the image is requested again instead of being taken from cache.
+        property int updateCount: 0
+
+        x: scopeChartView.plotArea.x
+        y: scopeChartView.plotArea.y
+        width: scopeChartView.plotArea.width
+        height: scopeChartView.plotArea.height
+        visible: false
+        cache: false
+        smooth: false
+        source: visible? "image://persistence/" + updateCount: ""
+    }
+
+    Connections {
+        target: FrontToBackConnector
+        enabled: deviceType === "Osc"
+
+        function onPersistenceUpdated(value) {
+            persistenceImage.visible = value
+            persistenceImage.updateCount++
+        }
+    }
+
     TriggerSlider {
         id: triggerSlider
         height: parent.height - 85
@@ -0,0 +1,178 @@
+import QtQuick
+import QtQuick.Layouts
+
+
+RowLayout {
+    id: softTriggerSettings
+
+    property var oscSettingsBar
+    property var functions: oscSettingsBar.functions
+
+    UniswagCombobox {
+        id: softTriggerKind
+
+        labelText: "Soft Trigger"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onClick: function(selectedText) {
+            OscProperties._soft_trig_kind(selectedText)
+        }
+    }
+
+    UniswagCombobox {
+        id: softTriggerSource
+
+        labelText: "Soft Trig. Source"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onClick: function(selectedText) {
+            OscProperties._soft_trig_src(selectedText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerLevel
+
+        labelText: "Soft Trig. Level"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_lvl(enteredText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerLevelHigh
+
+        labelText: "Soft Trig. Upper Level"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_lvl_high(enteredText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerHysteresis
+
+        labelText: "Soft Trig. Hysteresis"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_hyst(enteredText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerWidth
+
+        labelText: "Soft Trig. Pulse Width"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_width(enteredText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerSegmentLength
+
+        labelText: "Soft Trig. Segment Length"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_seg_len(enteredText)
+        }
+    }
+
+    UniswagTextfield {
+        id: softTriggerPreRatio
+
+        labelText: "Soft Trig. Pre Ratio"
+        backgroundColor: softTriggerSettings.oscSettingsBar.backgroundColor
+        onConfirm: function(enteredText) {
+            OscProperties._soft_trig_pre_ratio(enteredText)
+        }
+    }
+
+    Connections {
+        target: softTriggerSettings.oscSettingsBar
+
+        function onReloadOscilloscopeSettings() {
+            OscProperties._soft_trig_kinds_avail()
+            OscProperties._soft_trig_srcs_avail()
+            OscProperties._soft_trig_lvl(NaN)
+            OscProperties._soft_trig_lvl_high(NaN)
+            OscProperties._soft_trig_hyst(NaN)
+            OscProperties._soft_trig_width(NaN)
+            OscProperties._soft_trig_seg_len(NaN)
+            OscProperties._soft_trig_pre_ratio(NaN)
+        }
+    }
+
+    Connections {
+        target: OscProperties
+
+        function onSoftTrigKindsAvail(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateComboboxList(softTriggerKind, value)
+        }
+        function onSoftTrigKind(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateComboboxSelection(softTriggerKind, value)
+        }
+
+        function onSoftTrigSrcsAvail(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateComboboxList(softTriggerSource, value)
+        }
+        function onSoftTrigSrc(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateComboboxSelection(softTriggerSource, value)
+        }
+
+        function onSoftTrigLvl(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateTextfield(softTriggerLevel, value)
+        }
+
+        function onSoftTrigLvlHigh(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateTextfield(softTriggerLevelHigh, value)
+        }
+
+        function onSoftTrigHyst(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateTextfield(softTriggerHysteresis, value)
+        }
+
+        function onSoftTrigWidth(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            let stringifiedValue = functions.listToString(value)
+            functions.updateTextfield(softTriggerWidth, stringifiedValue)
+        }
+
+        function onSoftTrigSegLen(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateTextfield(softTriggerSegmentLength, value)
+        }
+
+        function onSoftTrigPreRatio(device_id, value) {
+            if (!functions.isSelectedDevice(device_id)) {
+                return
+            }
+            functions.updateTextfield(softTriggerPreRatio, value)
+        }
+    }
+}
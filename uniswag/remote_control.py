@@ -0,0 +1,676 @@
+import asyncio
+import concurrent.futures
+import json
+import socket
+import threading
+
+from uniswag.devices.oscilloscope import Oscilloscope
+from uniswag.waveform_loader import load_waveform
+
+# the version of the JSON-RPC protocol
+JSONRPC_VERSION = '2.0'
+
+# the JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+DEVICE_ERROR = -32000
+
+
+def _to_int(value):
+    # integers may also be passed in floating point notation (e.g. 1e6)
+    return int(float(value))
+
+
+def _to_bool(value):
+    # the GUI passes booleans as strings
+    if isinstance(value, str):
+        return value.lower() == 'true'
+    return bool(value)
+
+
+def _to_float_list(value):
+    return [float(element) for element in value]
+
+
+# the properties provided by OscProperties and GenProperties, mapped to the functions which convert
+# the values to set (None for read-only properties), grouped by device/channel type;
+# the names are the ones of the underlying device and channel properties
+OSC_PROPERTIES = {
+    'is_running': None,
+    'measure_modes_avail': None,
+    'measure_mode': str,
+    'auto_res_avail': None,
+    'auto_res': str,
+    'res_avail': None,
+    'res': int,
+    'sample_freq': float,
+    'rec_len': _to_int,
+    'clock_src_avail': None,
+    'clock_src': str,
+    'clock_outs_avail': None,
+    'clock_out': str,
+    'pre_sample_ratio': float,
+    'seg_cnt': _to_int,
+    'trig_timeout': float,
+    'trig_delay': float,
+    'trig_holdoff': _to_int,
+    'trig_modes_avail': None,
+    'trig_mode': str,
+    'trig_sweeps_avail': None,
+    'trig_sweep': str,
+    'trig_slopes_avail': None,
+    'trig_slope': str,
+    'trigger_sources_avail': None,
+    'trigger_source': str,
+    'time_base': float,
+    'soft_trig_kinds_avail': None,
+    'soft_trig_kind': str,
+    'soft_trig_srcs_avail': None,
+    'soft_trig_src': _to_int,
+    'soft_trig_lvl': float,
+    'soft_trig_lvl_high': float,
+    'soft_trig_hyst': float,
+    'soft_trig_width': _to_float_list,
+    'soft_trig_seg_len': _to_int,
+    'soft_trig_pre_ratio': float
+}
+OSC_CH_PROPERTIES = {
+    'is_enabled': _to_bool,
+    'operands_avail': None,
+    'operand1': str,
+    'operand2': str,
+    'operators_avail': None,
+    'operator': str,
+    'shift': float,
+    'couplings_avail': None,
+    'coupling': str,
+    'probe_gain': float,
+    'probe_offset': float,
+    'is_auto_range': _to_bool,
+    'ranges_avail': None,
+    'range': float,
+    'is_trig_avail': None,
+    'is_trig_enabled': _to_bool,
+    'trig_kinds_avail': None,
+    'trig_kind': str,
+    'trig_lvl': _to_float_list,
+    'trig_hyst': _to_float_list,
+    'trig_cond_avail': None,
+    'trig_cond': str,
+    'trig_time': _to_float_list
+}
+GEN_PROPERTIES = {
+    'is_running': None,
+    'trig_src_avail': None,
+    'trig_src': str,
+    'trig_time': float
+}
+GEN_CH_PROPERTIES = {
+    'is_enabled': _to_bool,
+    'is_out_inv': _to_bool,
+    'sig_types_avail': None,
+    'sig_type': str,
+    'amp': float,
+    'is_amp_auto_range': _to_bool,
+    'offset': float,
+    'period': float,
+    'freq': float,
+    'freq_modes_avail': None,
+    'freq_mode': str,
+    'phase': float,
+    'symmetry': float,
+    'pulse_delay': float,
+    'pulse_hold': float,
+    'pulse_trans_lead': float,
+    'pulse_trans_trail': float,
+    'pulse_width': float,
+    'duty_cycle': float,
+    'impedance': float,
+    'modes_avail': None,
+    'mode': str,
+    'burst_modes_avail': None,
+    'burst_mode': str,
+    'is_burst_on': _to_bool,
+    'burst_cnt': _to_int,
+    'burst_sample_cnt': _to_int,
+    'burst_seg_cnt': _to_int,
+    'burst_delay': float
+}
+
+# the actions that can be invoked on devices, grouped by device type
+OSC_ACTIONS = ('start', 'stop', 'force_trig', 'reset')
+GEN_ACTIONS = ('start', 'stop', 'force_trig', 'reset')
+GEN_CH_ACTIONS = ('stop_sequence', 'load_arb_data')
+
+
+class RemoteControlError(Exception):
+    def __init__(self, code, message):
+        """
+        An error reported by the remote control API.
+
+        Args:
+            code (int):
+                The JSON-RPC error code.
+            message (str):
+                The description of the error.
+
+        Returns:
+            RemoteControlError:
+                A RemoteControlError object.
+        """
+        super().__init__(message)
+        self.code = code
+
+
+def _encode_value(value):
+    # numpy arrays and scalars are converted to lists and Python numbers, anything else to strings
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+
+class RemoteControl:
+    def __init__(self, device_manager, max_workers=4):
+        """
+        Provides the properties of OscProperties and GenProperties to remote clients via JSON-RPC 2.0.
+
+        The following methods are available:
+        'list_devices' provides the IDs and channel counts of all connected devices.
+        'list_properties' provides the names of all properties per device and channel type,
+        along with whether they can be set.
+        'get' reads the given properties of a device (or one of its channels).
+        'set' applies the given property values in the given order and reads them back afterwards.
+        'call' invokes an action (e.g. 'start') on a device (or one of its channels).
+        'bulk' executes a list of get, set and call requests in a single round trip; the requests of
+        different devices are executed concurrently, while those of the same device are executed in order.
+        Devices are identified by their IDs ('Vendor', 'Name', 'SerNo' and 'DevType'),
+        channels by their numbers.
+        As accessing a device may block, every request is executed in a thread pool.
+
+        Args:
+            device_manager (uniswag.device_manager.DeviceManager):
+                The device manager providing the connected devices.
+            max_workers (int):
+                The maximum number of devices accessed concurrently.
+
+        Returns:
+            RemoteControl:
+                A RemoteControl object.
+        """
+        self._device_manager = device_manager
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+        # the available JSON-RPC methods, mapped to their names
+        self._methods = {
+            'list_devices': self._list_devices,
+            'list_properties': self._list_properties,
+            'get': self._get,
+            'set': self._set,
+            'call': self._call,
+            'bulk': self._bulk
+        }
+
+    async def handle(self, message):
+        """
+        Executes a JSON-RPC message (a single request or a batch of requests).
+
+        The requests of a batch are executed one after another in the given order,
+        so that e.g. two settings of the same device are applied in the order they were sent
+        (use the method 'bulk' to access several devices concurrently).
+
+        Args:
+            message (str or bytes):
+                The JSON-RPC message.
+
+        Returns:
+            str or None:
+                The JSON-RPC response, or None if no response is required (notifications only).
+        """
+        try:
+            request = json.loads(message)
+        except ValueError as e:
+            return self._dump(self._error_response(None, PARSE_ERROR, 'Parse error: ' + str(e)))
+
+        if isinstance(request, list):
+            if not request:
+                return self._dump(self._error_response(None, INVALID_REQUEST, 'Empty batch'))
+            responses = []
+            for item in request:
+                response = await self._handle_request(item)
+                if response is not None:
+                    responses.append(response)
+            return self._dump(responses) if responses else None
+
+        response = await self._handle_request(request)
+        return self._dump(response) if response is not None else None
+
+    @staticmethod
+    def _dump(response):
+        return json.dumps(response, default=_encode_value)
+
+    @staticmethod
+    def _error_response(request_id, code, message):
+        return {'jsonrpc': JSONRPC_VERSION, 'error': {'code': code, 'message': message}, 'id': request_id}
+
+    async def _handle_request(self, request):
+        """
+        Executes a single JSON-RPC request.
+
+        Args:
+            request (Any):
+                The decoded request.
+
+        Returns:
+            dict[str, Any] or None:
+                The response, or None if the request is a notification.
+        """
+        if not isinstance(request, dict) or request.get('jsonrpc') != JSONRPC_VERSION \
+                or not isinstance(request.get('method'), str):
+            return self._error_response(None, INVALID_REQUEST, 'Invalid request')
+
+        request_id = request.get('id')
+        method = self._methods.get(request['method'])
+        params = request.get('params', {})
+
+        if method is None:
+            response = self._error_response(request_id, METHOD_NOT_FOUND, 'Method not found: ' + request['method'])
+        elif not isinstance(params, dict):
+            response = self._error_response(request_id, INVALID_PARAMS, 'The parameters must be passed by name.')
+        else:
+            try:
+                response = {'jsonrpc': JSONRPC_VERSION, 'result': await method(**params), 'id': request_id}
+            except TypeError as e:
+                response = self._error_response(request_id, INVALID_PARAMS, str(e))
+            except RemoteControlError as e:
+                response = self._error_response(request_id, e.code, str(e))
+            except Exception as e:
+                response = self._error_response(request_id, INTERNAL_ERROR, 'Internal error: ' + str(e))
+
+        return response if 'id' in request else None
+
+    def _run(self, func, *args):
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _list_devices(self):
+        def list_devices():
+            return [{'ID': dict(dev.id), 'Channels': dev.ch_cnt} for dev in self._device_manager.device_list]
+
+        return await self._run(list_devices)
+
+    async def _list_properties(self):
+        return {
+            kind: {name: converter is not None for name, converter in properties.items()}
+            for kind, properties in (('Osc', OSC_PROPERTIES), ('OscChannel', OSC_CH_PROPERTIES),
+                                     ('Gen', GEN_PROPERTIES), ('GenChannel', GEN_CH_PROPERTIES))
+        }
+
+    async def _get(self, device, names, channel=None):
+        return await self._run(self._execute, {'device': device, 'channel': channel, 'get': names})
+
+    async def _set(self, device, values, channel=None):
+        return await self._run(self._execute, {'device': device, 'channel': channel, 'set': values})
+
+    async def _call(self, device, action, channel=None, args=None):
+        return await self._run(self._execute, {'device': device, 'channel': channel,
+                                               'call': action, 'args': args or []})
+
+    async def _bulk(self, requests):
+        """
+        Executes a list of requests in a single round trip.
+
+        Args:
+            requests (list[dict[str, Any]]):
+                The requests, each with the keys 'device', 'channel' (optional) and one of the keys
+                'get' (a list of property names), 'set' (a dictionary of property values)
+                or 'call' (the name of an action, with its arguments under the key 'args').
+
+        Returns:
+            list[dict[str, Any]]:
+                A dictionary per request, in the same order, with either the key 'result' or 'error'.
+        """
+        if not isinstance(requests, list) or not all(isinstance(request, dict) for request in requests):
+            raise RemoteControlError(INVALID_PARAMS, 'The requests must be a list of objects.')
+
+        # group the requests by device, so that the requests of a device are executed in order
+        groups = {}
+        for index, request in enumerate(requests):
+            device_id = request.get('device')
+            key = json.dumps(device_id, sort_keys=True)
+            groups.setdefault(key, []).append(index)
+
+        def execute_group(indices):
+            results = []
+            for index in indices:
+                try:
+                    results.append({'result': self._execute(requests[index])})
+                except (RemoteControlError, TypeError) as e:
+                    results.append({'error': {'code': getattr(e, 'code', INVALID_PARAMS), 'message': str(e)}})
+            return results
+
+        group_indices = list(groups.values())
+        group_results = await asyncio.gather(*[self._run(execute_group, indices) for indices in group_indices])
+
+        results = [None] * len(requests)
+        for indices, group_result in zip(group_indices, group_results):
+            for index, result in zip(indices, group_result):
+                results[index] = result
+
+        return results
+
+    def _find_target(self, device_id, ch_no):
+        """
+        Looks up a device (or one of its channels) and the properties and actions it provides.
+
+        Args:
+            device_id (dict[str, str]):
+                The ID of the device.
+            ch_no (int or None):
+                The number of the channel (None for the device itself).
+
+        Returns:
+            (Any, dict[str, function], tuple[str]):
+                The Device or Channel object, its properties and its actions.
+
+        Raises:
+            RemoteControlError:
+                If the device or channel does not exist.
+        """
+        if not isinstance(device_id, dict) or not {'Vendor', 'Name', 'SerNo', 'DevType'} <= set(device_id):
+            raise RemoteControlError(INVALID_PARAMS, "The device ID needs the keys 'Vendor', 'Name', 'SerNo' and "
+                                                     "'DevType'.")
+
+        device = self._device_manager.get_device(device_id)
+        if device is None:
+            raise RemoteControlError(DEVICE_ERROR, 'Device not connected: ' + json.dumps(device_id))
+        is_osc = isinstance(device, Oscilloscope)
+
+        if ch_no is None:
+            if is_osc:
+                return device, OSC_PROPERTIES, OSC_ACTIONS
+            return device, GEN_PROPERTIES, GEN_ACTIONS
+
+        channel = next((ch for ch in device.ch if ch.id['No'] == ch_no), None)
+        if channel is None:
+            raise RemoteControlError(DEVICE_ERROR, 'Channel not found: ' + str(ch_no))
+        if is_osc:
+            return channel, OSC_CH_PROPERTIES, ()
+        return channel, GEN_CH_PROPERTIES, GEN_CH_ACTIONS
+
+    def _execute(self, request):
+        """
+        Executes a get, set or call request (blocking).
+
+        Args:
+            request (dict[str, Any]):
+                The request, see the bulk method.
+
+        Returns:
+            Any:
+                A dictionary of the (read back) property values for get and set requests,
+                the action's return value for call requests.
+
+        Raises:
+            RemoteControlError:
+                If the request is invalid or accessing the device fails.
+        """
+        target, properties, actions = self._find_target(request.get('device'), request.get('channel'))
+
+        if 'get' in request:
+            return {name: self._read(target, properties, name) for name in request['get']}
+
+        if 'set' in request:
+            values = request['set']
+            if not isinstance(values, dict):
+                raise RemoteControlError(INVALID_PARAMS, 'The values must be an object.')
+
+            for name, value in values.items():
+                if name not in properties:
+                    raise RemoteControlError(INVALID_PARAMS, 'Unknown property: ' + str(name))
+                if properties[name] is None:
+                    raise RemoteControlError(INVALID_PARAMS, 'Read-only property: ' + name)
+                try:
+                    setattr(target, name, properties[name](value))
+                except (TypeError, ValueError) as e:
+                    raise RemoteControlError(INVALID_PARAMS, 'Invalid value for ' + name + ': ' + str(e))
+                except Exception as e:
+                    raise RemoteControlError(DEVICE_ERROR, 'Could not set ' + name + ': ' + str(e))
+
+            return {name: self._read(target, properties, name) for name in values}
+
+        if 'call' in request:
+            action = request['call']
+            if action not in actions:
+                raise RemoteControlError(INVALID_PARAMS, 'Unknown action: ' + str(action))
+            try:
+                if action == 'load_arb_data':
+                    return self._load_arb_data(target, *request.get('args', []))
+                return getattr(target, action)(*request.get('args', []))
+            except RemoteControlError:
+                raise
+            except Exception as e:
+                raise RemoteControlError(DEVICE_ERROR, 'Could not ' + action + ': ' + str(e))
+
+        raise RemoteControlError(INVALID_PARAMS, "A request needs one of the keys 'get', 'set' or 'call'.")
+
+    @staticmethod
+    def _read(target, properties, name):
+        """
+        Reads a property of a device or channel.
+
+        Args:
+            target (Any):
+                The Device or Channel object.
+            properties (dict[str, function]):
+                The properties the object provides.
+            name (str):
+                The name of the property.
+
+        Returns:
+            Any:
+                The property's value (for 'operands_avail', the list of the operands' names).
+
+        Raises:
+            RemoteControlError:
+                If the property does not exist or cannot be read.
+        """
+        if name not in properties:
+            raise RemoteControlError(INVALID_PARAMS, 'Unknown property: ' + str(name))
+
+        try:
+            value = getattr(target, name)
+        except Exception as e:
+            raise RemoteControlError(DEVICE_ERROR, 'Could not get ' + name + ': ' + str(e))
+
+        # the operands are mapped to objects, only their names are of interest
+        if name == 'operands_avail':
+            value = list(value.keys())
+
+        return value
+
+    @staticmethod
+    def _load_arb_data(channel, file_name):
+        """
+        Loads an arbitrary waveform from a file and uploads it to a generator channel.
+
+        Args:
+            channel (uniswag.devices.generator.GenChannel):
+                The generator channel.
+            file_name (str):
+                The path of the file (on the machine running UniSWAG).
+
+        Returns:
+            bool:
+                Whether the waveform was uploaded.
+        """
+        data = load_waveform(file_name)
+        if data is None:
+            raise RemoteControlError(DEVICE_ERROR, 'Could not load a waveform from ' + file_name)
+
+        return bool(channel.arb_data(data))
+
+
+class RemoteControlServer:
+    def __init__(self, device_manager, host='127.0.0.1', port=0):
+        """
+        Serves the remote control API (see RemoteControl) via TCP, running an asyncio event loop in a separate thread.
+
+        Each line sent by a client is a JSON-RPC message, each response is sent as a single line as well.
+        A client may send further requests before receiving the responses to its previous ones;
+        the requests of a client are executed one after another in the order they were sent.
+
+        Args:
+            device_manager (uniswag.device_manager.DeviceManager):
+                The device manager providing the connected devices.
+            host (str):
+                The address to listen on (the loopback interface by default).
+            port (int):
+                The port to listen on (0 for any free port).
+
+        Returns:
+            RemoteControlServer:
+                A RemoteControlServer object.
+        """
+        self._remote_control = RemoteControl(device_manager)
+
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle_connection, host, port, limit=2 ** 24))
+
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self):
+        """
+        The address the server listens on.
+
+        Returns:
+            (str, int):
+                The host and port.
+        """
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Answers the requests of a client until it disconnects.
+
+        Args:
+            reader (asyncio.StreamReader):
+                The stream to read the requests from.
+            writer (asyncio.StreamWriter):
+                The stream to write the responses to.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                # the next request is only read once the previous one has been executed,
+                # so that the requests reach the devices in the order they were sent
+                response = await self._remote_control.handle(line)
+                if response is not None:
+                    writer.write(response.encode() + b'\n')
+                    await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client has disconnected or sent a line exceeding the limit
+            pass
+
+        writer.close()
+
+    def close(self):
+        """
+        Stops accepting clients and stops the event loop.
+        """
+        async def shut_down():
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shut_down(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+class RemoteControlClient:
+    def __init__(self, host='127.0.0.1', port=0, timeout=None):
+        """
+        A blocking client for the remote control API.
+
+        Args:
+            host (str):
+                The address of the server.
+            port (int):
+                The port of the server.
+            timeout (float or None):
+                The maximum time in seconds to wait for a response (None to wait indefinitely).
+
+        Returns:
+            RemoteControlClient:
+                A RemoteControlClient object.
+        """
+        self._connection = socket.create_connection((host, port), timeout)
+        self._connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._connection.makefile('rb')
+        self._next_id = 1
+
+    def call(self, method, **params):
+        """
+        Sends a JSON-RPC request and waits for its response.
+
+        Args:
+            method (str):
+                The name of the method.
+            **params:
+                The parameters of the method.
+
+        Returns:
+            Any:
+                The result.
+
+        Raises:
+            RemoteControlError:
+                If the server reports an error.
+            ConnectionError:
+                If the server has closed the connection.
+        """
+        request_id = self._next_id
+        self._next_id += 1
+
+        request = {'jsonrpc': JSONRPC_VERSION, 'method': method, 'params': params, 'id': request_id}
+        self._connection.sendall(json.dumps(request).encode() + b'\n')
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError('The server has closed the connection.')
+        response = json.loads(line)
+
+        if 'error' in response:
+            raise RemoteControlError(response['error']['code'], response['error']['message'])
+        return response['result']
+
+    def list_devices(self):
+        return self.call('list_devices')
+
+    def get(self, device, names, channel=None):
+        return self.call('get', device=device, names=list(names), channel=channel)
+
+    def set(self, device, values, channel=None):
+        return self.call('set', device=device, values=values, channel=channel)
+
+    def bulk(self, requests):
+        return self.call('bulk', requests=requests)
+
+    def close(self):
+        self._file.close()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,122 @@
+import importlib.util
+import sys
+import threading
+
+from uniswag.driver_registry import BUILTIN_DRIVERS, Driver, DriverRegistry
+from uniswag.simulation import handyscope_sim, hantekosc_sim, keysightosc_sim, tektronixosc_sim, tektronixsg_sim
+
+
+# the simulated vendor libraries, mapped to the names of the libraries (and their submodules) they replace
+SIMULATED_LIBRARIES = {
+    'handyscope': handyscope_sim,
+    'handyscope.library': handyscope_sim.library,
+    'keysightosc': keysightosc_sim,
+    'tektronixosc': tektronixosc_sim,
+    'tektronixsg': tektronixsg_sim,
+    'tektronixsg.channel': tektronixsg_sim.channel,
+    'tektronixsg.generator': tektronixsg_sim.generator,
+    'hantekosc': hantekosc_sim
+}
+
+# the driver modules that can be simulated, mapped to their short names
+DRIVER_MODULES = {
+    'tiepie_osc': 'uniswag.devices.oscilloscopes.tiepie_osc',
+    'tiepie_gen': 'uniswag.devices.generators.tiepie_gen',
+    'keysight_osc': 'uniswag.devices.oscilloscopes.keysight_osc',
+    'tektronix_osc': 'uniswag.devices.oscilloscopes.tektronix_osc',
+    'tektronix_gen': 'uniswag.devices.generators.tektronix_gen',
+    'hantek_osc': 'uniswag.devices.oscilloscopes.hantek_osc'
+}
+
+# a threading lock which ensures that the vendor libraries are only replaced by one thread at a time
+_mutex_load = threading.Lock()
+
+
+def load_simulated_module(short_name):
+    """
+    Loads a separate copy of a driver module which uses the simulated vendor libraries.
+
+    The driver code itself is not changed: while the copy is executed, the simulated libraries temporarily
+    take the place of the real ones in "sys.modules", so that the copy's imports are bound to them.
+    The real driver module (and the real vendor library, if installed) remains untouched.
+
+    Args:
+        short_name (str):
+            The short name of the driver module (see DRIVER_MODULES), e.g. 'tiepie_osc'.
+
+    Returns:
+        module:
+            The copy of the driver module, registered as "uniswag.simulation.drivers.<short name>".
+    """
+    name = __name__ + '.' + short_name
+
+    _mutex_load.acquire()
+
+    try:
+        if name not in sys.modules:
+            origin = importlib.util.find_spec(DRIVER_MODULES[short_name]).origin
+            spec = importlib.util.spec_from_file_location(name, origin)
+            module = importlib.util.module_from_spec(spec)
+
+            replaced = {lib_name: sys.modules.get(lib_name) for lib_name in SIMULATED_LIBRARIES}
+            sys.modules.update(SIMULATED_LIBRARIES)
+            try:
+                spec.loader.exec_module(module)
+            finally:
+                for lib_name, lib in replaced.items():
+                    if lib is None:
+                        del sys.modules[lib_name]
+                    else:
+                        sys.modules[lib_name] = lib
+
+            sys.modules[name] = module
+
+        result = sys.modules[name]
+    finally:
+        _mutex_load.release()
+
+    return result
+
+
+def __getattr__(name):
+    # provides the copies of the driver modules as attributes of this module,
+    # so that the driver registry can resolve references like "uniswag.simulation.drivers:tiepie_osc.TiepieOsc"
+    if name in DRIVER_MODULES:
+        return load_simulated_module(name)
+
+    raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
+
+
+def simulated_drivers():
+    """
+    The drivers of all natively supported vendors, using the simulated vendor libraries.
+
+    They equal the built-in drivers, except for the references to the driver modules.
+
+    Returns:
+        list[uniswag.driver_registry.Driver]:
+            The simulated drivers.
+    """
+    references = {module_name: __name__ + ':' + short_name for short_name, module_name in DRIVER_MODULES.items()}
+
+    def simulated(reference):
+        module_name, attribute = reference.split(':', 1)
+        return references[module_name] + '.' + attribute
+
+    return [Driver(driver.vendor, driver.vendor_matchers,
+                   [simulated(reference) for reference in driver.device_lists],
+                   {dev_type: [simulated(reference) for reference in classes]
+                    for dev_type, classes in driver.device_classes.items()},
+                   driver.visa_manufacturers, driver.detection_backoff)
+            for driver in BUILTIN_DRIVERS]
+
+
+def simulated_driver_registry():
+    """
+    A driver registry containing the simulated drivers of all natively supported vendors.
+
+    Returns:
+        uniswag.driver_registry.DriverRegistry:
+            The driver registry, which can be passed to the device manager.
+    """
+    return DriverRegistry(simulated_drivers())
@@ -0,0 +1,315 @@
+import ctypes
+import time
+import types
+
+import numpy as np
+
+from uniswag.simulation.instrument import get_instrument, list_instruments
+
+
+# the vendor of all devices provided by this library
+VENDOR = 'Tiepie'
+
+
+class DeviceList:
+    """
+    Emulates the device list of the "handyscope" library.
+    """
+    @staticmethod
+    def get_overview():
+        """
+        The overview of all connected (simulated) devices.
+
+        Returns:
+            list[dict[str, Any]]:
+                A dictionary with the keys 'Name' and 'SerNo' per device.
+        """
+        return [{'Name': instrument.name, 'SerNo': int(instrument.ser_no)} for instrument in list_instruments(VENDOR)]
+
+
+class Oscilloscope:
+    def __init__(self, instr_id, id_kind='serial number'):
+        """
+        Emulates an oscilloscope of the "handyscope" library.
+
+        A block measurement is finished once the frame delay of the simulated instrument has passed,
+        a stream measurement provides a new frame after every frame delay.
+
+        Args:
+            instr_id (int):
+                The serial number of the device.
+            id_kind (str):
+                The kind of ID (only 'serial number' is supported).
+
+        Returns:
+            Oscilloscope:
+                An Oscilloscope object.
+        """
+        self._instrument = get_instrument(VENDOR, instr_id)
+
+        # the handle passed to the simulated library functions
+        self._dev_handle = self
+
+        self.channels = [OscilloscopeChannel() for _ in range(self._instrument.ch_cnt)]
+
+        self.measure_modes_available = ('stream', 'block')
+        self.measure_mode = 'block'
+        self.resolutions_available = (8, 12, 14, 16)
+        self.resolution = 8
+        self.auto_resolutions_available = ('disabled', 'native', 'all')
+        self.auto_resolution = 'disabled'
+        self.clock_sources_available = ('internal', 'external')
+        self.clock_source = 'internal'
+        self.clock_outputs_available = ('disabled', 'sample', 'fixed')
+        self.clock_output = 'disabled'
+        self.sample_freq_max = self._instrument.sample_freq_max
+        self.sample_freq = self._instrument.sample_freq
+        self.record_length_max = self._instrument.record_length_max
+        self.record_length = self._instrument.record_length
+        self.pre_sample_ratio = 0.0
+        self.segment_cnt_max = 1024
+        self.segment_cnt = 1
+        self.is_trig_available = True
+        self.trig_timeout = -1
+        self.trig_delay_max = 1.0
+        self.trig_delay = 0.0
+        self.trig_holdoff_max = 1000000
+        self.trig_holdoff = 0
+
+        # whether a measurement has been started, the time at which its data is ready and whether it was fetched
+        self._running = False
+        self._ready_time = 0.0
+        self._fetched = True
+
+    @property
+    def is_running(self):
+        # a block measurement ends as soon as its data is ready
+        if self.measure_mode == 'block' and self._running and time.perf_counter() >= self._ready_time:
+            self._running = False
+
+        return self._running
+
+    @property
+    def is_data_ready(self):
+        return not self._fetched and time.perf_counter() >= self._ready_time
+
+    @property
+    def time_vector(self):
+        pre_sample_cnt = round(self.pre_sample_ratio * self.record_length)
+        return (np.arange(self.record_length) - pre_sample_cnt) / self.sample_freq
+
+    def _get_sample_cnts(self):
+        return 0, self.record_length
+
+    def start(self):
+        self._running = True
+        self._fetched = False
+        self._ready_time = time.perf_counter() + self._instrument.frame_delay(self.record_length, self.sample_freq)
+
+    def stop(self):
+        self._running = False
+
+    def force_trig(self):
+        return True
+
+    def close(self):
+        self._running = False
+
+    def retrieve(self, channel_numbers):
+        """
+        Provides the next frame's data of the requested channels as lists.
+
+        Args:
+            channel_numbers (list[int]):
+                The numbers of the channels to retrieve.
+
+        Returns:
+            list[list[float]]:
+                A list of samples per channel (empty for the channels that were not requested).
+        """
+        sample_cnt = self.record_length
+        buffers = [np.empty(sample_cnt, dtype=np.float32) if i + 1 in channel_numbers else None
+                   for i in range(len(self.channels))]
+        self._get_data([None if buffer is None else buffer.ctypes.data for buffer in buffers], 0, sample_cnt)
+
+        return [[] if buffer is None else buffer.tolist() for buffer in buffers]
+
+    def _get_data(self, pointer_array, start, sample_cnt):
+        """
+        Writes the next frame's data of the requested channels into the passed buffers.
+
+        Args:
+            pointer_array (list[int or None]):
+                The addresses of the float32 buffers, one per channel (None if the channel is not requested).
+            start (int):
+                The index of the first sample to write.
+            sample_cnt (int):
+                The number of samples to write.
+        """
+        data = self._instrument.acquire(start + sample_cnt, self.sample_freq, len(pointer_array))
+        for i, address in enumerate(pointer_array):
+            if address is not None:
+                buffer = np.ctypeslib.as_array((ctypes.c_float * sample_cnt).from_address(address))
+                buffer[:] = data[i, start:start + sample_cnt]
+                self._instrument.transfer(4 * sample_cnt)
+
+        # a stream measurement continues with the next frame
+        self._fetched = True
+        if self.measure_mode == 'stream' and self._running:
+            self._fetched = False
+            self._ready_time = time.perf_counter() + self._instrument.frame_delay(sample_cnt, self.sample_freq)
+
+
+class OscilloscopeChannel:
+    def __init__(self):
+        """
+        Emulates an oscilloscope channel of the "handyscope" library.
+
+        Returns:
+            OscilloscopeChannel:
+                An OscilloscopeChannel object.
+        """
+        self.is_enabled = True
+        self.is_available = True
+        self.couplings_available = ('dcv', 'acv')
+        self.coupling = 'dcv'
+        self.probe_gain = 1.0
+        self.probe_offset = 0.0
+        self.is_auto_range = False
+        self.ranges_available = (0.2, 0.4, 0.8, 2.0, 4.0, 8.0, 20.0, 40.0, 80.0)
+        self.range = 8.0
+        self.is_trig_available = True
+        self.is_trig_enabled = False
+        self.trig_kinds_available = ('rising', 'falling', 'in window', 'out window', 'any')
+        self.trig_kind = 'rising'
+        self.trig_lvl_mode = 'absolute'
+        self.trig_lvl_cnt = 1
+        self.trig_lvl = [0.0]
+        self.trig_hysteresis_cnt = 1
+        self.trig_hysteresis = [0.05]
+        self.trig_conditions_available = ('none', 'smaller', 'larger')
+        self.trig_condition = 'none'
+        self.trig_time_cnt = 1
+        self.trig_time = [0.0]
+
+
+class Generator:
+    def __init__(self, instr_id, id_kind='serial number'):
+        """
+        Emulates a signal generator of the "handyscope" library.
+
+        Args:
+            instr_id (int):
+                The serial number of the device.
+            id_kind (str):
+                The kind of ID (only 'serial number' is supported).
+
+        Returns:
+            Generator:
+                A Generator object.
+        """
+        self._instrument = get_instrument(VENDOR, instr_id)
+
+        # the handle passed to the simulated library functions
+        self._dev_handle = self
+
+        self.is_controllable = True
+        self.is_out_on = False
+        self.is_out_inv = False
+        self.signal_types_available = ('sine', 'triangle', 'square', 'DC', 'noise', 'arbitrary', 'pulse')
+        self.signal_type = 'sine'
+        self.amplitude_min = 0.0
+        self.amplitude_max = 12.0
+        self.amplitude = 1.0
+        self.amplitude_ranges_available = (0.2, 0.4, 0.8, 2.0, 4.0, 12.0)
+        self.amplitude_range = 12.0
+        self.is_amplitude_autorange = True
+        self.offset_min = -12.0
+        self.offset_max = 12.0
+        self.offset = 0.0
+        self.freq_min = 0.001
+        self.freq_max = 40000000.0
+        self.freq = 1000.0
+        self.freq_modes_available = ('signal', 'sample')
+        self.freq_mode = 'signal'
+        self.phase_min = 0.0
+        self.phase_max = 1.0
+        self.phase = 0.0
+        self.symmetry_min = 0.0
+        self.symmetry_max = 1.0
+        self.symmetry = 0.5
+        self.pulse_width_min = 0.0
+        self.pulse_width_max = 1.0
+        self.pulse_width = 0.0005
+        self.modes_available = ('continuous', 'burst count')
+        self.mode = 'continuous'
+        self.burst_cnt_min = 1
+        self.burst_cnt_max = 4294967295
+        self.burst_cnt = 1
+        self.burst_sample_cnt_min = 1
+        self.burst_sample_cnt_max = 4294967295
+        self.burst_sample_cnt = 1
+        self.burst_segment_cnt_min = 1
+        self.burst_segment_cnt_max = 4294967295
+        self.burst_segment_cnt = 1
+        self.arb_data_length_min = 1
+        self.arb_data_length_max = 65536
+
+        # the content of the waveform buffer
+        self.arb_data = np.zeros(1, dtype=np.float32)
+
+    def start(self):
+        return True
+
+    def stop(self):
+        return True
+
+    def close(self):
+        self.is_out_on = False
+
+    def _set_data(self, address, sample_cnt):
+        """
+        Copies arbitrary data into the waveform buffer.
+
+        Args:
+            address (int):
+                The address of the float32 buffer containing the data.
+            sample_cnt (int):
+                The number of samples.
+        """
+        buffer = np.ctypeslib.as_array((ctypes.c_float * sample_cnt).from_address(address))
+        self._instrument.transfer(4 * sample_cnt)
+        self.arb_data = buffer.copy()
+
+
+class _LibTiePie:
+    """
+    Emulates the functions of the "libtiepie" library that are called directly.
+    """
+    @staticmethod
+    def HlpPointerArrayNew(length):
+        return [None] * length
+
+    @staticmethod
+    def HlpPointerArraySet(pointer_array, index, pointer):
+        pointer_array[index] = pointer
+
+    @staticmethod
+    def HlpPointerArrayDelete(pointer_array):
+        pass
+
+    @staticmethod
+    def ScpGetData(handle, pointer_array, ch_cnt, start, sample_cnt):
+        handle._get_data(pointer_array[:ch_cnt], start, sample_cnt)
+        return sample_cnt
+
+    @staticmethod
+    def GenSetData(handle, buffer, sample_cnt):
+        handle._set_data(buffer, sample_cnt)
+
+
+libtiepie = _LibTiePie()
+
+# the "handyscope.library" module
+library = types.ModuleType('handyscope.library')
+library.libtiepie = libtiepie
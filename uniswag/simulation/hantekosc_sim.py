@@ -0,0 +1,95 @@
+import numpy as np
+
+from uniswag.simulation.instrument import get_instrument, list_instruments
+
+
+# the vendor of all devices provided by this library
+VENDOR = 'Hantek'
+
+
+def list_connected_hantek_devices():
+    """
+    The list of all connected (simulated) Hantek oscilloscopes.
+
+    Returns:
+        list[dict[str, str]]:
+            A dictionary with the keys 'Model' and 'Serial Number' per device.
+    """
+    return [{'Model': instrument.name, 'Serial Number': instrument.ser_no} for instrument in list_instruments(VENDOR)]
+
+
+class Oscilloscope:
+    def __init__(self, serial_number):
+        """
+        Emulates an oscilloscope of the "hantekosc" library.
+
+        Every channel reports new data once per frame, asking an already reporting channel again acquires a new frame.
+
+        Args:
+            serial_number (str):
+                The serial number of the device.
+
+        Returns:
+            Oscilloscope:
+                An Oscilloscope object.
+        """
+        self._instrument = get_instrument(VENDOR, serial_number)
+
+        self.channels = [Channel(self, i) for i in range(self._instrument.ch_cnt)]
+
+        self.running = False
+        self.selected_channel = 0
+        self.max_sample_rate = self._instrument.sample_freq_max
+        self.sample_rate = self._instrument.sample_freq
+        self.max_record_length = self._instrument.record_length_max
+        self.record_length = self._instrument.record_length
+        self.pre_sample_ratio = 0.0
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+
+class Channel:
+    def __init__(self, oscilloscope, index):
+        """
+        Emulates an oscilloscope channel of the "hantekosc" library.
+
+        Args:
+            oscilloscope (Oscilloscope):
+                The oscilloscope the channel belongs to.
+            index (int):
+                The index of the channel (starting at 0).
+
+        Returns:
+            Channel:
+                A Channel object.
+        """
+        self._osc = oscilloscope
+        self.ch_number = index
+
+        self.is_enabled = True
+        self.voltage_ranges_available = [0.5, 1.0, 2.5, 5.0]
+        self.voltage_range = 5.0
+        self.trigger_kinds_available = ['rising', 'falling']
+        self.trigger_kind = 'rising'
+        self.trigger_level = 0.0
+
+    @property
+    def new_data_ready(self):
+        instrument = self._osc._instrument
+        instrument.request_channel(self.ch_number, self._osc.record_length, self._osc.sample_rate)
+        instrument.transfer(self._osc.record_length)
+
+        return True
+
+    @property
+    def retrieved_data(self):
+        sample_cnt = self._osc.record_length
+        sample_rate = self._osc.sample_rate
+        data = self._osc._instrument.current_channel(self.ch_number, sample_cnt, sample_rate)
+
+        pre_sample_cnt = round(self._osc.pre_sample_ratio * sample_cnt)
+        return (np.arange(sample_cnt) - pre_sample_cnt) / sample_rate, data
@@ -0,0 +1,292 @@
+import threading
+import time
+
+import numpy as np
+
+
+class SimulatedInstrument:
+    def __init__(self, name, ser_no, ch_cnt=2, sample_freq=1e6, record_length=10000, sample_freq_max=1e9,
+                 record_length_max=10000000, latency=0.0, noise=0.01, throughput=None, realtime=False,
+                 signal_freq=1e3, amplitude=1.0, seed=None):
+        """
+        The hardware behind a simulated vendor library device (oscilloscope or signal generator).
+
+        Provides the measurement data of simulated oscilloscopes (a sine per channel, each channel shifted by 90°,
+        with additive white Gaussian noise) and emulates the timing of real hardware:
+        a fixed latency per acquired frame, optionally the time it takes to capture the record
+        and the limited throughput of the USB transfer.
+
+        Args:
+            name (str):
+                The model name of the device (e.g. 'HS5' or 'DSOX1102A').
+            ser_no (str):
+                The serial number of the device.
+            ch_cnt (int):
+                The number of channels.
+            sample_freq (float):
+                The initial sample frequency in hertz.
+            record_length (int):
+                The initial number of samples per channel and frame.
+            sample_freq_max (float):
+                The maximum sample frequency in hertz.
+            record_length_max (int):
+                The maximum number of samples per channel and frame.
+            latency (float):
+                The time in seconds it takes to acquire a frame (e.g. trigger and command round trips).
+            noise (float):
+                The standard deviation of the noise added to the measurement data in volts (0 disables the noise).
+            throughput (float or None):
+                The number of bytes per second transferred via USB (None for an unlimited throughput).
+            realtime (bool):
+                Whether acquiring a frame additionally takes as long as capturing the record in real time.
+            signal_freq (float):
+                The frequency of the measured sine in hertz.
+            amplitude (float):
+                The amplitude of the measured sine in volts.
+            seed (int or None):
+                The seed of the noise generator (None for a random seed).
+
+        Returns:
+            SimulatedInstrument:
+                A SimulatedInstrument object.
+        """
+        self.name = name
+        self.ser_no = str(ser_no)
+        self.ch_cnt = ch_cnt
+        self.sample_freq = sample_freq
+        self.record_length = record_length
+        self.sample_freq_max = max(sample_freq_max, sample_freq)
+        self.record_length_max = max(record_length_max, record_length)
+        self.latency = latency
+        self.noise = noise
+        self.throughput = throughput
+        self.realtime = realtime
+        self.signal_freq = signal_freq
+        self.amplitude = amplitude
+
+        # the generator of the noise
+        self._rng = np.random.default_rng(seed)
+
+        # the time of the first sample of the next frame (so that consecutive frames are continuous)
+        self._t0 = 0.0
+
+        # the most recently acquired frame and the channels that have been delivered from it
+        self._frame = None
+        self._delivered = set()
+
+        # a threading lock which ensures thread-safe access to the frames
+        self._mutex_frame = threading.Lock()
+
+    def frame_delay(self, sample_cnt, sample_freq):
+        """
+        The time it takes to acquire a frame.
+
+        Args:
+            sample_cnt (int):
+                The number of samples per channel.
+            sample_freq (float):
+                The sample frequency in hertz.
+
+        Returns:
+            float:
+                The delay in seconds.
+        """
+        delay = self.latency
+        if self.realtime and sample_freq > 0:
+            delay += sample_cnt / sample_freq
+
+        return delay
+
+    def transfer(self, byte_cnt):
+        """
+        Blocks for the time it takes to transfer the given number of bytes via USB.
+
+        Args:
+            byte_cnt (int):
+                The number of bytes.
+        """
+        if self.throughput:
+            time.sleep(byte_cnt / self.throughput)
+
+    def acquire(self, sample_cnt, sample_freq, ch_cnt=None):
+        """
+        Generates the measurement data of a frame (without any delay).
+
+        Args:
+            sample_cnt (int):
+                The number of samples per channel.
+            sample_freq (float):
+                The sample frequency in hertz.
+            ch_cnt (int or None):
+                The number of channels (all channels by default).
+
+        Returns:
+            np.ndarray:
+                The measurement data in volts as a 2-D float32 array of the shape channels × samples.
+        """
+        if ch_cnt is None:
+            ch_cnt = self.ch_cnt
+
+        omega = 2 * np.pi * self.signal_freq
+        phase = self._t0 * omega + np.arange(sample_cnt) * (omega / sample_freq)
+        self._t0 += sample_cnt / sample_freq
+
+        data = np.empty((ch_cnt, sample_cnt), dtype=np.float32)
+        for i in range(ch_cnt):
+            data[i] = np.sin(phase - i * np.pi / 2)
+        data *= self.amplitude
+
+        if self.noise:
+            data += self._rng.standard_normal((ch_cnt, sample_cnt), dtype=np.float32) * np.float32(self.noise)
+
+        return data
+
+    def request_channel(self, ch_index, sample_cnt, sample_freq):
+        """
+        Provides the next data of a single channel, as done by libraries which read the channels one by one.
+
+        A new frame is acquired (blocking for the frame delay) whenever the requested channel
+        has already been delivered from the current frame or the frame's dimensions changed.
+        Afterwards, the channel is considered delivered.
+
+        Args:
+            ch_index (int):
+                The index of the channel (starting at 0).
+            sample_cnt (int):
+                The number of samples per channel.
+            sample_freq (float):
+                The sample frequency in hertz.
+
+        Returns:
+            np.ndarray:
+                The channel's measurement data in volts as a float32 vector.
+        """
+        self._mutex_frame.acquire()
+
+        if self._frame is None or ch_index in self._delivered or self._frame.shape[1] != sample_cnt:
+            delay = self.frame_delay(sample_cnt, sample_freq)
+            if delay > 0:
+                time.sleep(delay)
+            self._frame = self.acquire(sample_cnt, sample_freq)
+            self._delivered = set()
+        self._delivered.add(ch_index)
+        result = self._frame[ch_index]
+
+        self._mutex_frame.release()
+
+        return result
+
+    def current_channel(self, ch_index, sample_cnt, sample_freq):
+        """
+        Provides the data of a single channel from the current frame (acquiring one if there is none yet).
+
+        Args:
+            ch_index (int):
+                The index of the channel (starting at 0).
+            sample_cnt (int):
+                The number of samples per channel.
+            sample_freq (float):
+                The sample frequency in hertz.
+
+        Returns:
+            np.ndarray:
+                The channel's measurement data in volts as a float32 vector.
+        """
+        self._mutex_frame.acquire()
+        if self._frame is None or self._frame.shape[1] != sample_cnt:
+            self._frame = self.acquire(sample_cnt, sample_freq)
+            self._delivered = set()
+        result = self._frame[ch_index]
+        self._mutex_frame.release()
+
+        return result
+
+
+# the simulated instruments that are currently "connected", mapped to the vendor and serial number
+_instruments = {}
+
+# a threading lock which ensures thread-safe access to the simulated instruments
+_mutex_instruments = threading.Lock()
+
+
+def add_instrument(vendor, instrument):
+    """
+    "Connects" a simulated instrument, so that the simulated library of its vendor can list and open it.
+
+    Args:
+        vendor (str):
+            The name of the vendor, as used in the devices' IDs (e.g. 'Tiepie').
+        instrument (SimulatedInstrument):
+            The simulated instrument.
+    """
+    _mutex_instruments.acquire()
+    _instruments[(vendor, instrument.ser_no)] = instrument
+    _mutex_instruments.release()
+
+
+def remove_instrument(vendor, ser_no):
+    """
+    "Disconnects" a simulated instrument.
+
+    Args:
+        vendor (str):
+            The name of the vendor.
+        ser_no (str):
+            The serial number of the instrument.
+
+    Returns:
+        SimulatedInstrument or None:
+            The removed instrument, or None if no such instrument is connected.
+    """
+    _mutex_instruments.acquire()
+    result = _instruments.pop((vendor, str(ser_no)), None)
+    _mutex_instruments.release()
+
+    return result
+
+
+def get_instrument(vendor, ser_no):
+    """
+    The connected simulated instrument with the given serial number.
+
+    Args:
+        vendor (str):
+            The name of the vendor.
+        ser_no (str):
+            The serial number of the instrument.
+
+    Raises:
+        OSError:
+            If no such instrument is connected (like the vendor libraries do when opening a missing device).
+
+    Returns:
+        SimulatedInstrument:
+            The simulated instrument.
+    """
+    _mutex_instruments.acquire()
+    result = _instruments.get((vendor, str(ser_no)))
+    _mutex_instruments.release()
+
+    if result is None:
+        raise OSError('No simulated ' + vendor + ' device with serial number ' + str(ser_no) + ' is connected.')
+
+    return result
+
+
+def list_instruments(vendor):
+    """
+    All connected simulated instruments of a vendor.
+
+    Args:
+        vendor (str):
+            The name of the vendor.
+
+    Returns:
+        list[SimulatedInstrument]:
+            The simulated instruments in the order in which they were connected.
+    """
+    _mutex_instruments.acquire()
+    result = [instrument for (inst_vendor, _), instrument in _instruments.items() if inst_vendor == vendor]
+    _mutex_instruments.release()
+
+    return result
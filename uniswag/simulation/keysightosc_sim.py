@@ -0,0 +1,97 @@
+import numpy as np
+
+from uniswag.simulation.instrument import get_instrument, list_instruments
+
+
+# the vendor of all devices provided by this library
+VENDOR = 'Keysight'
+
+
+def list_connected_keysight_oscilloscopes():
+    """
+    The list of all connected (simulated) Keysight oscilloscopes.
+
+    Returns:
+        list[dict[str, str]]:
+            A dictionary with the keys 'Manufacturer', 'Model' and 'Serial Number' per device.
+    """
+    return [{'Manufacturer': 'KEYSIGHT TECHNOLOGIES', 'Model': instrument.name, 'Serial Number': instrument.ser_no}
+            for instrument in list_instruments(VENDOR)]
+
+
+class Oscilloscope:
+    def __init__(self, resource):
+        """
+        Emulates an oscilloscope of the "keysightosc" library.
+
+        The channels are read one after another, each read of an already read channel acquires a new frame.
+
+        Args:
+            resource (str):
+                The serial number of the device.
+
+        Returns:
+            Oscilloscope:
+                An Oscilloscope object.
+        """
+        self._instrument = get_instrument(VENDOR, resource)
+
+        self.channels = [Channel(self, i) for i in range(self._instrument.ch_cnt)]
+
+        self.waveform_count_max = self._instrument.record_length_max
+        self.reset()
+
+    @property
+    def acquire_sample_rate(self):
+        return self._instrument.sample_freq
+
+    def reset(self):
+        self.waveform_points_mode = 'NORM'
+        self.waveform_points = self._instrument.record_length
+        self.timebase_scale = self._instrument.record_length / self._instrument.sample_freq / 10
+        self.trig_mode = 'EDGE'
+        self.trig_sweep = 'AUTO'
+        self.trig_slope = 'POS'
+
+    def run(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def get_time_vector(self):
+        return np.arange(self.waveform_points) / self._instrument.sample_freq
+
+
+class Channel:
+    def __init__(self, oscilloscope, index):
+        """
+        Emulates an oscilloscope channel of the "keysightosc" library.
+
+        Args:
+            oscilloscope (Oscilloscope):
+                The oscilloscope the channel belongs to.
+            index (int):
+                The index of the channel (starting at 0).
+
+        Returns:
+            Channel:
+                A Channel object.
+        """
+        self._osc = oscilloscope
+        self._index = index
+
+        self.attenuation = 1
+        self.display = 1
+        self.offset = 0.0
+        self.y_range = 8.0
+        self.coupling = 'DC'
+        self.trig_lvl = 0.0
+
+    def get_signal(self):
+        instrument = self._osc._instrument
+        sample_cnt = self._osc.waveform_points
+        result = instrument.request_channel(self._index, sample_cnt, instrument.sample_freq)
+        instrument.transfer(2 * sample_cnt)
+
+        return result
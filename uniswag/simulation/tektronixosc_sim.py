@@ -0,0 +1,92 @@
+import numpy as np
+
+from uniswag.simulation.instrument import get_instrument, list_instruments
+
+
+# the vendor of all devices provided by this library
+VENDOR = 'Tektronix'
+
+
+def list_connected_tektronix_oscilloscopes():
+    """
+    The list of all connected (simulated) Tektronix oscilloscopes (models containing 'TBS').
+
+    Returns:
+        list[dict[str, str]]:
+            A dictionary with the keys 'Manufacturer', 'Model' and 'Serial Number' per device.
+    """
+    return [{'Manufacturer': 'TEKTRONIX', 'Model': instrument.name, 'Serial Number': instrument.ser_no}
+            for instrument in list_instruments(VENDOR) if 'TBS' in instrument.name]
+
+
+class Oscilloscope:
+    def __init__(self, resource):
+        """
+        Emulates an oscilloscope of the "tektronixosc" library.
+
+        The channels are read one after another, each read of an already read channel acquires a new frame.
+
+        Args:
+            resource (str):
+                The serial number of the device.
+
+        Returns:
+            Oscilloscope:
+                An Oscilloscope object.
+        """
+        self._instrument = get_instrument(VENDOR, resource)
+
+        self.channels = [Channel(self, i) for i in range(self._instrument.ch_cnt)]
+
+        self.max_sample_rate = self._instrument.sample_freq_max
+        self.reset()
+
+    def reset(self):
+        self.sample_rate = self._instrument.sample_freq
+        self.record_length = self._instrument.record_length
+        self.pre_sample_ratio = 0.0
+        self.trig_type = 'EDGE'
+        self.trig_slope = 'RISE'
+        self.trig_source = 'CH1'
+        self.data_source = 'CH1'
+
+    def run(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+class Channel:
+    def __init__(self, oscilloscope, index):
+        """
+        Emulates an oscilloscope channel of the "tektronixosc" library.
+
+        Args:
+            oscilloscope (Oscilloscope):
+                The oscilloscope the channel belongs to.
+            index (int):
+                The index of the channel (starting at 0).
+
+        Returns:
+            Channel:
+                A Channel object.
+        """
+        self._osc = oscilloscope
+        self._index = index
+
+        self.attenuation = 1
+        self.enabled = True
+        self.offset = 0.0
+        self.coupling = 'DC'
+        self.trig_lvl = 0.0
+
+    def get_signal(self):
+        instrument = self._osc._instrument
+        sample_cnt = self._osc.record_length
+        sample_rate = self._osc.sample_rate
+        data = instrument.request_channel(self._index, sample_cnt, sample_rate)
+        instrument.transfer(2 * sample_cnt)
+
+        pre_sample_cnt = round(self._osc.pre_sample_ratio * sample_cnt)
+        return (np.arange(sample_cnt) - pre_sample_cnt) / sample_rate, data
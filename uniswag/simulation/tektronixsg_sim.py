@@ -0,0 +1,185 @@
+import types
+
+import numpy as np
+
+from uniswag.simulation.instrument import get_instrument, list_instruments
+
+
+# the vendor of all devices provided by this library
+VENDOR = 'Tektronix'
+
+
+def list_connected_tektronix_generators():
+    """
+    The list of all connected (simulated) Tektronix signal generators (models not containing 'TBS').
+
+    Returns:
+        list[dict[str, str]]:
+            A dictionary with the keys 'Manufacturer', 'Model' and 'Serial Number' per device.
+    """
+    return [{'Manufacturer': 'TEKTRONIX', 'Model': instrument.name, 'Serial Number': instrument.ser_no}
+            for instrument in list_instruments(VENDOR) if 'TBS' not in instrument.name]
+
+
+def list_connected_devices():
+    """
+    The VISA resource strings of all connected (simulated) Tektronix signal generators.
+
+    Returns:
+        list[str]:
+            The resource strings, which contain the serial numbers as their fourth part.
+    """
+    return ['USB0::0x0699::0x0353::' + instrument.ser_no + '::INSTR'
+            for instrument in list_instruments(VENDOR) if 'TBS' not in instrument.name]
+
+
+class SignalGenerator:
+    def __init__(self, resource):
+        """
+        Emulates a signal generator of the "tektronixsg" library.
+
+        Arbitrary data written via the raw VISA instrument is decoded and stored in the channel's edit memory.
+
+        Args:
+            resource (str):
+                The VISA resource string of the device.
+
+        Returns:
+            SignalGenerator:
+                A SignalGenerator object.
+        """
+        if resource is None:
+            raise OSError('The simulated Tektronix signal generator is not connected.')
+        self._instrument_sim = get_instrument(VENDOR, resource.split('::')[3])
+
+        self.connected_device = self._instrument_sim.name
+        self._instrument = _Instrument(self)
+
+        self.channels = [Channel(self) for _ in range(self._instrument_sim.ch_cnt)]
+
+        # the content of the edit memory of each channel, mapped to the channel number
+        self._emem = {}
+
+        self.reset()
+
+    def reset(self):
+        self.trigger_source = 'timer'
+        self.trigger_timer = 0.001
+        for channel in self.channels:
+            channel.reset()
+        self._emem = {i + 1: np.full(2, 8191) for i in range(len(self.channels))}
+
+    def send_trigger(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read_data_emom(self, ch_no):
+        return list(self._emem.get(ch_no, [8191, 8191]))
+
+    def _receive(self, message):
+        """
+        Decodes a "DATA:DATA EMEM" command and stores its binary block in the edit memory.
+
+        Args:
+            message (bytes):
+                The complete command.
+        """
+        header, _, block = message.partition(b'#')
+        if not header.startswith(b'DATA:DATA EMEM') or not block:
+            return
+
+        memory = header[len(b'DATA:DATA EMEM'):].rstrip(b',')
+        digit_cnt = int(block[:1])
+        length = int(block[1:1 + digit_cnt])
+        payload = block[1 + digit_cnt:1 + digit_cnt + length]
+        self._emem[int(memory) if memory else 1] = np.frombuffer(payload, dtype='>i2').astype(int)
+
+
+class _Instrument:
+    def __init__(self, generator):
+        """
+        Emulates the raw PyVISA instrument of a signal generator.
+
+        Args:
+            generator (SignalGenerator):
+                The signal generator the instrument belongs to.
+
+        Returns:
+            _Instrument:
+                An _Instrument object.
+        """
+        self._generator = generator
+        self.send_end = True
+        self.write_termination = '\n'
+
+        # the parts of the message that is currently being written
+        self._pending = bytearray()
+
+    def write_raw(self, message):
+        self._generator._instrument_sim.transfer(len(message))
+        self._pending += message
+        if self.send_end:
+            self._generator._receive(bytes(self._pending))
+            self._pending = bytearray()
+
+    def query(self, message):
+        return '1'
+
+
+class Channel:
+    def __init__(self, generator):
+        """
+        Emulates a signal generator channel of the "tektronixsg" library.
+
+        Args:
+            generator (SignalGenerator):
+                The signal generator the channel belongs to.
+
+        Returns:
+            Channel:
+                A Channel object.
+        """
+        self.generator = generator
+        self.reset()
+
+    def reset(self):
+        self.output_on = False
+        self.signal_type = 'sine'
+        self.voltage_max = 5.0
+        self.voltage_min = -5.0
+        self.voltage_offset = 0.0
+        self.voltage_amplitude = 1.0
+        self.impedance = 50
+        self.frequency = 1000.0
+        self.phase = 0.0
+        self.burst_on = False
+        self.burst_mode = 'triggered'
+        self.burst_cycles = 1
+        self.burst_delay = 0.0
+        self.pulse_width = 0.0005
+        self.pulse_duty = 50.0
+        self.pulse_delay = 0.0
+        self.pulse_hold = 'width'
+        self.pulse_leading_transition = 1e-08
+        self.pulse_trailing_transition = 1e-08
+
+    @property
+    def pulse_period(self):
+        return 1 / self.frequency
+
+    @pulse_period.setter
+    def pulse_period(self, value):
+        self.frequency = 1 / value
+
+
+# the "tektronixsg.channel" and "tektronixsg.generator" modules
+channel = types.ModuleType('tektronixsg.channel')
+channel.Channel = Channel
+channel.BURST_MODE = {'triggered': 'TRIG', 'gated': 'GAT'}
+channel.SIGNAL_TYPES_AFG1022 = {'sine': 'SIN', 'square': 'SQU', 'pulse': 'PULS', 'ramp': 'RAMP', 'memory1': 'EMEM1'}
+channel.SIGNAL_TYPES_AFG31000 = dict(channel.SIGNAL_TYPES_AFG1022, memory2='EMEM2')
+generator = types.ModuleType('tektronixsg.generator')
+generator.SignalGenerator = SignalGenerator
+generator.TRIGGER_SOURCE = {'timer': 'TIM', 'external': 'EXT'}
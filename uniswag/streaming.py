@@ -0,0 +1,533 @@
+import collections
+import json
+import socket
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from uniswag.headless import device_key
+
+# the header preceding every frame message, consisting of
+# the magic bytes, the protocol version, the flags, the number of channels, the frame number,
+# the UNIX time of publication, the number of samples per channel, the decimation factor,
+# the first time value, the time step, the length of the device key and the length of the payload
+HEADER = struct.Struct('<4sBBHQdIIddHI')
+
+# the magic bytes at the beginning of every frame message
+MAGIC = b'USWF'
+
+# the version of the message format
+VERSION = 1
+
+# the flag indicating that the payload is compressed with zlib
+FLAG_COMPRESSED = 0x01
+
+# the ways of handling a client that cannot keep up with the published frames:
+# discard its oldest queued frame, discard the new frame or close its connection
+DROP_POLICIES = ('drop_oldest', 'drop_newest', 'disconnect')
+
+
+def encode_frame(key, retrieved_vals, timestamp, decimation=1, compress=False):
+    """
+    Encodes the measurement data of an oscilloscope frame as a binary message.
+
+    The message consists of the header (see HEADER), the device key (UTF-8), the channel numbers
+    (one unsigned 16-bit integer each) and the payload, which contains the voltage vectors of all channels
+    as little-endian float32 values (channels × samples).
+    The time vector is not transmitted, but described by its first value and the time step.
+    If the channels' vectors differ in length, the surplus values are omitted.
+
+    Args:
+        key (str):
+            The key of the oscilloscope (as provided by uniswag.headless.device_key).
+        retrieved_vals (dict[str, Any]):
+            The measurement data as provided by the oscilloscope's retrieving method.
+        timestamp (float):
+            The UNIX time at which the frame was published.
+        decimation (int):
+            Only every n-th sample is transmitted.
+        compress (bool):
+            Whether the payload is compressed with zlib.
+
+    Returns:
+        bytes:
+            The message.
+    """
+    points = retrieved_vals['Points']
+    ch_numbers = sorted(points)
+    length = min((min(len(points[no][0][0]), len(points[no][0][1])) for no in ch_numbers), default=0)
+
+    time_vector = np.asarray(points[ch_numbers[0]][0][0][:length:decimation]) if ch_numbers else np.zeros(0)
+    data = np.empty((len(ch_numbers), len(time_vector)), dtype='<f4')
+    for i, no in enumerate(ch_numbers):
+        data[i] = points[no][0][1][:length:decimation]
+
+    first_time = float(time_vector[0]) if len(time_vector) else 0.0
+    time_step = float(time_vector[-1] - time_vector[0]) / (len(time_vector) - 1) if len(time_vector) > 1 else 0.0
+
+    payload = data.tobytes()
+    flags = 0
+    if compress:
+        # the fastest compression level, since the frames are compressed while being published
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_COMPRESSED
+
+    key_bytes = key.encode()
+    header = HEADER.pack(MAGIC, VERSION, flags, len(ch_numbers), retrieved_vals['Frame'], timestamp,
+                         len(time_vector), decimation, first_time, time_step, len(key_bytes), len(payload))
+
+    return header + key_bytes + struct.pack('<' + str(len(ch_numbers)) + 'H', *ch_numbers) + payload
+
+
+def decode_frame(header, body):
+    """
+    Decodes a frame message.
+
+    Args:
+        header (bytes):
+            The message's header.
+        body (bytes):
+            The remainder of the message (device key, channel numbers and payload).
+
+    Returns:
+        dict[str, Any]:
+            A dictionary with the keys 'Device' (the device key), 'Frame' (the frame number),
+            'Timestamp' (the UNIX time of publication), 'Decimation' (the decimation factor),
+            'Time' (the time vector) and 'Data' (a dictionary with the channel numbers as keys
+            and the float32 voltage vectors as values).
+
+    Raises:
+        ValueError:
+            If the message is not a frame message of a supported version.
+    """
+    magic, version, flags, ch_cnt, frame_id, timestamp, sample_cnt, decimation, first_time, time_step, \
+        key_length, payload_length = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a frame message of version ' + str(VERSION) + '.')
+
+    key = body[:key_length].decode()
+    ch_numbers = struct.unpack_from('<' + str(ch_cnt) + 'H', body, key_length)
+
+    payload = body[key_length + 2 * ch_cnt:key_length + 2 * ch_cnt + payload_length]
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+    data = np.frombuffer(payload, dtype='<f4').reshape(ch_cnt, sample_cnt)
+
+    return {
+        'Device': key,
+        'Frame': frame_id,
+        'Timestamp': timestamp,
+        'Decimation': decimation,
+        'Time': first_time + np.arange(sample_cnt) * time_step,
+        'Data': {no: data[i] for i, no in enumerate(ch_numbers)}
+    }
+
+
+class StreamingServer:
+    def __init__(self, host='127.0.0.1', port=0, queue_size=8):
+        """
+        Publishes oscilloscope frames to subscribers connected via TCP.
+
+        Frames are passed by calling the object (it can be added as a sink to uniswag.headless.HeadlessAcquisition).
+        Upon connecting, each subscriber sends its subscription as a single line of JSON with the
+        (optional) keys 'devices' (patterns of the device keys to receive, all devices if empty),
+        'decimation' (only every n-th sample is sent), 'compress' (whether the payload is compressed),
+        'policy' (one of DROP_POLICIES) and 'queue_size' (the number of frames that may wait to be sent).
+        The server answers with a single line of JSON, containing the key 'status' ('ok' or 'error')
+        and in case of an error, the key 'message'. Afterwards, the server sends the frame messages
+        (see encode_frame).
+        Every subscriber is served by its own thread, so that a slow subscriber never delays the others;
+        if its queue is full, its drop policy decides which frame is discarded.
+
+        Args:
+            host (str):
+                The address to listen on (the loopback interface by default).
+            port (int):
+                The port to listen on (0 for any free port).
+            queue_size (int):
+                The default number of frames that may wait to be sent per subscriber.
+
+        Returns:
+            StreamingServer:
+                A StreamingServer object.
+        """
+        self._default_queue_size = queue_size
+
+        self._listener = socket.create_server((host, port))
+
+        # a threading lock which ensures thread-safe access to the list of subscribers
+        self._mutex_subscribers = threading.Lock()
+        self._subscribers = []
+
+        # the thread which accepts new subscribers
+        self._accept_thread = threading.Thread(target=self._accept_subscribers, daemon=True)
+        self._accept_thread.start()
+
+    @property
+    def address(self):
+        """
+        The address the server listens on.
+
+        Returns:
+            (str, int):
+                The host and port.
+        """
+        return self._listener.getsockname()[:2]
+
+    @property
+    def stats(self):
+        """
+        The counters of all connected subscribers.
+
+        Returns:
+            list[dict[str, Any]]:
+                A dictionary per subscriber with the keys 'Address', 'Sent', 'Dropped' and 'Queued'.
+        """
+        self._mutex_subscribers.acquire()
+        subscribers = list(self._subscribers)
+        self._mutex_subscribers.release()
+
+        return [subscriber.stats for subscriber in subscribers]
+
+    def _accept_subscribers(self):
+        """
+        Continuously accepts new connections until the server is closed.
+        """
+        while True:
+            try:
+                connection, address = self._listener.accept()
+            except OSError:
+                # the listening socket has been closed
+                break
+
+            subscriber = _Subscriber(self, connection, address, self._default_queue_size)
+            subscriber.start()
+
+    def _add_subscriber(self, subscriber):
+        self._mutex_subscribers.acquire()
+        self._subscribers.append(subscriber)
+        self._mutex_subscribers.release()
+
+    def _remove_subscriber(self, subscriber):
+        self._mutex_subscribers.acquire()
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+        self._mutex_subscribers.release()
+
+    def __call__(self, device, retrieved_vals):
+        """
+        Publishes a frame to all subscribers of the oscilloscope.
+
+        The frame is only encoded once per combination of decimation and compression.
+
+        Args:
+            device (uniswag.devices.oscilloscope.Oscilloscope):
+                The oscilloscope which measured the frame.
+            retrieved_vals (dict[str, Any]):
+                The measurement data as provided by the oscilloscope's retrieving method.
+        """
+        self._mutex_subscribers.acquire()
+        subscribers = list(self._subscribers)
+        self._mutex_subscribers.release()
+
+        key = device_key(device)
+        timestamp = time.time()
+        messages = {}
+
+        for subscriber in subscribers:
+            if not subscriber.is_subscribed(key):
+                continue
+
+            options = (subscriber.decimation, subscriber.compress)
+            if options not in messages:
+                messages[options] = encode_frame(key, retrieved_vals, timestamp, *options)
+            subscriber.enqueue(messages[options])
+
+    def close(self):
+        """
+        Stops accepting subscribers and closes all connections.
+        """
+        # (shutting the listening socket down interrupts the pending accept call)
+        try:
+            self._listener.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._listener.close()
+        self._accept_thread.join()
+
+        self._mutex_subscribers.acquire()
+        subscribers = list(self._subscribers)
+        self._mutex_subscribers.release()
+
+        for subscriber in subscribers:
+            subscriber.close()
+
+
+class _Subscriber:
+    def __init__(self, server, connection, address, queue_size):
+        """
+        A connection to a subscriber of a StreamingServer, with its own queue and sending thread.
+
+        Args:
+            server (StreamingServer):
+                The server the subscriber is connected to.
+            connection (socket.socket):
+                The connected socket.
+            address (tuple):
+                The subscriber's address.
+            queue_size (int):
+                The default number of frames that may wait to be sent.
+
+        Returns:
+            _Subscriber:
+                A _Subscriber object.
+        """
+        self._server = server
+        self._connection = connection
+        self._address = address
+
+        # the subscription (replaced by the one received from the subscriber)
+        self._device_patterns = []
+        self.decimation = 1
+        self.compress = False
+        self._policy = 'drop_oldest'
+        self._queue_size = queue_size
+
+        # the messages waiting to be sent and a threading condition which signals new messages
+        self._queue = collections.deque()
+        self._cond_queue = threading.Condition()
+
+        self._closed = False
+        self._sent = 0
+        self._dropped = 0
+
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    @property
+    def stats(self):
+        with self._cond_queue:
+            return {'Address': self._address, 'Sent': self._sent, 'Dropped': self._dropped, 'Queued': len(self._queue)}
+
+    def is_subscribed(self, key):
+        """
+        Checks whether the subscriber receives the frames of an oscilloscope.
+
+        Args:
+            key (str):
+                The key of the oscilloscope.
+
+        Returns:
+            bool:
+                True if any of the subscription's device patterns is contained in the key (or if there are none).
+        """
+        return not self._device_patterns or any(pattern in key.lower() for pattern in self._device_patterns)
+
+    def _receive_subscription(self):
+        """
+        Reads the subscription sent by the subscriber, adds the subscriber to the server and answers it.
+
+        Returns:
+            bool:
+                False if the subscription is invalid (or could not be read or answered), True otherwise.
+        """
+        self._connection.settimeout(5.0)
+        try:
+            # (the file needs to be closed, since the socket cannot be closed while a file refers to it)
+            with self._connection.makefile('rb') as subscription_file:
+                line = subscription_file.readline()
+            subscription = json.loads(line)
+            if not isinstance(subscription, dict):
+                raise ValueError('The subscription must be a JSON object.')
+
+            device_patterns = [str(pattern).lower() for pattern in subscription.get('devices', [])]
+            decimation = int(subscription.get('decimation', 1))
+            compress = bool(subscription.get('compress', False))
+            policy = subscription.get('policy', self._policy)
+            queue_size = int(subscription.get('queue_size', self._queue_size))
+            if decimation < 1 or queue_size < 1:
+                raise ValueError('The decimation and queue size must be positive.')
+            if policy not in DROP_POLICIES:
+                raise ValueError('The policy must be one of ' + ', '.join(DROP_POLICIES) + '.')
+
+        except (OSError, ValueError, TypeError) as e:
+            try:
+                self._connection.sendall((json.dumps({'status': 'error', 'message': str(e)}) + '\n').encode())
+            except OSError:
+                pass
+            return False
+
+        self._device_patterns = device_patterns
+        self.decimation = decimation
+        self.compress = compress
+        self._policy = policy
+        self._queue_size = queue_size
+
+        self._connection.settimeout(None)
+        self._connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        # the subscriber receives every frame published after it has been answered
+        self._server._add_subscriber(self)
+        try:
+            self._connection.sendall((json.dumps({'status': 'ok'}) + '\n').encode())
+        except OSError:
+            self._server._remove_subscriber(self)
+            return False
+
+        return True
+
+    def enqueue(self, message):
+        """
+        Queues a message to be sent, applying the drop policy if the queue is full.
+
+        Args:
+            message (bytes):
+                The message.
+        """
+        with self._cond_queue:
+            if self._closed:
+                return
+
+            if len(self._queue) >= self._queue_size:
+                self._dropped += 1
+                if self._policy == 'drop_newest':
+                    return
+                elif self._policy == 'drop_oldest':
+                    self._queue.popleft()
+                else:
+                    self._closed = True
+                    self._cond_queue.notify_all()
+                    return
+
+            self._queue.append(message)
+            self._cond_queue.notify_all()
+
+    def _serve(self):
+        """
+        Receives the subscription and sends the queued messages until the connection is closed.
+        """
+        if self._receive_subscription():
+            while True:
+                with self._cond_queue:
+                    self._cond_queue.wait_for(lambda: self._queue or self._closed)
+                    if self._closed:
+                        break
+                    message = self._queue.popleft()
+
+                try:
+                    self._connection.sendall(message)
+                except OSError:
+                    # the subscriber has disconnected
+                    break
+
+                with self._cond_queue:
+                    self._sent += 1
+
+            self._server._remove_subscriber(self)
+
+        self._connection.close()
+
+    def close(self):
+        """
+        Closes the connection, interrupting the message that is currently being sent.
+        """
+        with self._cond_queue:
+            self._closed = True
+            self._cond_queue.notify_all()
+
+        try:
+            self._connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+        self._thread.join()
+
+
+class StreamClient:
+    def __init__(self, host='127.0.0.1', port=0, devices=(), decimation=1, compress=False, policy='drop_oldest',
+                 queue_size=None, timeout=None):
+        """
+        Subscribes to the frames published by a StreamingServer.
+
+        Args:
+            host (str):
+                The address of the server.
+            port (int):
+                The port of the server.
+            devices (Iterable[str]):
+                Only frames of oscilloscopes whose keys contain any of these patterns are received
+                (all oscilloscopes if empty).
+            decimation (int):
+                Only every n-th sample is received.
+            compress (bool):
+                Whether the server compresses the payload.
+            policy (str):
+                The way the server handles frames this client cannot keep up with (one of DROP_POLICIES).
+            queue_size (int or None):
+                The number of frames that may wait to be sent (the server's default if None).
+            timeout (float or None):
+                The maximum time in seconds to wait for data (None to wait indefinitely).
+
+        Returns:
+            StreamClient:
+                A StreamClient object.
+
+        Raises:
+            ConnectionError:
+                If the server rejects the subscription.
+        """
+        self._connection = socket.create_connection((host, port), timeout)
+        self._file = self._connection.makefile('rb')
+
+        subscription = {'devices': list(devices), 'decimation': decimation, 'compress': compress, 'policy': policy}
+        if queue_size is not None:
+            subscription['queue_size'] = queue_size
+        self._connection.sendall((json.dumps(subscription) + '\n').encode())
+
+        answer = json.loads(self._file.readline() or b'{}')
+        if answer.get('status') != 'ok':
+            self.close()
+            raise ConnectionError('The subscription was rejected: ' + str(answer.get('message')))
+
+    def receive(self):
+        """
+        Waits for the next frame.
+
+        Returns:
+            dict[str, Any] or None:
+                The decoded frame (see decode_frame), or None if the server has closed the connection.
+        """
+        header = self._file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            return None
+
+        fields = HEADER.unpack(header)
+        ch_cnt, key_length, payload_length = fields[3], fields[10], fields[11]
+        body_length = key_length + 2 * ch_cnt + payload_length
+        body = self._file.read(body_length)
+        if len(body) < body_length:
+            return None
+
+        return decode_frame(header, body)
+
+    def __iter__(self):
+        while True:
+            frame = self.receive()
+            if frame is None:
+                break
+            yield frame
+
+    def close(self):
+        self._file.close()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
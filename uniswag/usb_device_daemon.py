@@ -1,25 +1,22 @@
 from sys import platform
 
-import hantekosc as hantekosc
-import tektronixosc
-
 if platform == 'linux':
     import pyudev
 elif platform == 'win32':
-    import pyvisa as vi
     import wmi
     import pythoncom
 
 import threading
 import time
 import queue
-import handyscope
-import keysightosc
-import tektronixsg
+
+from uniswag.device_registry import DeviceRegistry
+from uniswag.driver_registry import DriverRegistry
+from uniswag.identity_cache import IdentityCache
 
 
 class USBDeviceDaemon:
-    def __init__(self, plug_in_event, plug_out_event):
+    def __init__(self, plug_in_event, plug_out_event, drivers=None):
         """
         Monitors USB ports for oscilloscopes and generators being plugged in and out.
 
@@ -33,6 +30,9 @@ class USBDeviceDaemon:
             plug_out_event (function):
                 The function to call when a device from a known vendor has been plugged out from USB.
                 Receives a shortened device ID as well as the vendor's name as parameters.
+            drivers (uniswag.driver_registry.DriverRegistry or None):
+                The drivers of the supported vendors (the built-in drivers by default).
+                A driver's modules and vendor library are only imported once a device of the vendor is plugged in.
 
         Returns:
             USBDeviceDaemon:
@@ -42,14 +42,36 @@ class USBDeviceDaemon:
         self._add_event = plug_in_event
         self._remove_event = plug_out_event
 
-        # a dict containing the shortened ID (= name and serial number), vendor and path of every
-        # known and currently connected USB device (one list index for every device)
-        self._usb_list = {'ShortID': [], 'Vendor': [], 'Path': []}
+        # the drivers which detect the devices of the supported vendors
+        self._drivers = drivers if drivers is not None else DriverRegistry()
+
+        # a registry containing the shortened ID (= name and serial number), vendor and path of every
+        # known and currently connected USB device
+        self._usb_list = DeviceRegistry()
+
+        # invoke the callback functions whenever a device is registered or unregistered
+        self._usb_list.add_listener(self._on_registry_change)
 
         # a queue for USB events
         # (event = what happened to which USB device)
         self._event_queue = queue.Queue()
 
+        # the queues of the vendor-specific workers, mapped to the workers' names
+        # (only accessed by the thread processing the USB event queue)
+        self._worker_queues = {}
+
+        # the names of the workers responsible for the USB devices, mapped to the devices' paths
+        self._path_workers = {}
+
+        # the identities of previously detected devices, persisted across runs
+        # (mapped to their USB paths and VISA resource strings)
+        self._identity_cache = IdentityCache()
+
+        # the durations from plugging in a device until its detection, mapped to the workers' names
+        self._detection_metrics = {}
+        # a threading lock which ensures thread-safe access to the detection durations
+        self._mutex_detection_metrics = threading.Lock()
+
         # a thread that continuously processes all events in the USB event queue
         self._event_handler_thread = threading.Thread(target=self._event_handler, daemon=True)
         self._event_handler_thread.start()
@@ -78,7 +100,9 @@ class USBDeviceDaemon:
 
         elif platform == 'win32':
 
-            # initializes PyVISA for Windows
+            # PyVISA for Windows is initialized upon the first VISA device
+            # (a single resource manager is used for the daemon's lifetime)
+            self._resource_manager = None
             self._busy_visa_resources = {}
 
             # initializes Windows USB library for the current thread
@@ -102,6 +126,25 @@ class USBDeviceDaemon:
             for thread in self._observer:
                 thread.start()
 
+    @property
+    def detection_metrics(self):
+        """
+        Statistics on how long it took to detect newly plugged in devices, per vendor.
+
+        The durations are measured from the USB event until the device is registered.
+
+        Returns:
+            dict[str, dict[str, float]]:
+                A dictionary with the vendors' names (or 'VISA') as keys and dictionaries as values,
+                which contain the number of detected devices ('Count'), the number of failed detections ('Failed')
+                as well as the 'Last', 'Mean' and 'Max' detection durations in seconds.
+        """
+        self._mutex_detection_metrics.acquire()
+        result = {worker: dict(metrics) for worker, metrics in self._detection_metrics.items()}
+        self._mutex_detection_metrics.release()
+
+        return result
+
     def _on_wmi_usb_creation(self):
         """
         Monitors the Windows USB controller for devices being plugged in and
@@ -183,10 +226,12 @@ class USBDeviceDaemon:
 
     def _event_handler(self):
         """
-        Continuously processes all events in the USB event queue.
+        Continuously distributes all events in the USB event queue to the vendor-specific workers.
 
-        Depending on whether a device is added or removed, the corresponding callback function is invoked with
-        the device ID and the vendor's name as parameters.
+        Every vendor has its own worker thread with a separate queue, which is started upon the vendor's first event.
+        Thus, the (possibly slow) detection of one vendor's device does not delay the devices of other vendors,
+        while the events of a single vendor are still processed one after another
+        (the vendor libraries are not designed to be accessed concurrently).
         All events are filtered by the following conditions:
 
         "bind" and "unbind" actions;
@@ -201,12 +246,15 @@ class USBDeviceDaemon:
             device_path = item[2]
             device_extras = item[3]
 
+            worker = None
+            expected_serial = None
+            fingerprint = None
+
             # case: device plugged in
             if action == 'bind':
 
-                # check for new usb devices
-                if ((device_type == 'usb_device') or ('USB' in device_type)) \
-                        and (device_path not in self._usb_list['Path']):
+                # check for usb devices
+                if (device_type == 'usb_device') or ('USB' in device_type):
 
                     # get all available information on the device vendor
                     dev_vendor_info = []
@@ -215,159 +263,222 @@ class USBDeviceDaemon:
                             dev_vendor_info.append(device_extras[prop])
 
                     # check which vendor's device was plugged in
-                    # and invoke "new device" callback function with corresponding parameters
+                    worker = self._get_worker_name(dev_vendor_info)
+                    if worker is not None:
+                        self._path_workers[device_path] = worker
+
+                        # the serial number reported by the OS (if any) identifies the device within the vendor's list
+                        if 'ID_SERIAL_SHORT' in device_extras:
+                            expected_serial = device_extras['ID_SERIAL_SHORT']
+
+                        # the USB IDs and serial string reported by the OS (if any) tell whether
+                        # the device at this path is still the one whose identity was cached
+                        fingerprint_props = ('ID_VENDOR_ID', 'ID_MODEL_ID', 'ID_SERIAL')
+                        fingerprint_parts = [device_extras[prop] for prop in fingerprint_props if prop in device_extras]
+                        if fingerprint_parts:
+                            fingerprint = ':'.join(fingerprint_parts)
+
+            # case: device removed
+            elif action == 'unbind':
 
-                    if 'TiePie engineering' in dev_vendor_info:
+                # check for usb devices that were handed to a worker before
+                if device_type == 'usb_device':
+                    worker = self._path_workers.pop(device_path, None)
 
-                        # get all the devices of this vendor that are already registered within the device list
-                        registered_dev_list = self._devices_filtered_by_vendor('Tiepie')
+            # hand the event over to the responsible vendor-specific worker (started on first use)
+            if worker is not None:
+                if worker not in self._worker_queues:
+                    self._worker_queues[worker] = queue.Queue()
+                    thread = threading.Thread(target=self._vendor_worker,
+                                              args=[worker, self._worker_queues[worker]], daemon=True)
+                    thread.start()
+                self._worker_queues[worker].put(
+                    item=(action, device_path, expected_serial, fingerprint, time.perf_counter()), block=False)
 
-                        # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
-                        dev_list_raw = self._get_non_formatted_device_list(
-                            [handyscope.DeviceList().get_overview], registered_dev_list, 10)
+            # event in the USB event queue successfully processed
+            self._event_queue.task_done()
 
-                        # prettify the list of all currently connected devices of this vendor
-                        dev_list_formatted = []
-                        for dev in dev_list_raw:
-                            short_id = {
-                                'Name': dev['Name'],
-                                'SerNo': str(dev['SerNo']),
-                                'Type': 'OSC'
-                            }
-                            dev_list_formatted.append(short_id)
+    def _get_worker_name(self, dev_vendor_info):
+        """
+        Determines the vendor-specific worker responsible for a USB device.
+
+        Args:
+            dev_vendor_info (list[str]):
+                All available information on the device vendor.
 
-                        # register the new device to the device list by comparing
-                        # the list of all currently connected devices with the list of already registered devices
-                        self._add_new_device(dev_list_formatted, registered_dev_list, 'Tiepie', device_path)
+        Returns:
+            str or None:
+                The name of the worker, or None if the device does not belong to a known vendor.
+        """
+        # every vendor with a registered driver has its own worker
+        worker = self._drivers.match(dev_vendor_info)
+        if worker is not None:
+            return worker
 
-                    elif 'Keysight_Technologies' in dev_vendor_info:
+        # for all VISA devices on Windows only
+        if 'IVI Foundation, Inc' in dev_vendor_info and platform == 'win32':
+            return 'VISA'
 
-                        # get all the devices of this vendor that are already registered within the device list
-                        registered_dev_list = self._devices_filtered_by_vendor('Keysight')
+        return None
 
-                        # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
-                        dev_list_raw = self._get_non_formatted_device_list(
-                            [keysightosc.list_connected_keysight_oscilloscopes], registered_dev_list, 10)
+    def _vendor_worker(self, worker, worker_queue):
+        """
+        Continuously processes all events in a vendor-specific worker queue.
 
-                        # prettify the list of all currently connected devices of this vendor
-                        dev_list_formatted = []
-                        for dev in dev_list_raw:
-                            short_id = {
-                                'Name': dev['Model'],
-                                'SerNo': dev['Serial Number'],
-                                'Type': 'OSC'
-                            }
-                            dev_list_formatted.append(short_id)
-
-                        # register the new device to the device list by comparing
-                        # the list of all currently connected devices with the list of already registered devices
-                        self._add_new_device(dev_list_formatted, registered_dev_list, 'Keysight', device_path)
-
-                    # Tektronix devices
-                    elif '0699' in dev_vendor_info:
-
-                        # get all the devices of this vendor that are already registered within the device list
-                        registered_dev_list = self._devices_filtered_by_vendor('Tektronix')
-
-                        # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
-                        dev_list_raw = self._get_non_formatted_device_list(
-                            [tektronixsg.list_connected_tektronix_generators,
-                             tektronixosc.list_connected_tektronix_oscilloscopes], registered_dev_list, 10)
-
-                        # prettify the list of all currently connected devices of this vendor
-                        dev_list_formatted = []
-                        for dev in dev_list_raw:
-                            short_id = {
-                                'Name': dev['Model'],
-                                'SerNo': dev['Serial Number'],
-                                'Type': 'OSC' if 'TBS' in dev['Model'] else 'GEN'
-                            }
-                            dev_list_formatted.append(short_id)
-
-                        # register the new device to the device list by comparing
-                        # the list of all currently connected devices with the list of already registered devices
-                        self._add_new_device(dev_list_formatted, registered_dev_list, 'Tektronix', device_path)
-
-                    elif 'Cypress Semiconductor Corp.' in dev_vendor_info or 'OpenHantek' in dev_vendor_info:
-                        # get all the devices of this vendor that are already registered within the device list
-                        registered_dev_list = self._devices_filtered_by_vendor('Hantek')
-
-                        # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
-                        dev_list_raw = self._get_non_formatted_device_list(
-                            [hantekosc.list_connected_hantek_devices], registered_dev_list, 10)
-
-                        # prettify the list of all currently connected devices of this vendor
-                        dev_list_formatted = []
-                        for dev in dev_list_raw:
-                            short_id = {
-                                'Name': dev['Model'],
-                                'SerNo': dev['Serial Number'],
-                                'Type': 'OSC'
-                            }
-                            dev_list_formatted.append(short_id)
-
-                        # register the new device to the device list by comparing
-                        # the list of all currently connected devices with the list of already registered devices
-                        self._add_new_device(dev_list_formatted, registered_dev_list, 'Hantek', device_path)
-
-                    # for all VISA devices on Windows only
-                    elif 'IVI Foundation, Inc' in dev_vendor_info and platform == 'win32':
-
-                        # get all the devices of this vendor that are already registered within the device list
-                        known_visa_vendors = ['Keysight', 'Tektronix']
-                        registered_dev_list = []
-                        for vendor in known_visa_vendors:
-                            registered_dev_list += self._devices_filtered_by_vendor(vendor)
-
-                        # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
-                        dev_list_raw = self._get_non_formatted_device_list(
-                            self._list_connected_visa_devices, registered_dev_list, 10)
-
-                        # prettify the list of all currently connected devices of this vendor
-                        dev_list_formatted = []
-                        for dev in dev_list_raw:
-
-                            visa_vendor = 'unknown'
-                            manufacturer = dev['Manufacturer']
-                            if manufacturer == 'KEYSIGHT TECHNOLOGIES':
-                                visa_vendor = 'Keysight'
-                            elif manufacturer == 'TEKTRONIX':
-                                visa_vendor = 'Tektronix'
-
-                            visa_id = {
-                                'Vendor': visa_vendor,
-                                'Name': dev['Model'],
-                                'SerNo': dev['Serial Number']
-                            }
-                            dev_list_formatted.append(visa_id)
+        Depending on whether a device is added or removed, the corresponding callback function is invoked with
+        the device ID and the vendor's name as parameters.
 
-                        # register the new device to the device list by comparing
-                        # the list of all currently connected devices with the list of already registered devices
-                        self._add_new_device(dev_list_formatted, registered_dev_list, None, device_path)
+        Args:
+            worker (str):
+                The name of the worker (as determined by the event handler).
+            worker_queue (queue.Queue):
+                The worker's queue of events, each one being a tuple of the action, the device path,
+                the serial number reported by the OS (or None), the device's fingerprint (or None)
+                and the time of the event (performance counter).
+        """
+        while True:
+            action, device_path, expected_serial, fingerprint, event_time = worker_queue.get()
 
-            # case: formerly plugged in device removed
-            elif action == 'unbind':
+            try:
+                # case: device plugged in
+                if action == 'bind':
+                    self._on_bind(worker, device_path, expected_serial, fingerprint, event_time)
 
-                # check for known usb devices
-                if (device_type == 'usb_device') \
-                        and (device_path in self._usb_list['Path']):
+                # case: formerly plugged in device removed
+                elif action == 'unbind':
+                    self._on_unbind(device_path)
 
-                    # get the removed device's list index
-                    idx = self._usb_list['Path'].index(device_path)
+            except Exception as e:
+                # a single failing event must not stop the detection of this vendor's devices
+                print('Could not process the ' + action + ' event of ' + device_path + ': ' + str(e))
+                if action == 'bind':
+                    self._record_detection(worker, time.perf_counter() - event_time, False)
 
-                    # get the removed device's name, serial number and vendor
-                    removed_device = self._usb_list['ShortID'][idx], self._usb_list['Vendor'][idx]
+            finally:
+                # event in the worker queue processed
+                worker_queue.task_done()
 
-                    # remove the device from the list of currently registered devices
-                    del self._usb_list['ShortID'][idx]
-                    del self._usb_list['Vendor'][idx]
-                    del self._usb_list['Path'][idx]
+    def _on_bind(self, worker, device_path, expected_serial, fingerprint, event_time):
+        """
+        Detects and registers the device that was plugged in at the given USB path.
 
-                    # invoke "device removed" callback function
-                    self._remove_event(*removed_device)
+        Args:
+            worker (str):
+                The name of the worker responsible for the device's vendor.
+            device_path (str):
+                The USB path of the device.
+            expected_serial (str or None):
+                The serial number of the device as reported by the OS (None if unknown).
+            fingerprint (str or None):
+                The USB IDs and serial string of the device as reported by the OS (None if unknown).
+            event_time (float):
+                The time at which the device was plugged in (performance counter).
+        """
+        # check for new usb devices
+        if self._usb_list.has_path(device_path):
+            return
 
-            # event in the USB event queue successfully processed
-            self._event_queue.task_done()
+        # a device that was detected at this path before is expected to show up in the vendor's list again
+        if expected_serial is None:
+            identity = self._identity_cache.get(device_path, fingerprint)
+            if identity is not None:
+                expected_serial = identity['SerNo']
+
+        registered = False
+
+        # check which vendor's device was plugged in
+        # and invoke "new device" callback function with corresponding parameters
+
+        if worker == 'VISA':
+
+            # get all the devices of this vendor that are already registered within the device list
+            registered_dev_list = []
+            for vendor in self._drivers.visa_vendors:
+                registered_dev_list += self._devices_filtered_by_vendor(vendor)
+
+            # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
+            dev_list_raw = self._get_non_formatted_device_list(
+                [self._list_connected_visa_devices], registered_dev_list, 10, worker, expected_serial)
+
+            # prettify the list of all currently connected devices of this vendor
+            dev_list_formatted = []
+            for dev in dev_list_raw:
+
+                visa_vendor = self._drivers.match_visa(dev['Manufacturer'])
+                if visa_vendor is None:
+                    visa_vendor = 'unknown'
+
+                visa_id = {
+                    'Vendor': visa_vendor,
+                    'Name': dev['Model'],
+                    'SerNo': dev['Serial Number'],
+                    'Type': 'OSC' if visa_vendor == 'Keysight' or 'TBS' in dev['Model'] else 'GEN'
+                }
+                dev_list_formatted.append(visa_id)
+
+            # register the new device to the device list by comparing
+            # the list of all currently connected devices with the list of already registered devices
+            registered = self._add_new_device(dev_list_formatted, registered_dev_list, None, device_path,
+                                              expected_serial)
+
+        else:
+
+            # the driver's functions (an empty list if the driver could not be loaded, which is reported once)
+            list_functions = self._drivers.list_devices(worker)
+            if not list_functions:
+                self._record_detection(worker, time.perf_counter() - event_time, False)
+                return
+
+            # get all the devices of this vendor that are already registered within the device list
+            registered_dev_list = self._devices_filtered_by_vendor(worker)
+
+            # try to detect all currently connected devices of this vendor in a time frame of 10 seconds
+            # (the driver's functions already return the prettified list)
+            dev_list_formatted = self._get_non_formatted_device_list(
+                list_functions, registered_dev_list, 10, worker, expected_serial)
+
+            # register the new device to the device list by comparing
+            # the list of all currently connected devices with the list of already registered devices
+            registered = self._add_new_device(dev_list_formatted, registered_dev_list, worker, device_path,
+                                              expected_serial)
+
+        self._record_detection(worker, time.perf_counter() - event_time, registered)
+
+        # remember the identity of the registered device for the next time it is plugged in at this path
+        if registered:
+            entry = self._usb_list.get_by_path(device_path)
+            if entry is not None:
+                key, short_id = entry
+                self._identity_cache.put(device_path, dict(short_id, Vendor=key[0]), fingerprint)
+
+    def _on_unbind(self, device_path):
+        """
+        Unregisters the device that was plugged out from the given USB path (if it was registered).
+
+        Args:
+            device_path (str):
+                The USB path of the device.
+        """
+        # remove the device from the registry of currently registered devices (if it is known),
+        # which invokes the "device removed" callback function
+        self._usb_list.remove_by_path(device_path)
+
+    def _on_registry_change(self, event, key, short_id):
+        """
+        Invokes the "new device" or "device removed" callback function whenever the registry of USB devices changes.
+
+        Args:
+            event (str):
+                The kind of change ('add' or 'remove').
+            key ((str, str, str)):
+                The vendor, name and serial number of the device.
+            short_id (dict[str, str]):
+                The shortened ID (name, serial number and type) of the device.
+        """
+        if event == 'add':
+            self._add_event(short_id, key[0])
+        elif event == 'remove':
+            self._remove_event(short_id, key[0])
 
     def _devices_filtered_by_vendor(self, vendor):
         """
@@ -385,19 +496,13 @@ class USBDeviceDaemon:
                 The list of the given vendor's currently registered USB devices.
                 Each device is represented by its shortened ID (name and serial number).
         """
-        filter_result = []
-
-        # find all occurrences of the specified vendor in the list of currently registered devices
-        for i in range(len(self._usb_list['Vendor'])):
-            if self._usb_list['Vendor'][i] == vendor:
-                filter_result.append(self._usb_list['ShortID'][i])
+        return self._usb_list.by_vendor(vendor)
 
-        return filter_result
-
-    def _add_new_device(self, all_devices, registered_devices, vendor, path):
+    def _add_new_device(self, all_devices, registered_devices, vendor, path, expected_serial=None):
         """
         Compares both the "all devices" and "registered devices" lists and
-        registers the first device from the first list that is not yet in the second.
+        registers the first device from the first list that is not yet in the second
+        (preferring the device with the expected serial number).
 
         Afterwards, the "new device" callback function is invoked with
         the shortened device ID (name and serial number) and the vendor's name.
@@ -415,17 +520,24 @@ class USBDeviceDaemon:
             path (str):
                 The USB path of the newly registered device.
                 This should simply be the USB path of the device that was just plugged in.
+            expected_serial (str or None):
+                The serial number of the device that was just plugged in as reported by the OS (None if unknown).
+
+        Returns:
+            bool:
+                True if a device was registered, False otherwise.
         """
+        # the device with the expected serial number is registered first
+        if expected_serial is not None:
+            all_devices = sorted(all_devices, key=lambda dev: str(dev['SerNo']) != expected_serial)
+
+        registered_ids = {(reg_dev['Name'], reg_dev['SerNo']) for reg_dev in registered_devices}
+
         # check for every connected USB device if it is already in the list of registered devices
         for plugged_in_device in all_devices:
-            new_device = True
-            for reg_dev in registered_devices:
-                if plugged_in_device['Name'] == reg_dev['Name'] and plugged_in_device['SerNo'] == reg_dev['SerNo']:
-                    new_device = False
-                    break
 
             # register the device if it could not be found in the list of registered devices
-            if new_device:
+            if (plugged_in_device['Name'], plugged_in_device['SerNo']) not in registered_ids:
 
                 if vendor is not None:
                     device_vendor = vendor
@@ -437,20 +549,24 @@ class USBDeviceDaemon:
                     'SerNo': plugged_in_device['SerNo'],
                     'Type': plugged_in_device['Type']
                 }
-                self._usb_list['ShortID'].append(short_id)
-                self._usb_list['Vendor'].append(device_vendor)
-                self._usb_list['Path'].append(path)
 
-                # invoke "new device" callback function
-                self._add_event(short_id, device_vendor)
+                # the registry refuses the device if another worker has registered it in the meantime,
+                # otherwise it invokes the "new device" callback function
+                if self._usb_list.add(device_vendor, short_id['Name'], short_id['SerNo'], short_id, path):
+                    return True
 
-                break
+        return False
 
-    @staticmethod
-    def _get_non_formatted_device_list(library_functions_for_getting_devices, registered_devices, timeout):
+    def _get_non_formatted_device_list(self, library_functions_for_getting_devices, registered_devices, timeout,
+                                       worker=None, expected_serial=None):
         """
         Invokes the passed callback function to obtain the library-specific list of currently connected devices.
 
+        The first attempt is made immediately.
+        Afterwards, the delay between two attempts starts small and doubles after every attempt
+        (up to a maximum), with both values depending on the worker (= vendor) that detects the device.
+        The detection ends as soon as a new device or the device with the expected serial number is found.
+
         Args:
             library_functions_for_getting_devices (list(function)):
                 The callback functions which return the list of currently connected devices from the desired vendor.
@@ -460,20 +576,30 @@ class USBDeviceDaemon:
             timeout (float):
                 The timeout for this method in seconds.
                 If reached, an error message is printed to console.
+            worker (str or None):
+                The name of the worker that detects the device, used to look up the delays between attempts.
+            expected_serial (str or None):
+                The serial number of the device that was just plugged in as reported by the OS (None if unknown).
 
         Returns:
             list:
                 The return value of the library function call.
         """
-        connected_devices_raw = []
+        # the delays are declared by the vendor's driver (VISA devices use the default ones)
+        driver = self._drivers.get(worker)
+        delay, delay_max = driver.detection_backoff if driver is not None else (0.05, 0.5)
 
-        # set timeout in seconds
-        latest_point_in_time = time.time() + timeout
+        # a device with the expected serial number that is already registered (e.g. since it was moved to another
+        # port and the serial number was taken from the identity cache) cannot be the one that was just plugged in
+        if expected_serial is not None and any(expected_serial in [str(value) for value in dev.values()]
+                                               for dev in registered_devices):
+            expected_serial = None
 
-        # there should be at least one more device connected via USB than currently registered
-        while not len(connected_devices_raw) > len(registered_devices):
+        # set timeout in seconds
+        latest_point_in_time = time.perf_counter() + timeout
 
-            time.sleep(0.5)
+        while True:
+            connected_devices_raw = []
             try:
                 for function in library_functions_for_getting_devices:
                     # invoke callback function to obtain the library-specific device list
@@ -484,13 +610,51 @@ class USBDeviceDaemon:
                 print(e)
                 connected_devices_raw = []
 
+            # there should be at least one more device connected via USB than currently registered
+            if len(connected_devices_raw) > len(registered_devices):
+                break
+
+            # the expected (and still unregistered) device is listed (although the list might be incomplete)
+            if expected_serial is not None and any(expected_serial in [str(value) for value in dev.values()]
+                                                   for dev in connected_devices_raw):
+                break
+
             # abort on timeout
-            if time.time() > latest_point_in_time:
+            if time.perf_counter() + delay > latest_point_in_time:
                 print("A problem occurred while trying to detect the inserted device.")
                 break
 
+            time.sleep(delay)
+            delay = min(delay * 2, delay_max)
+
         return connected_devices_raw
 
+    def _record_detection(self, worker, duration, success):
+        """
+        Records how long the detection of a newly plugged in device took.
+
+        Args:
+            worker (str):
+                The name of the worker that detected the device.
+            duration (float):
+                The time in seconds from plugging in the device until its registration (or the failed detection).
+            success (bool):
+                Whether the device was registered.
+        """
+        self._mutex_detection_metrics.acquire()
+
+        metrics = self._detection_metrics.setdefault(worker, {'Count': 0, 'Failed': 0, 'Last': 0.0, 'Mean': 0.0,
+                                                              'Max': 0.0})
+        if success:
+            metrics['Mean'] = (metrics['Mean'] * metrics['Count'] + duration) / (metrics['Count'] + 1)
+            metrics['Count'] += 1
+            metrics['Last'] = duration
+            metrics['Max'] = max(metrics['Max'], duration)
+        else:
+            metrics['Failed'] += 1
+
+        self._mutex_detection_metrics.release()
+
     def _list_connected_visa_devices(self):
         """
         The list of all currently connected PyVISA devices (Windows only).
@@ -498,12 +662,19 @@ class USBDeviceDaemon:
         This function is designed to obtain a list of VISA devices on Windows,
         since the OS is unable to differentiate between different VISA device vendors (unlike Linux).
 
+        The identities of resources that were queried before (in this or a previous run) are taken from the cache,
+        so that only unknown resources are opened to query their identification.
+        The cache file is only written if new identities were queried, at most once per call.
+
         Returns:
             list[dict[str, str]]:
                 A list containing information about every connected PyVISA device.
                 Each entry consists of a dictionary with the keys "Manufacturer", "Model" & "Serial Number".
         """
-        rm = vi.ResourceManager()
+        vi = self._drivers.resolve('pyvisa')
+        if self._resource_manager is None:
+            self._resource_manager = vi.ResourceManager()
+        rm = self._resource_manager
 
         # list of all connected VISA device addresses
         resource_list = rm.list_resources()
@@ -525,24 +696,33 @@ class USBDeviceDaemon:
                 resource = resource_list[res_num]
 
                 # get the Identification Number of the resource
+                # (USB resource strings contain the serial number, so a cached identity cannot belong to another device)
                 try:
-                    if resource not in self._busy_visa_resources:
-                        visa_device = rm.open_resource(resource)
-                        idn = visa_device.query('*IDN?')
-                        idn_parts = idn.split(',')
-                        resource_info = {
-                            'Manufacturer': idn_parts[0],
-                            'Model': idn_parts[1],
-                            'Serial Number': idn_parts[2]
-                        }
-                        self._busy_visa_resources[resource] = resource_info
-                        device = resource_info
-                    else:
+                    if resource in self._busy_visa_resources:
                         device = self._busy_visa_resources[resource]
-                except (vi.errors.VisaIOError, ValueError):
+                    else:
+                        device = self._identity_cache.get(resource)
+                        if device is None:
+                            visa_device = rm.open_resource(resource)
+                            try:
+                                idn = visa_device.query('*IDN?')
+                            finally:
+                                visa_device.close()
+                            idn_parts = idn.split(',')
+                            device = {
+                                'Manufacturer': idn_parts[0],
+                                'Model': idn_parts[1],
+                                'Serial Number': idn_parts[2]
+                            }
+                            # only freshly queried identities are cached (saved once after the loop)
+                            self._identity_cache.put(resource, device, save=False)
+                        self._busy_visa_resources[resource] = device
+                except (vi.errors.VisaIOError, ValueError, IndexError):
                     device = None
 
                 if device is not None:
                     device_list.append(device)
 
+        self._identity_cache.flush()
+
         return device_list
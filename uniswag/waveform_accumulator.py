@@ -0,0 +1,294 @@
+import threading
+
+import numpy as np
+
+
+class WaveformAccumulator:
+    def __init__(self, width=640, height=360):
+        """
+        Accumulates successive measurement frames of multiple oscilloscope channels.
+
+        Two accumulation modes are supported:
+        'Average' calculates the running mean of the last N frames in place,
+        'Persistence' counts how often each cell of a 2-D time × voltage grid is hit by a sample
+        (so that e.g. eye diagrams can be displayed as an image).
+        In both modes, no frame needs to be stored after it has been accumulated.
+        The accumulated data is kept per channel, which is identified by an arbitrary hashable key.
+
+        Args:
+            width (int):
+                The number of time bins (= the width of the rendered persistence image in pixels).
+            height (int):
+                The number of voltage bins (= the height of the rendered persistence image in pixels).
+
+        Returns:
+            WaveformAccumulator:
+                A WaveformAccumulator object.
+        """
+        # a list of all available accumulation modes
+        self.modes_avail = ['Off', 'Average', 'Persistence']
+
+        # the currently selected accumulation mode
+        self._mode = 'Off'
+
+        # the number of frames across which the running mean is calculated
+        self._avg_cnt = 16
+
+        # the factor by which the persistence histograms are multiplied before each accumulation
+        # (1 means infinite persistence)
+        self._decay = 1.0
+
+        # the dimensions of the persistence histograms
+        self._width = width
+        self._height = height
+
+        # the running means per channel
+        # (dictionaries containing the time vector, the mean voltage vector and the number of averaged frames)
+        self._averages = {}
+
+        # the persistence histograms per channel
+        # (dictionaries containing the time & voltage range and the 2-D histogram)
+        self._histograms = {}
+
+        # a threading lock which ensures thread-safe access to the accumulated data and settings
+        self._mutex = threading.Lock()
+
+    @property
+    def mode(self):
+        """
+        The currently selected accumulation mode.
+
+        Changing the mode discards all accumulated data.
+
+        Returns:
+            str:
+                One of the entries of the list of available accumulation modes.
+        """
+        self._mutex.acquire()
+        result = self._mode
+        self._mutex.release()
+
+        return result
+
+    @mode.setter
+    def mode(self, value):
+        self._mutex.acquire()
+        if value in self.modes_avail and value != self._mode:
+            self._mode = value
+            self._averages = {}
+            self._histograms = {}
+        self._mutex.release()
+
+    @property
+    def avg_cnt(self):
+        """
+        The number of frames across which the running mean is calculated.
+
+        Returns:
+            int:
+                The frame count.
+        """
+        self._mutex.acquire()
+        result = self._avg_cnt
+        self._mutex.release()
+
+        return result
+
+    @avg_cnt.setter
+    def avg_cnt(self, value):
+        self._mutex.acquire()
+        self._avg_cnt = max(int(value), 1)
+        self._mutex.release()
+
+    @property
+    def decay(self):
+        """
+        The factor by which the persistence histograms are multiplied before new frames are accumulated.
+
+        Returns:
+            float:
+                A value between 0 and 1 (1 means infinite persistence).
+        """
+        self._mutex.acquire()
+        result = self._decay
+        self._mutex.release()
+
+        return result
+
+    @decay.setter
+    def decay(self, value):
+        self._mutex.acquire()
+        self._decay = min(1.0, max(0.0, value))
+        self._mutex.release()
+
+    def clear(self):
+        """
+        Discards all accumulated data.
+        """
+        self._mutex.acquire()
+        self._averages = {}
+        self._histograms = {}
+        self._mutex.release()
+
+    def retain(self, keys):
+        """
+        Discards the accumulated data of all channels except the specified ones.
+
+        Args:
+            keys (Iterable):
+                The keys of the channels whose accumulated data is kept.
+        """
+        keys = set(keys)
+
+        self._mutex.acquire()
+        self._averages = {key: val for key, val in self._averages.items() if key in keys}
+        self._histograms = {key: val for key, val in self._histograms.items() if key in keys}
+        self._mutex.release()
+
+    def average(self, key, time, frames):
+        """
+        Adds the passed frames to the running mean of the specified channel.
+
+        Until N frames have been accumulated, the cumulative mean is calculated,
+        afterwards, each new frame replaces 1/N of the mean (exponential moving average).
+        If the time vector changes (e.g. due to a new record length), the running mean is restarted.
+
+        Args:
+            key (Hashable):
+                The key identifying the channel.
+            time (np.ndarray):
+                The frames' common time vector.
+            frames (np.ndarray):
+                A single voltage vector or a 2-D array with one voltage vector per row (e.g. extracted segments).
+
+        Returns:
+            np.ndarray:
+                The current mean voltage vector.
+        """
+        frames = np.atleast_2d(frames)
+
+        self._mutex.acquire()
+
+        state = self._averages.get(key)
+        if state is None or len(state['Time']) != len(time) \
+                or state['Time'][0] != time[0] or state['Time'][-1] != time[-1]:
+            state = {'Time': time, 'Mean': np.array(frames[0], dtype=float), 'Count': 1}
+            self._averages[key] = state
+            frames = frames[1:]
+
+        if len(frames):
+            frame_cnt = len(frames)
+
+            # the share of the new frames in the updated mean
+            weight = min(frame_cnt / min(state['Count'] + frame_cnt, self._avg_cnt), 1.0)
+
+            # update the mean in place
+            difference = frames.mean(axis=0) if frame_cnt > 1 else frames[0].astype(float)
+            difference -= state['Mean']
+            difference *= weight
+            state['Mean'] += difference
+
+            state['Count'] = min(state['Count'] + frame_cnt, self._avg_cnt)
+
+        result = state['Mean'].copy()
+
+        self._mutex.release()
+
+        return result
+
+    def accumulate(self, key, time, frames, time_range, voltage_range):
+        """
+        Adds the samples of the passed frames to the persistence histogram of the specified channel.
+
+        Samples outside the given time or voltage range are ignored.
+        If the ranges change (e.g. due to the chart axes being rescaled), the histogram is restarted.
+
+        Args:
+            key (Hashable):
+                The key identifying the channel.
+            time (np.ndarray):
+                The frames' common time vector.
+            frames (np.ndarray):
+                A single voltage vector or a 2-D array with one voltage vector per row (e.g. extracted segments).
+            time_range ((float, float)):
+                The minimum and maximum time covered by the histogram.
+            voltage_range ((float, float)):
+                The minimum and maximum voltage covered by the histogram.
+        """
+        frames = np.atleast_2d(frames)
+        time_range = tuple(time_range)
+        voltage_range = tuple(voltage_range)
+        if time_range[1] <= time_range[0] or voltage_range[1] <= voltage_range[0]:
+            return
+
+        # determine the time bin of each sample column, omitting columns outside of the time range
+        columns = np.floor((time - time_range[0]) * (self._width / (time_range[1] - time_range[0]))).astype(np.intp)
+        valid_columns = (columns >= 0) & (columns < self._width)
+        if not valid_columns.all():
+            columns = columns[valid_columns]
+            frames = frames[:, valid_columns]
+
+        # determine the voltage bin of each sample (the highest voltage is located in the first row)
+        rows = np.floor((voltage_range[1] - frames) * (self._height / (voltage_range[1] - voltage_range[0])))
+        valid = (rows >= 0) & (rows < self._height)
+
+        # count the samples per bin
+        bins = rows.astype(np.intp) * self._width + columns
+        counts = np.bincount(bins[valid], minlength=self._width * self._height)
+
+        self._mutex.acquire()
+
+        state = self._histograms.get(key)
+        if state is None or state['Range'] != (time_range, voltage_range):
+            state = {
+                'Range': (time_range, voltage_range),
+                'Histogram': np.zeros((self._height, self._width), dtype=np.float32)
+            }
+            self._histograms[key] = state
+
+        if self._decay < 1:
+            state['Histogram'] *= self._decay
+        state['Histogram'] += counts.reshape(self._height, self._width)
+
+        self._mutex.release()
+
+    def render(self, colors):
+        """
+        Renders the persistence histograms of the specified channels into a single RGBA image.
+
+        Each histogram is scaled logarithmically and drawn in the color of its channel,
+        with the channels' colors being added up where the histograms overlap.
+
+        Args:
+            colors (dict[Hashable, (int, int, int)]):
+                A dictionary with the keys of the channels to render as keys and
+                their colors (red, green and blue from 0 to 255) as values.
+
+        Returns:
+            np.ndarray:
+                A 3-D array of the shape height × width × 4 with the data type uint8.
+        """
+        rgb = np.zeros((self._height, self._width, 3), dtype=np.float32)
+        alpha = np.zeros((self._height, self._width), dtype=np.float32)
+
+        self._mutex.acquire()
+        for key, color in colors.items():
+            state = self._histograms.get(key)
+            if state is None:
+                continue
+
+            histogram = state['Histogram']
+            maximum = histogram.max()
+            if maximum <= 0:
+                continue
+
+            intensity = np.log1p(histogram) / np.log1p(maximum)
+            rgb += intensity[:, :, np.newaxis] * np.asarray(color, dtype=np.float32)
+            np.maximum(alpha, intensity, out=alpha)
+        self._mutex.release()
+
+        image = np.empty((self._height, self._width, 4), dtype=np.uint8)
+        image[:, :, :3] = np.clip(rgb, 0, 255)
+        image[:, :, 3] = alpha * 255
+
+        return image
@@ -0,0 +1,122 @@
+import csv
+import os
+
+import numpy as np
+from scipy.io import wavfile
+
+# the file extensions of all supported waveform files
+FILE_TYPES = ['.csv', '.txt', '.npy', '.wav', '.bin']
+
+
+def load_waveform(file_name):
+    """
+    Loads the samples of an arbitrary waveform from a file.
+
+    The file type is determined by the file extension:
+    '.csv' and '.txt' files contain the samples either in a single row or in the first column,
+    with the delimiter, the layout and any leading header lines being detected automatically.
+    '.npy' files contain a NumPy array, '.wav' files contain audio samples
+    (integer samples are normalized to the range from -1 to 1) and
+    '.bin' files contain raw little-endian 32 bit floating-point samples.
+    In case of multi-dimensional data (e.g. stereo WAV files), only the first column is used.
+    Floating-point samples of binary files are returned memory-mapped (and read-only) instead of being copied,
+    so that they are only read from disk once they are fitted into a generator's waveform buffer
+    (which needs all of them, e.g. for resampling).
+
+    Args:
+        file_name (str):
+            The path of the file to load.
+
+    Returns:
+        np.ndarray or None:
+            The samples as 1-D array (possibly memory-mapped), or None if the file does not exist or is not supported.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if not os.path.isfile(file_name) or extension not in FILE_TYPES:
+        return None
+
+    if extension == '.npy':
+        data = np.load(file_name, mmap_mode='r')
+    elif extension == '.wav':
+        _, data = wavfile.read(file_name, mmap=True)
+    elif extension == '.bin':
+        data = np.memmap(file_name, dtype='<f4', mode='r')
+    else:
+        data = _load_text(file_name)
+
+    # only use the first column of multi-dimensional data
+    data = np.asarray(data)
+    if data.ndim > 1:
+        data = data.reshape(len(data), -1)[:, 0]
+
+    # normalize integer samples to the range from -1 to 1 (copying the data into memory)
+    if np.issubdtype(data.dtype, np.integer):
+        info = np.iinfo(data.dtype)
+        return (data.astype(float) - (info.max + info.min + 1) / 2) / ((info.max - info.min + 1) / 2)
+
+    # floating-point samples are converted by the consumer
+    if np.issubdtype(data.dtype, np.floating):
+        return data
+
+    return np.array(data, dtype=float)
+
+
+def _load_text(file_name):
+    """
+    Loads the samples of an arbitrary waveform from a delimiter-separated text file.
+
+    The delimiter is detected from the beginning of the file.
+    All lines before the first one starting with a number are treated as header.
+    If the data consists of a single line, all of its entries are used as samples,
+    otherwise the first column is used.
+    Entries that cannot be converted to a number are interpreted as zero.
+
+    Args:
+        file_name (str):
+            The path of the file to load.
+
+    Returns:
+        np.ndarray:
+            The samples as 1-D array.
+    """
+    with open(file_name, 'r', newline='') as opened_file:
+        head = opened_file.read(65536)
+
+    # detect the delimiter (whitespace if none of the common delimiters is found)
+    try:
+        delimiter = csv.Sniffer().sniff(head, delimiters=',;\t ').delimiter
+    except csv.Error:
+        delimiter = None
+    if delimiter == ' ':
+        delimiter = None
+
+    # count the header lines
+    lines = head.splitlines()
+    header_cnt = 0
+    for line in lines:
+        try:
+            float(line.split(delimiter)[0])
+            break
+        except (ValueError, IndexError):
+            header_cnt += 1
+
+    # detect the layout (a single row or a column)
+    data_lines = [line for line in lines[header_cnt:] if line.strip()]
+    row_major = len(data_lines) == 1 and len(data_lines[0].split(delimiter)) > 1
+    usecols = None if row_major else 0
+
+    try:
+        data = np.loadtxt(file_name, delimiter=delimiter, skiprows=header_cnt, usecols=usecols, ndmin=1)
+    except ValueError:
+        # fall back to converting every entry individually
+        with open(file_name, 'r', newline='') as opened_file:
+            rows = [line.split(delimiter) for line in opened_file.read().splitlines()[header_cnt:] if line.strip()]
+        entries = rows[0] if row_major else [row[0] for row in rows]
+        data = np.empty(len(entries))
+        for i, entry in enumerate(entries):
+            try:
+                data[i] = float(entry)
+            except ValueError:
+                data[i] = 0.0
+
+    return data